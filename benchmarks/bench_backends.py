@@ -0,0 +1,229 @@
+"""Compare the six converters on speed, memory and output size
+
+Usage: python benchmarks/bench_backends.py [--corpus DIR] [--shapes small tables ...]
+                                           [--backends ...] [--documents input.docx ...]
+                                           [--repeat 3] [--scale 1.0]
+                                           [--save-baseline FILE] [--compare FILE]
+                                           [--threshold 0.25]
+
+Documents come from the synthetic corpus of docx_corpus.py (generated in a
+temporary directory unless --corpus points at an existing one) plus any
+--documents. Every backend runs on every document in a fresh interpreter,
+so peak RSS and the cold first run are measured in isolation. Reported:
+import time, first and best wall time, best CPU time, peak RSS and output
+size. --save-baseline stores the results as JSON; --compare flags results
+slower or larger than a baseline by more than --threshold and exits with
+status 1 when any are found.
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from docx_corpus import CORPUS, generate_corpus  # noqa: E402
+
+
+# Metrics compared against a baseline, with the smallest absolute change that
+# counts, so that noise on tiny numbers is not reported
+COMPARED = {'wall_best': 0.005, 'cpu_best': 0.005, 'rss_peak_mb': 2.0, 'output_bytes': 0}
+
+
+def run_docs_to_markdown(path):
+    from docx2md import docs_to_markdown
+    return docs_to_markdown.convert_docx_to_markdown(path)
+
+
+def run_docx_to_html_markdown(path):
+    from docx2md import docx_to_html_markdown
+    return docx_to_html_markdown.convert_docx_to_markdown(path)
+
+
+def run_mammoth_markdown(path):
+    from docx2md import mammoth_markdown
+    return mammoth_markdown.convert_docx_to_markdown(path)
+
+
+def run_extract_text_docx2python(path):
+    from docx2md import extract_text_docx2python
+    return extract_text_docx2python.convert_docx_to_markdown(path)
+
+
+def run_extract_text_mammoth(path):
+    from docx2md import extract_text_mammoth
+    return extract_text_mammoth.convert_docx_to_markdown(path)
+
+
+def run_extract_tables(path):
+    from docx2md import extract_tables
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, 'tables.json')
+        # The script reports its progress on stdout
+        with contextlib.redirect_stdout(io.StringIO()):
+            extract_tables.extract_tables(path, output_path)
+        with open(output_path, encoding='utf-8') as f:
+            return f.read()
+
+
+# backend name -> (module of the docx2md package to import, runner)
+BACKENDS = {
+    'docs_to_markdown': ('docs_to_markdown', run_docs_to_markdown),
+    'docx_to_html_markdown': ('docx_to_html_markdown', run_docx_to_html_markdown),
+    'mammoth_markdown': ('mammoth_markdown', run_mammoth_markdown),
+    'extract_text_docx2python': ('extract_text_docx2python', run_extract_text_docx2python),
+    'extract_text_mammoth': ('extract_text_mammoth', run_extract_text_mammoth),
+    'extract_tables': ('extract_tables', run_extract_tables),
+}
+
+
+def peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(backend, path, repeat):
+    """Run one backend on one document in this process and return its metrics"""
+    module, runner = BACKENDS[backend]
+    start = time.perf_counter()
+    importlib.import_module('docx2md.' + module)
+    import_time = time.perf_counter() - start
+    rss_before = peak_rss_mb()
+
+    walls, cpus = [], []
+    output = ''
+    for _ in range(repeat):
+        wall, cpu = time.perf_counter(), time.process_time()
+        output = runner(path)
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+
+    return {
+        'import': import_time,
+        'wall_first': walls[0],
+        'wall_best': min(walls),
+        'cpu_best': min(cpus),
+        'rss_peak_mb': peak_rss_mb(),
+        'rss_growth_mb': peak_rss_mb() - rss_before,
+        'output_bytes': len(output.encode('utf-8')),
+    }
+
+
+def measure_in_child(backend, path, repeat):
+    """Run measure() in a fresh interpreter; returns metrics or {'error': message}"""
+    command = [sys.executable, __file__, '--child', backend, str(path), str(repeat)]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        lines = (result.stderr or result.stdout).strip().splitlines()
+        return {'error': lines[-1] if lines else f"exit status {result.returncode}"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, threshold):
+    """List (key, metric, old, new) for every result worse than baseline by more than threshold"""
+    regressions = []
+    for key, metrics in results.items():
+        old = baseline.get('results', {}).get(key)
+        if old is None or 'error' in metrics or 'error' in old:
+            continue
+        for metric, floor in COMPARED.items():
+            if metric not in old or metric not in metrics:
+                continue
+            new_value, old_value = metrics[metric], old[metric]
+            if new_value > old_value * (1 + threshold) and new_value - old_value > floor:
+                regressions.append((key, metric, old_value, new_value))
+    return regressions
+
+
+def print_table(results):
+    print(f"{'backend / document':<46} {'import':>8} {'first':>8} {'best':>8} {'cpu':>8} "
+          f"{'rss MB':>8} {'+rss MB':>8} {'output':>10}")
+    for key, m in results.items():
+        if 'error' in m:
+            print(f"{key:<46} ERROR {m['error']}")
+            continue
+        print(f"{key:<46} {m['import'] * 1000:8.1f} {m['wall_first'] * 1000:8.1f} "
+              f"{m['wall_best'] * 1000:8.1f} {m['cpu_best'] * 1000:8.1f} {m['rss_peak_mb']:8.1f} "
+              f"{m['rss_growth_mb']:8.1f} {m['output_bytes']:>10}")
+    print("(times in milliseconds)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the DOCX converters")
+    parser.add_argument('--corpus', default=None,
+                        help="directory of the synthetic corpus (generated there if missing)")
+    parser.add_argument('--shapes', nargs='+', choices=list(CORPUS), default=None,
+                        help="corpus documents to use (default: all)")
+    parser.add_argument('--scale', type=float, default=1.0, help="scale of the generated corpus")
+    parser.add_argument('--documents', nargs='+', default=[], help="additional DOCX files")
+    parser.add_argument('--backends', nargs='+', choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument('--repeat', type=int, default=3, help="conversions per measurement")
+    parser.add_argument('--save-baseline', default=None, help="write the results to this JSON file")
+    parser.add_argument('--compare', default=None, help="baseline JSON file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="relative slowdown or growth reported as a regression (default: 0.25)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = Path(args.corpus or tmp)
+        names = args.shapes or list(CORPUS)
+        missing = [name for name in names if not (corpus_dir / f'{name}.docx').exists()]
+        if missing:
+            generate_corpus(corpus_dir, missing, args.scale)
+        documents = [corpus_dir / f'{name}.docx' for name in names]
+        documents += [Path(p) for p in args.documents]
+
+        results = {}
+        for document in documents:
+            for backend in args.backends:
+                key = f"{backend}/{document.stem}"
+                results[key] = measure_in_child(backend, document, args.repeat)
+                print(f"  {key}", file=sys.stderr)
+
+    print_table(results)
+
+    if args.save_baseline:
+        baseline = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'scale': args.scale,
+            'repeat': args.repeat,
+            'results': results,
+        }
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if not regressions:
+            print(f"\nNo regressions beyond {args.threshold:.0%} against {args.compare}")
+            return 0
+        print(f"\nRegressions beyond {args.threshold:.0%} against {args.compare}:")
+        for key, metric, old_value, new_value in regressions:
+            print(f"  {key:<46} {metric:<13} {old_value:12.4f} -> {new_value:12.4f} "
+                  f"({new_value / old_value - 1 if old_value else float('inf'):+.0%})")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 5 and sys.argv[1] == '--child':
+        print(json.dumps(measure(sys.argv[2], sys.argv[3], int(sys.argv[4]))))
+        sys.exit(0)
+    sys.exit(main())
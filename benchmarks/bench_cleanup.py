@@ -0,0 +1,152 @@
+"""Benchmark the clean_text functions against the previous per-call re.sub implementations
+
+Usage: python benchmarks/bench_cleanup.py [--repeat N] [corpus.md ...]
+
+Each converter's clean_text now runs a pre-compiled text_cleanup.Cleaner.
+The previous implementations are kept below as the baseline. Every corpus
+(the bundled output*.md files by default, plus generated text full of
+tabs, URLs, punctuation and blank lines, which the bundled files lack) is
+cleaned with both, and the results must be byte-identical. The
+docx2python variant cleans one paragraph at a time, as extract_text does.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from docx2md import docs_to_markdown  # noqa: E402
+from docx2md import extract_text_docx2python  # noqa: E402
+from docx2md import extract_text_mammoth  # noqa: E402
+
+
+def legacy_docs_to_markdown_clean_text(text):
+    text = re.sub(r'(https?:\s*/\s*/[^\s]+)\s*', lambda m: m.group(1).replace(' ', ''), text)
+    text = re.sub(r'["\'](appels à manifestation d\'intérêt)["\']', r'*\1*', text)
+    text = text.replace('\t', '')
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def legacy_docx2python_clean_text(text):
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    text = re.sub(r'<a href="([^"]+)">([^<]+)</a>', r'[\2](\1)', text)
+    text = re.sub(r'https:\s*//', 'https://', text)
+    text = re.sub(r'www\.\s*', 'www.', text)
+    text = re.sub(r'(\w+)\s*\.\s*(\w+)\s*@', r'\1.\2@', text)
+    text = re.sub(r'\[(https?://[^\]]+)\]\([^)]+\)[.)\s]*', r'[\1](\1)', text)
+    text = re.sub(r'(?<!\[)(https?://[^\s]+)(?!\])', r'[\1](\1)', text)
+    return text
+
+
+def legacy_split_into_sections(text):
+    sections = []
+    current_section = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if line.isupper() and len(line.split()) > 1:
+            if current_section:
+                sections.append('\n'.join(current_section))
+            current_section = [line]
+        else:
+            current_section.append(line)
+    if current_section:
+        sections.append('\n'.join(current_section))
+    return sections
+
+
+def legacy_mammoth_clean_text(text):
+    text = re.sub(r'https:\s*//', 'https://', text)
+    text = re.sub(r'www\.\s*', 'www.', text)
+    text = re.sub(r'(\w)\s*\n\s*(\w)', r'\1\2', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = re.sub(r'\s+([.,;:!?)])', r'\1', text)
+    text = re.sub(r'([.,;:!?])([^\s\n])', r'\1 \2', text)
+    text = re.sub(r'^\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\n\s*-\s*', '\n- ', text)
+    text = re.sub(r' +', ' ', text)
+    text = re.sub(r'(\w+)\s*\.\s*(\w+)\s*@', r'\1.\2@', text)
+    text = re.sub(r'(\w)-\s*\n\s*(\w)', r'\1\2', text)
+    processed_sections = []
+    for section in legacy_split_into_sections(text):
+        processed_paragraphs = []
+        for para in re.split(r'\n\s*\n', section):
+            lines = para.split('\n')
+            if any(line.isupper() and len(line.split()) > 1 for line in lines):
+                processed_paragraphs.append('\n'.join(lines))
+            else:
+                processed_paragraphs.append(' '.join(line.strip() for line in lines))
+        processed_sections.append('\n\n'.join(processed_paragraphs))
+    return '\n\n'.join(processed_sections)
+
+
+def per_paragraph(clean):
+    """Apply a paragraph-level cleaner the way extract_text does"""
+    def run(text):
+        return [clean(paragraph) for paragraph in text.split('\n\n')]
+    return run
+
+
+VARIANTS = [
+    ('docs_to_markdown', legacy_docs_to_markdown_clean_text, docs_to_markdown.clean_text),
+    ('docx2python', per_paragraph(legacy_docx2python_clean_text),
+     per_paragraph(extract_text_docx2python.clean_text)),
+    ('mammoth', legacy_mammoth_clean_text, extract_text_mammoth.clean_text),
+]
+
+
+# Pieces of the generated corpus, chosen to exercise the order of the rules
+FUZZ_PIECES = ('\t', ' ', '  ', '\n', '\n\n\n', 'http://x.org', 'https: //', 'www. ', 'a.b @', 'and', 'More',
+               'TITLE LINE', '.', ',', ')', '-', '"appels à manifestation d\'intérêt"', '<a href="u">t</a>')
+
+
+def fuzz_corpus(size=50000, seed=0):
+    """Random text made of FUZZ_PIECES, with the blank lines extract_text splits paragraphs at"""
+    rng = random.Random(seed)
+    return '\n\n'.join(''.join(rng.choice(FUZZ_PIECES) for _ in range(rng.randint(1, 12)))
+                         for _ in range(size))
+
+
+def best_of(func, text, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpora', nargs='*', help="text files to clean (default: output*.md)")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.corpora] or sorted(ROOT.glob('output*.md'))
+    corpora = [(path.name, path.read_text(encoding='utf-8')) for path in paths]
+    corpora.append(('generated (tabs, URLs)', fuzz_corpus()))
+
+    print(f"{'variant':<18} {'corpus':<24} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8}")
+    ok = True
+    for corpus, text in corpora:
+        for name, legacy, current in VARIANTS:
+            legacy_time, legacy_result = best_of(legacy, text, args.repeat)
+            engine_time, engine_result = best_of(current, text, args.repeat)
+            identical = legacy_result == engine_result
+            ok &= identical
+            print(f"{name:<18} {corpus:<24} {legacy_time * 1000:>10.2f} "
+                  f"{engine_time * 1000:>10.2f} {legacy_time / engine_time:>7.2f}x  "
+                  f"{'identical' if identical else 'DIFFERENT'}")
+
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,61 @@
+"""Benchmark opening a DOCX with python-docx directly and through docx_container
+
+Usage: python benchmarks/bench_container.py [input.docx ...] [--repeat 3]
+
+Every document is opened with python-docx's Document() and with
+docx_container.open_python_docx, which gives python-docx the package
+without its media. Time and peak Python memory (tracemalloc) of each are
+reported. Without inputs, input.docx and a generated image-heavy document
+are used.
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from docx2md.docx_container import open_python_docx  # noqa: E402
+from docx_corpus import generate_docx, shape  # noqa: E402
+
+
+def measure(func, repeat):
+    """Best time over repeat runs and the peak traced memory of one run"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+if __name__ == '__main__':
+    from docx import Document
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='*')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = [Path(path) for path in args.inputs]
+        if not documents:
+            documents.append(BENCH_DIR.parent / 'input.docx')
+            documents.append(Path(tmp) / 'images.docx')
+            generate_docx(documents[-1], shape(paragraphs=500, images=60, image_kb=512))
+
+        print(f"{'document':<16} {'open':<10} {'ms':>10} {'peak MiB':>10}")
+        for document in documents:
+            for name, func in (('Document', lambda: Document(str(document))),
+                               ('container', lambda: open_python_docx(document))):
+                elapsed, peak = measure(func, args.repeat)
+                print(f"{document.stem:<16} {name:<10} {elapsed * 1000:>10.1f} {peak / 2 ** 20:>10.1f}")
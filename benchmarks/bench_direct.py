@@ -0,0 +1,72 @@
+"""Benchmark the direct mammoth to Markdown backend against the HTML round trip
+
+Usage: python benchmarks/bench_direct.py [input.docx ...] [--repeat 3]
+
+Every document is converted with docx_to_html_markdown.process_file (mammoth
+HTML, table split, html2text) and with mammoth_markdown.convert, which
+hands mammoth's elements to html2text without writing or parsing HTML.
+Without inputs, input.docx and generated documents (prose, tables, images)
+are used. The two outputs are compared byte for byte.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from docx2md import docx_to_html_markdown  # noqa: E402
+from docx2md import mammoth_markdown  # noqa: E402
+from docx_corpus import generate_docx, shape  # noqa: E402
+
+GENERATED = {
+    'prose': shape(paragraphs=5000, hyperlinks=200),
+    'tables': shape(paragraphs=500, tables=200, rows=20, cols=6),
+    'images': shape(paragraphs=500, tables=20, rows=5, cols=4, images=100, image_kb=64),
+}
+
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='*')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    identical = True
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = [Path(path) for path in args.inputs]
+        if not documents:
+            documents.append(BENCH_DIR.parent / 'input.docx')
+            for name, document_shape in GENERATED.items():
+                documents.append(Path(tmp) / f'{name}.docx')
+                generate_docx(documents[-1], document_shape)
+
+        print(f"{'document':<16} {'round trip ms':>14} {'direct ms':>10} {'speedup':>8}")
+        for document in documents:
+            html_output = os.path.join(tmp, 'html.md')
+            direct_output = os.path.join(tmp, 'direct.md')
+            html_time = best_time(lambda: docx_to_html_markdown.process_file(document, html_output,
+                                                                             verbose=False), args.repeat)
+            direct_time = best_time(lambda: mammoth_markdown.convert(document, direct_output), args.repeat)
+            with open(html_output, encoding='utf-8') as f, open(direct_output, encoding='utf-8') as g:
+                same = f.read() == g.read()
+            identical = identical and same
+            print(f"{document.stem:<16} {html_time * 1000:>14.1f} {direct_time * 1000:>10.1f} "
+                  f"{html_time / direct_time:>8.2f}{'' if same else '  DIFFERENT'}")
+
+    print(f"direct output {'identical' if identical else 'DIFFERENT'} to the HTML round trip")
+    sys.exit(0 if identical else 1)
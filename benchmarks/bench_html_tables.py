@@ -0,0 +1,102 @@
+"""Benchmark convert_html_to_markdown against the previous two-parse implementation
+
+Usage: python benchmarks/bench_html_tables.py [input.docx] [--tables N] [--repeat N]
+
+The previous implementation parsed the HTML with BeautifulSoup twice,
+serialized the tree back to a string and ran one str.replace per table.
+It is kept here as the baseline; placeholders are substituted from the
+highest index down so that TABLE_PLACEHOLDER_1 does not clobber
+TABLE_PLACEHOLDER_10 and the outputs can be compared byte for byte.
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx2md.docx_to_html_markdown import (HTML2TEXT_OPTIONS, convert_docx_to_html,  # noqa: E402
+                                           convert_html_to_markdown, format_table_markdown)
+
+
+def legacy_convert_html_to_markdown(html_content):
+    """The two-parse implementation this benchmark compares against"""
+    import html2text
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, 'html.parser')
+    tables = []
+    for table in soup.find_all('table'):
+        table_data = []
+        for row in table.find_all('tr'):
+            table_data.append([cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])])
+        tables.append(table_data)
+
+    soup = BeautifulSoup(html_content, 'html.parser')
+    table_placeholders = []
+    for table in soup.find_all('table'):
+        placeholder = f'TABLE_PLACEHOLDER_{len(table_placeholders)}'
+        table_placeholders.append(placeholder)
+        table.replace_with(placeholder)
+
+    converter = html2text.HTML2Text()
+    for option, value in HTML2TEXT_OPTIONS.items():
+        setattr(converter, option, value)
+    markdown = converter.handle(str(soup))
+
+    for i in reversed(range(len(table_placeholders))):
+        markdown = markdown.replace(table_placeholders[i], format_table_markdown(tables[i]))
+
+    markdown = re.sub(r'(#+\s+.*)\n', r'\1\n\n', markdown)
+    markdown = re.sub(r'\n{3,}', '\n\n', markdown)
+    return markdown
+
+
+def table_heavy_html(tables, rows=12, cols=5):
+    """Build mammoth-like HTML with the given number of tables between paragraphs"""
+    parts = ['<h1>Synthetic filing</h1>']
+    for t in range(tables):
+        parts.append(f'<p>Section {t} introduces the figures &amp; notes below.</p>')
+        parts.append('<table>')
+        for r in range(rows):
+            cells = ''.join(f'<td><p>Row {r} col {c} of table {t}</p></td>' for c in range(cols))
+            parts.append(f'<tr>{cells}</tr>')
+        parts.append('</table>')
+    return ''.join(parts)
+
+
+def best_of(func, html_content, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html_content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_case(name, html_content, repeat):
+    legacy_time, legacy_md = best_of(legacy_convert_html_to_markdown, html_content, repeat)
+    new_time, new_md = best_of(convert_html_to_markdown, html_content, repeat)
+    identical = 'identical' if legacy_md == new_md else 'DIFFERENT'
+    print(f"{name:<28} {len(html_content):>10} {legacy_time * 1000:>10.1f} "
+          f"{new_time * 1000:>10.1f} {legacy_time / new_time:>7.2f}x  {identical}")
+    return legacy_md == new_md
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', nargs='?', default='input.docx')
+    parser.add_argument('--tables', type=int, default=300,
+                        help="number of tables in the synthetic document")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'case':<28} {'html bytes':>10} {'legacy ms':>10} {'new ms':>10} {'speedup':>8}")
+    ok = run_case(Path(args.input).name, convert_docx_to_html(args.input), args.repeat)
+    for tables in (10, args.tables):
+        ok &= run_case(f"synthetic, {tables} tables", table_heavy_html(tables), args.repeat)
+
+    sys.exit(0 if ok else 1)
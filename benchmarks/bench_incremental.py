@@ -0,0 +1,81 @@
+"""Benchmark incremental re-conversion after a one-paragraph edit
+
+Usage: python benchmarks/bench_incremental.py [input.docx] [--paragraphs 20000] [--tables 300]
+
+Without an input, a large document is generated with docx_corpus.py. The
+document is converted from scratch with docs_to_markdown, converted once with
+incremental_convert to build the index, edited (one paragraph gets new
+text) and converted incrementally again. The incremental output of the
+edited document is compared with a from-scratch conversion of it.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from docx2md import docs_to_markdown  # noqa: E402
+from docx_corpus import generate_docx, shape  # noqa: E402
+from docx2md.incremental_convert import convert_incremental  # noqa: E402
+
+TEXT_RE = re.compile(rb'(<w:t(?: [^>]*)?>)([^<]{8,})(</w:t>)')
+
+
+def edit_one_paragraph(source, target):
+    """Copy source to target with the text of one run in the middle of the body changed"""
+    with zipfile.ZipFile(source) as docx:
+        xml = docx.read('word/document.xml')
+        matches = list(TEXT_RE.finditer(xml))
+        match = matches[len(matches) // 2]
+        xml = xml[:match.start(2)] + b'Edited text of the paragraph' + xml[match.end(2):]
+        with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as edited:
+            for item in docx.infolist():
+                data = xml if item.filename == 'word/document.xml' else docx.read(item.filename)
+                edited.writestr(item, data)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', nargs='?', default=None)
+    parser.add_argument('--paragraphs', type=int, default=20000)
+    parser.add_argument('--tables', type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original = args.input
+        if original is None:
+            original = os.path.join(tmp, 'large.docx')
+            generate_docx(original, shape(paragraphs=args.paragraphs, tables=args.tables,
+                                          rows=15, cols=6, hyperlinks=100))
+        edited = os.path.join(tmp, 'edited.docx')
+        edit_one_paragraph(original, edited)
+        output = os.path.join(tmp, 'output.md')
+
+        scratch_time, _ = timed(docs_to_markdown.convert_docx_to_markdown, original)
+        first_time, first = timed(convert_incremental, original, output)
+        same_time, same = timed(convert_incremental, original, output)
+        edit_time, edit = timed(convert_incremental, edited, output)
+        with open(output, encoding='utf-8') as f:
+            identical = f.read() == docs_to_markdown.convert_docx_to_markdown(edited)
+
+    print(f"{'run':<28} {'ms':>10} {'blocks':>8} {'rendered':>9}")
+    print(f"{'python-docx, from scratch':<28} {scratch_time * 1000:>10.1f}")
+    for name, elapsed, report in (('incremental, no index', first_time, first),
+                                  ('incremental, unchanged', same_time, same),
+                                  ('incremental, one edit', edit_time, edit)):
+        print(f"{name:<28} {elapsed * 1000:>10.1f} {report['blocks']:>8} {report['rendered']:>9}")
+    print(f"edited output {'identical' if identical else 'DIFFERENT'} to a conversion from scratch")
+    sys.exit(0 if identical else 1)
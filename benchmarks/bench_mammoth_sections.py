@@ -0,0 +1,163 @@
+"""Benchmark the streaming mammoth text pipeline against the previous list-based one
+
+Usage: python benchmarks/bench_mammoth_sections.py [--lines N]
+
+Generates a raw text dump like mammoth.extract_raw_text returns (titles,
+key: value rows, list items and wrapped prose) and converts it with the
+previous clean_text + convert_to_markdown implementation and with
+iter_document_blocks streamed to a file. Reports wall time and the
+tracemalloc peak of each, and checks the outputs are identical.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx2md.extract_text_mammoth import CLEANER, format_table_data, iter_document_blocks  # noqa: E402
+
+
+def legacy_convert(text):
+    """The previous implementation: split into lists, re-split, re-join"""
+    text = CLEANER(text)
+
+    sections = []
+    current_section = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if line.isupper() and len(line.split()) > 1:
+            if current_section:
+                sections.append('\n'.join(current_section))
+            current_section = [line]
+        else:
+            current_section.append(line)
+    if current_section:
+        sections.append('\n'.join(current_section))
+
+    processed_sections = []
+    for section in sections:
+        processed_paragraphs = []
+        for para in re.split(r'\n\s*\n', section):
+            lines = para.split('\n')
+            if any(line.isupper() and len(line.split()) > 1 for line in lines):
+                processed_paragraphs.append('\n'.join(lines))
+            else:
+                processed_paragraphs.append(' '.join(line.strip() for line in lines))
+        processed_sections.append('\n\n'.join(processed_paragraphs))
+    text = '\n\n'.join(processed_sections)
+
+    markdown_sections = []
+    table_data = []
+    in_table = False
+    for i, section in enumerate(text.split('\n\n')):
+        section = section.strip()
+        if not section:
+            continue
+        if i == 0 and section.isupper():
+            markdown_sections.append(f"# {section}\n")
+            continue
+        if section.isupper() and len(section.split()) > 1:
+            if markdown_sections:
+                markdown_sections.append("\n---\n")
+            markdown_sections.append(f"\n## {section}")
+            continue
+        if ':' in section and len(section.split('\n')) == 1:
+            title, value = section.split(':', 1)
+            title = title.strip()
+            value = value.strip()
+            if title.istitle() and not title.isupper():
+                if not in_table:
+                    in_table = True
+                    table_data = [["Field", "Value"]]
+                table_data.append([title, value])
+                continue
+        if in_table and (not ':' in section or len(section.split('\n')) > 1):
+            in_table = False
+            if table_data:
+                markdown_sections.append(format_table_data(table_data))
+                table_data = []
+        section = re.sub(r'(https?://[^\s)]+)', lambda m: f"[{m.group(1)}]({m.group(1)})", section)
+        section = re.sub(r'(\S+@\S+\.\S+)', lambda m: f"[{m.group(1)}](mailto:{m.group(1)})", section)
+        section = re.sub(r'"([^"]*appels à manifestation d\'intérêt[^"]*)"', r'*"\1"*', section)
+        if section.startswith('- '):
+            lines = section.split('\n')
+            section = '\n'.join('- ' + line.strip().lstrip('- ') for line in lines if line.strip())
+        markdown_sections.append(section)
+    if in_table and table_data:
+        markdown_sections.append(format_table_data(table_data))
+
+    text = '\n\n'.join(markdown_sections)
+    return re.sub(r'\n+---\n+', '\n\n---\n\n', text)
+
+
+def raw_text_dump(lines, seed=0):
+    """Generate raw text with the shapes found in extracted tender documents"""
+    rng = random.Random(seed)
+    words = ['assessment', 'organisation', 'network', 'performance', 'contract', 'budget',
+             'framework', 'evidence', 'results', 'multilateral', 'analysis', 'partner']
+    out = []
+    while len(out) < lines:
+        kind = rng.random()
+        if kind < 0.05:
+            out.append(' '.join(rng.choice(words).upper() for _ in range(3)))
+        elif kind < 0.15:
+            out.append(f"{rng.choice(words).title()}: {rng.randint(1, 9999)}")
+        elif kind < 0.3:
+            out.append(f"- {' '.join(rng.choice(words) for _ in range(6))};")
+        elif kind < 0.35:
+            out.append(f"See https://example.org/{rng.choice(words)} or mail info@example.org")
+        else:
+            out.append(' '.join(rng.choice(words) for _ in range(12)) + '.')
+        if rng.random() < 0.3:
+            out.append('')
+    return '\n'.join(out)
+
+
+def measure(func, text):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(text)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def streamed(text):
+    """Write the blocks to a file as they are produced and return the path"""
+    fd, path = tempfile.mkstemp(suffix='.md')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for i, block in enumerate(iter_document_blocks(text)):
+            if i:
+                f.write('\n\n')
+            f.write(block)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=100_000)
+    args = parser.parse_args()
+
+    text = raw_text_dump(args.lines)
+    print(f"raw text: {args.lines} lines, {len(text) / 1e6:.1f} MB")
+
+    legacy_time, legacy_peak, legacy_md = measure(legacy_convert, text)
+    stream_time, stream_peak, path = measure(streamed, text)
+    with open(path, encoding='utf-8') as f:
+        identical = f.read() == legacy_md
+    os.remove(path)
+
+    print(f"{'':<10} {'time s':>8} {'peak MB':>9}")
+    print(f"{'legacy':<10} {legacy_time:>8.2f} {legacy_peak / 1e6:>9.1f}")
+    print(f"{'streamed':<10} {stream_time:>8.2f} {stream_peak / 1e6:>9.1f}")
+    print('identical' if identical else 'DIFFERENT')
+    sys.exit(0 if identical else 1)
@@ -0,0 +1,62 @@
+"""Benchmark parallel chunked conversion of one large document
+
+Usage: python benchmarks/bench_parallel.py [input.docx] [--paragraphs 40000] [--tables 600] [--workers 1 2 4 8]
+
+Without an input, a large document is generated with docx_corpus.py. The
+document is converted with docs_to_markdown in one process, then with
+parallel_convert for every worker count, and every parallel output is
+compared with the serial one.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from docx2md import docs_to_markdown  # noqa: E402
+from docx2md import parallel_convert  # noqa: E402
+from docx_corpus import generate_docx, shape  # noqa: E402
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def convert_parallel(input_path, workers):
+    return ''.join(parallel_convert.iter_markdown_pieces(input_path, workers))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', nargs='?', default=None)
+    parser.add_argument('--paragraphs', type=int, default=40000)
+    parser.add_argument('--tables', type=int, default=600)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        document = args.input
+        if document is None:
+            document = os.path.join(tmp, 'large.docx')
+            generate_docx(document, shape(paragraphs=args.paragraphs, tables=args.tables,
+                                          rows=15, cols=6, hyperlinks=100))
+
+        serial_time, expected = timed(docs_to_markdown.convert_docx_to_markdown, document)
+        print(f"{os.cpu_count()} CPUs")
+        print(f"{'run':<28} {'ms':>10} {'speedup':>8}")
+        print(f"{'docs_to_markdown':<28} {serial_time * 1000:>10.1f} {1:>8.2f}")
+        identical = True
+        for workers in sorted(set(args.workers)):
+            elapsed, markdown = timed(convert_parallel, document, workers)
+            identical = identical and markdown == expected
+            print(f"{f'parallel, {workers} workers':<28} {elapsed * 1000:>10.1f} {serial_time / elapsed:>8.2f}")
+
+    print(f"parallel output {'identical' if identical else 'DIFFERENT'} to docs_to_markdown")
+    sys.exit(0 if identical else 1)
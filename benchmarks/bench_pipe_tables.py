@@ -0,0 +1,89 @@
+"""Benchmark pipe table formatting: tabulate, pipe_table and parallel formatting
+
+Usage: python benchmarks/bench_pipe_tables.py [--tables 400] [--rows 30] [--cols 6]
+                                              [--workers 4] [--repeat 3]
+
+Builds tables shaped like those of regulatory filings (labels, amounts with
+thousands separators, percentages, notes) and formats them with tabulate,
+with pipe_table.render_pipe_table, unpadded, and with format_tables() in
+worker processes. The padded outputs are compared with tabulate's byte for
+byte. Worker processes only help on machines with several cores.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx2md.docx_to_html_markdown import format_tables  # noqa: E402
+from docx2md.pipe_table import render_pipe_table  # noqa: E402
+
+
+def filing_tables(count, rows, cols, seed=0):
+    """Tables with a text column followed by numeric and mixed columns"""
+    rng = random.Random(seed)
+    tables = []
+    for t in range(count):
+        header = ['Item'] + [f'FY{2020 + c}' for c in range(cols - 2)] + ['Notes']
+        table = [header]
+        for r in range(rows):
+            row = [f'Line {r} of schedule {t}']
+            row += [f'{rng.randint(0, 10 ** 7):,}' if rng.random() < 0.7 else f'{rng.random() * 100:.1f}'
+                    for _ in range(cols - 2)]
+            row.append(rng.choice(['', 'See note 4', 'Restated', '—', 'Отчёт']))
+            table.append(row)
+        tables.append(table)
+    return tables
+
+
+def best_of(func, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tables', type=int, default=400)
+    parser.add_argument('--rows', type=int, default=30)
+    parser.add_argument('--cols', type=int, default=6)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    from tabulate import tabulate
+
+    tables = filing_tables(args.tables, args.rows, args.cols)
+    cases = [
+        ('tabulate', lambda: [tabulate(t, headers="firstrow", tablefmt="pipe") for t in tables]),
+        ('pipe_table', lambda: [render_pipe_table(t) for t in tables]),
+        ('pipe_table, unpadded', lambda: [render_pipe_table(t, pad=False) for t in tables]),
+        (f'format_tables, {args.workers} workers', lambda: list(format_tables(tables, workers=args.workers))),
+    ]
+
+    print(f"{args.tables} tables of {args.rows} x {args.cols} cells")
+    print(f"{'case':<28} {'ms':>10} {'speedup':>8} {'output bytes':>13}")
+    baseline_time = expected = None
+    ok = True
+    for name, func in cases:
+        elapsed, result = best_of(func, args.repeat)
+        output = ''.join(result)
+        note = ''
+        if expected is None:
+            baseline_time, expected = elapsed, result
+        elif name == 'pipe_table':
+            ok = result == expected
+            note = '  identical' if ok else '  DIFFERENT'
+        elif name.startswith('format_tables'):
+            # format_tables() adds the blank lines around each table
+            ok &= result == [f"\n{table}\n" for table in expected]
+        print(f"{name:<28} {elapsed * 1000:>10.1f} {baseline_time / elapsed:>7.2f}x {len(output):>13}{note}")
+
+    sys.exit(0 if ok else 1)
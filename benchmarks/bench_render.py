@@ -0,0 +1,95 @@
+"""Benchmark one-parse rendering of several outputs against the separate converters
+
+Usage: python benchmarks/bench_render.py [input.docx ...] [--repeat 3]
+
+Every document is converted the way the separate scripts do it, one parse
+per output (docs_to_markdown, extract_text_docx2python and the docx2python
+table extraction of extract_tables), then with render_outputs, which parses
+it once into the document model and renders the docx and text Markdown and
+the table data from it, and finally from the saved model. Without inputs,
+input.docx and generated documents are used. Both Markdown outputs of
+render_outputs are compared byte for byte with the converters'.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from docx2md import docs_to_markdown  # noqa: E402
+from docx2md import extract_tables  # noqa: E402
+from docx2md import extract_text_docx2python  # noqa: E402
+from docx2md import render_outputs  # noqa: E402
+from docx_corpus import generate_docx, shape  # noqa: E402
+
+GENERATED = {
+    'prose': shape(paragraphs=5000, hyperlinks=200),
+    'tables': shape(paragraphs=500, tables=200, rows=20, cols=6),
+    'merged': shape(paragraphs=50, tables=5, rows=200, cols=91, merged=3),
+}
+
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def convert_separately(document, outputs):
+    docs_to_markdown.convert(document, outputs['docx'])
+    with contextlib.redirect_stdout(io.StringIO()):
+        extract_text_docx2python.extract_text(document, outputs['text'])
+        extract_tables.extract_tables(document, outputs['tables'])
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='*')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    identical = True
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = [Path(path) for path in args.inputs]
+        if not documents:
+            documents.append(BENCH_DIR.parent / 'input.docx')
+            for name, document_shape in GENERATED.items():
+                documents.append(Path(tmp) / f'{name}.docx')
+                generate_docx(documents[-1], document_shape)
+
+        separate = {name: os.path.join(tmp, f'separate_{name}') for name in ('docx', 'text', 'tables')}
+        rendered = {name: os.path.join(tmp, f'rendered_{name}') for name in ('docx', 'text', 'tables')}
+        separate['tables'] += '.json'
+        rendered['tables'] += '.json'
+        model_path = os.path.join(tmp, 'document.model')
+
+        print(f"{'document':<12} {'separate ms':>12} {'one parse ms':>13} {'from model ms':>14} {'model KiB':>10}")
+        for document in documents:
+            separate_time = best_time(lambda: convert_separately(document, separate), args.repeat)
+            render_time = best_time(lambda: render_outputs.convert(document, rendered, model_path=model_path),
+                                    args.repeat)
+            model_time = best_time(lambda: render_outputs.convert(model_path, rendered), args.repeat)
+            same = all(read(rendered[name]) == read(separate[name]) for name in ('docx', 'text'))
+            identical = identical and same
+            print(f"{document.stem:<12} {separate_time * 1000:>12.1f} {render_time * 1000:>13.1f} "
+                  f"{model_time * 1000:>14.1f} {os.path.getsize(model_path) / 1024:>10.0f}"
+                  f"{'' if same else '  DIFFERENT'}")
+
+    print(f"Markdown outputs {'identical' if identical else 'DIFFERENT'} to the separate converters")
+    sys.exit(0 if identical else 1)
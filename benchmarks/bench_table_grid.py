@@ -0,0 +1,68 @@
+"""Benchmark reading merged tables through docx_stream.build_grid against python-docx row.cells
+
+Usage: python benchmarks/bench_table_grid.py [--rows 200] [--cols 31 91 271] [--merged 3]
+
+Generates one table per width whose first column is merged vertically and
+whose other cells are merged horizontally. The table is read the way
+extract_text_docx used to read it, through python-docx ``row.cells`` and
+cell.text, and through docs_to_markdown.table_grid, which builds the grid
+in one pass. The cells of every grid position must be the same as
+python-docx's.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from docx2md.docs_to_markdown import table_grid  # noqa: E402
+from docx2md.docx_container import open_python_docx  # noqa: E402
+from docx_corpus import generate_docx, shape  # noqa: E402
+
+
+def read_row_cells(table):
+    """The previous reading: python-docx cells of every grid position, text read per use"""
+    rows = []
+    for row in table.rows:
+        rows.append([cell.text for cell in row.cells if cell.text.strip()])
+    return rows
+
+
+def read_grid(table):
+    grid = table_grid(table)
+    return [[cell.text for cell in grid.positions(index) if cell.text.strip()]
+            for index in range(len(grid.rows))]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--cols', type=int, nargs='+', default=[31, 91, 271])
+    parser.add_argument('--merged', type=int, default=3)
+    args = parser.parse_args()
+
+    identical = True
+    print(f"{'table':<12} {'cells':>8} {'row.cells ms':>13} {'grid ms':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for cols in args.cols:
+            path = Path(tmp) / f'merged_{cols}.docx'
+            generate_docx(path, shape(tables=1, rows=args.rows, cols=cols, merged=args.merged))
+            table = open_python_docx(path).tables[0]
+            old_time, expected = timed(read_row_cells, table)
+            new_time, rows = timed(read_grid, table)
+            identical = identical and rows == expected
+            print(f"{f'{args.rows} x {cols}':<12} {args.rows * cols:>8} {old_time * 1000:>13.1f} "
+                  f"{new_time * 1000:>10.1f} {old_time / new_time:>8.2f}")
+
+    print(f"grid positions {'identical' if identical else 'DIFFERENT'} to python-docx row.cells")
+    sys.exit(0 if identical else 1)
@@ -0,0 +1,139 @@
+"""Benchmark the compact table model of extract_tables against lists of lists
+
+Usage: python benchmarks/bench_table_model.py [--rows 10000] [--cols 10] [--tables 4]
+
+Builds tables of spreadsheet-like cells (repeated labels, numbers, blank
+cells and duplicate rows) the way extract_tables used to, as lists of lists
+with a set of row tuples for deduplication, and as CompactTable. Reports
+the memory held by the tables and the peak while building and writing
+them, and the output size of every format. The JSON written by
+table_model is compared byte for byte with json.dump(..., indent=2).
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx2md.table_model import CompactTable, StringPool, write_json, write_tables  # noqa: E402
+
+
+def spreadsheet_rows(rows, cols, seed=0):
+    """Rows of cell texts; about one row in twenty repeats an earlier one"""
+    rng = random.Random(seed)
+    labels = [f'Category {i}' for i in range(50)]
+    generated = []
+    for r in range(rows):
+        if generated and rng.random() < 0.05:
+            generated.append(list(rng.choice(generated)))
+            continue
+        row = [rng.choice(labels)]
+        for _ in range(cols - 1):
+            choice = rng.random()
+            if choice < 0.1:
+                row.append('')
+            elif choice < 0.4:
+                row.append(rng.choice(('Yes', 'No', 'N/A', '-')))
+            else:
+                row.append(f'{rng.randint(0, 99999):,}')
+        generated.append(row)
+    return generated
+
+
+def build_lists(tables):
+    """The previous representation: lists of lists and a set of row tuples per table"""
+    built = []
+    for rows in tables:
+        table, seen_rows = [], set()
+        for row in rows:
+            cleaned_row = [cell for cell in row if cell]
+            if cleaned_row and tuple(cleaned_row) not in seen_rows:
+                table.append(cleaned_row)
+                seen_rows.add(tuple(cleaned_row))
+        built.append((table, seen_rows))
+    return built
+
+
+def build_compact(tables):
+    pool = StringPool()
+    built = []
+    for rows in tables:
+        table = CompactTable(pool)
+        for row in rows:
+            cleaned_row = [cell for cell in row if cell]
+            if cleaned_row:
+                table.add_row(cleaned_row)
+        table.freeze()
+        built.append(table)
+    return built
+
+
+def measure(func, *args):
+    """Return (seconds, memory held by the result, peak memory) of func(*args)
+
+    The time is taken from a run without tracemalloc, which slows
+    allocations down a lot.
+    """
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = func(*args)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, held, peak
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--cols', type=int, default=10)
+    parser.add_argument('--tables', type=int, default=4)
+    args = parser.parse_args()
+
+    # Fresh string objects per cell, as docx2python produces them
+    tables = [[[cell.encode().decode() for cell in row] for row in spreadsheet_rows(args.rows, args.cols, seed)]
+              for seed in range(args.tables)]
+    print(f"{args.tables} tables of {args.rows} x {args.cols} cells")
+
+    print(f"{'model':<16} {'ms':>10} {'held MiB':>10} {'peak MiB':>10}")
+    for name, func in (('lists + set', build_lists), ('CompactTable', build_compact)):
+        elapsed, held, peak = measure(func, tables)
+        print(f"{name:<16} {elapsed * 1000:>10.1f} {held / 2 ** 20:>10.1f} {peak / 2 ** 20:>10.1f}")
+
+    compact = build_compact(tables)
+    expected = json.dumps([table for table, _ in build_lists(tables)], ensure_ascii=False, indent=2)
+    buffer = io.StringIO()
+    write_json(compact, buffer)
+    identical = buffer.getvalue() == expected
+
+    print(f"\n{'format':<16} {'ms':>10} {'peak MiB':>10} {'bytes':>12}")
+    lists = [table for table, _ in build_lists(tables)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'legacy.json')
+
+        def dump_lists():
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(lists, f, ensure_ascii=False, indent=2)
+
+        elapsed, _, peak = measure(dump_lists)
+        print(f"{'json.dump':<16} {elapsed * 1000:>10.1f} {peak / 2 ** 20:>10.1f} {os.path.getsize(path):>12}")
+        for table_format in ('json', 'jsonl', 'parquet'):
+            path = os.path.join(tmp, f'tables.{table_format}')
+            try:
+                elapsed, _, peak = measure(write_tables, compact, path, table_format)
+            except RuntimeError as e:
+                print(f"{table_format:<16} {e}")
+                continue
+            print(f"{table_format:<16} {elapsed * 1000:>10.1f} {peak / 2 ** 20:>10.1f} "
+                  f"{os.path.getsize(path):>12}")
+    print(f"\nJSON output {'identical' if identical else 'DIFFERENT'} to json.dump(..., indent=2)")
+    sys.exit(0 if identical else 1)
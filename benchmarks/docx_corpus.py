@@ -0,0 +1,265 @@
+"""Generate synthetic DOCX files of controlled size and shape for benchmarks
+
+Usage: python benchmarks/docx_corpus.py OUTPUT_DIR [--scale 1.0] [--seed 0]
+
+Writes one document per entry of CORPUS (or per shape given with --only).
+The documents are assembled directly from WordprocessingML, so generating
+them needs nothing beyond the standard library. Each shape controls the
+paragraph count, the number and size of tables, nested tables, inline
+images and hyperlinks.
+"""
+import argparse
+import random
+import struct
+import sys
+import zipfile
+import zlib
+from collections import namedtuple
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+
+# The shape of a generated document. Every count is per document; nested is
+# the depth of tables nested inside the first cell of each table. With merged,
+# the first column of each table is merged vertically over that many rows and
+# the other cells horizontally over that many grid columns.
+Shape = namedtuple('Shape', ['paragraphs', 'tables', 'rows', 'cols', 'nested', 'images',
+                             'hyperlinks', 'image_kb', 'merged'])
+
+
+def shape(paragraphs=0, tables=0, rows=0, cols=0, nested=0, images=0, hyperlinks=0, image_kb=4, merged=0):
+    return Shape(paragraphs, tables, rows, cols, nested, images, hyperlinks, image_kb, merged)
+
+
+CORPUS = {
+    'small': shape(paragraphs=20, tables=1, rows=4, cols=3, hyperlinks=2),
+    'prose': shape(paragraphs=3000, hyperlinks=50),
+    'tables': shape(paragraphs=200, tables=100, rows=20, cols=5),
+    'wide_tables': shape(paragraphs=50, tables=10, rows=50, cols=20),
+    'nested': shape(paragraphs=100, tables=50, rows=6, cols=4, nested=2),
+    'merged': shape(paragraphs=50, tables=5, rows=200, cols=91, merged=3),
+    'media': shape(paragraphs=300, images=40, image_kb=64),
+    'links': shape(paragraphs=1000, hyperlinks=1000),
+    'large': shape(paragraphs=20000, tables=300, rows=15, cols=6, nested=1, images=20,
+                   hyperlinks=500),
+}
+
+WORDS = ('document', 'project', 'evaluation', 'partner', 'budget', 'report', 'annual', 'results',
+         'strategy', 'development', 'organisation', 'performance', 'mission', 'objectif',
+         'évaluation', 'résultats', 'organisation', 'проект', 'отчет', 'оценка', 'бюджет',
+         'the', 'of', 'and', 'for', 'with', 'des', 'les', 'и', 'в', 'на')
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+WP_NS = 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing'
+A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+PIC_NS = 'http://schemas.openxmlformats.org/drawingml/2006/picture'
+REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+REL_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+CONTENT_TYPES = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Default Extension="png" ContentType="image/png"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+</Types>'''
+
+PACKAGE_RELS = f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="{REL_NS}">
+<Relationship Id="rId1" Type="{REL_TYPE}/officeDocument" Target="word/document.xml"/>
+</Relationships>'''
+
+STYLES = f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="{W_NS}">
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/><w:pPr><w:outlineLvl w:val="0"/></w:pPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/><w:basedOn w:val="Normal"/><w:pPr><w:outlineLvl w:val="1"/></w:pPr></w:style>
+<w:style w:type="table" w:default="1" w:styleId="TableNormal"><w:name w:val="Normal Table"/></w:style>
+</w:styles>'''
+
+EMU_PER_PIXEL = 9525
+
+
+def make_png(size_kb, rng):
+    """A valid RGB PNG of roughly size_kb kilobytes of incompressible pixels"""
+    width = 64
+    height = max(1, size_kb * 1024 // (width * 3))
+    raw = b''.join(b'\0' + bytes(rng.getrandbits(8) for _ in range(width * 3))
+                   for _ in range(height))
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data
+                + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    png = (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+           + chunk(b'IDAT', zlib.compress(raw, 1)) + chunk(b'IEND', b''))
+    return png, width, height
+
+
+class DocumentBuilder:
+    """Accumulates the body XML, relationships and media of one document"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.body = []
+        self.rels = [f'<Relationship Id="rIdStyles" Type="{REL_TYPE}/styles" Target="styles.xml"/>']
+        self.media = {}
+
+    def words(self, low, high):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(self.rng.randint(low, high)))
+
+    def run(self, text):
+        return f'<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+    def hyperlink(self, text):
+        rel_id = f'rIdLink{len(self.rels)}'
+        url = f'https://example.org/{self.rng.choice(WORDS[:14])}/{len(self.rels)}'
+        self.rels.append(f'<Relationship Id="{rel_id}" Type="{REL_TYPE}/hyperlink" '
+                         f'Target={quoteattr(url)} TargetMode="External"/>')
+        return f'<w:hyperlink r:id="{rel_id}">{self.run(text)}</w:hyperlink>'
+
+    def image(self, size_kb):
+        number = len(self.media) + 1
+        rel_id = f'rIdImage{number}'
+        png, width, height = make_png(size_kb, self.rng)
+        self.media[f'word/media/image{number}.png'] = png
+        self.rels.append(f'<Relationship Id="{rel_id}" Type="{REL_TYPE}/image" '
+                         f'Target="media/image{number}.png"/>')
+        cx, cy = width * EMU_PER_PIXEL, height * EMU_PER_PIXEL
+        return (f'<w:r><w:drawing><wp:inline distT="0" distB="0" distL="0" distR="0">'
+                f'<wp:extent cx="{cx}" cy="{cy}"/>'
+                f'<wp:docPr id="{number}" name="Picture {number}" descr="Image {number}"/>'
+                f'<a:graphic><a:graphicData uri="{PIC_NS}"><pic:pic>'
+                f'<pic:nvPicPr><pic:cNvPr id="{number}" name="image{number}.png"/><pic:cNvPicPr/></pic:nvPicPr>'
+                f'<pic:blipFill><a:blip r:embed="{rel_id}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+                f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+                f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></pic:spPr>'
+                f'</pic:pic></a:graphicData></a:graphic></wp:inline></w:drawing></w:r>')
+
+    def paragraph(self, content, style=None):
+        ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+        return f'<w:p>{ppr}{content}</w:p>'
+
+    def table(self, rows, cols, nested=0, merged=0):
+        grid = ''.join('<w:gridCol w:w="2000"/>' for _ in range(cols))
+        xml = [f'<w:tbl><w:tblPr><w:tblW w:w="0" w:type="auto"/></w:tblPr><w:tblGrid>{grid}</w:tblGrid>']
+        for r in range(rows):
+            xml.append('<w:tr>')
+            c = 0
+            while c < cols:
+                span = min(merged, cols - c) if merged and c else 1
+                merge = ''
+                if span > 1:
+                    merge = f'<w:gridSpan w:val="{span}"/>'
+                elif merged and not c:
+                    merge = '<w:vMerge w:val="restart"/>' if r % merged == 0 else '<w:vMerge/>'
+                xml.append(f'<w:tc><w:tcPr><w:tcW w:w="{2000 * span}" w:type="dxa"/>{merge}</w:tcPr>')
+                if nested and r == 0 and c == 0:
+                    xml.append(self.table(max(2, rows // 2), max(2, cols // 2), nested - 1))
+                if merge == '<w:vMerge/>':
+                    xml.append(self.paragraph(''))
+                else:
+                    text = self.words(1, 4) if r else self.words(1, 2).upper()
+                    xml.append(self.paragraph(self.run(text)))
+                xml.append('</w:tc>')
+                c += span
+            xml.append('</w:tr>')
+        xml.append('</w:tbl>')
+        return ''.join(xml)
+
+    def build(self, spec):
+        """Lay out the body: headings and prose, with tables, images and links spread evenly"""
+        total = max(spec.paragraphs, 1)
+        table_every = total / spec.tables if spec.tables else None
+        image_every = total / spec.images if spec.images else None
+        link_every = total / spec.hyperlinks if spec.hyperlinks else None
+        tables = images = links = 0
+
+        for i in range(spec.paragraphs):
+            if i % 25 == 0:
+                self.body.append(self.paragraph(self.run(self.words(2, 5).title()), 'Heading1'))
+            elif i % 25 == 12:
+                self.body.append(self.paragraph(self.run(self.words(2, 4).upper())))
+
+            content = [self.run(self.words(8, 40))]
+            while link_every and links < spec.hyperlinks and links * link_every <= i:
+                content.append(self.run(' '))
+                content.append(self.hyperlink(self.words(1, 3)))
+                links += 1
+            self.body.append(self.paragraph(''.join(content)))
+
+            while image_every and images < spec.images and images * image_every <= i:
+                self.body.append(self.paragraph(self.image(spec.image_kb)))
+                images += 1
+            while table_every and tables < spec.tables and tables * table_every <= i:
+                self.body.append(self.table(spec.rows, spec.cols, spec.nested, spec.merged))
+                tables += 1
+
+        # Without paragraphs everything still has to be emitted
+        for _ in range(tables, spec.tables):
+            self.body.append(self.table(spec.rows, spec.cols, spec.nested, spec.merged))
+        for _ in range(images, spec.images):
+            self.body.append(self.paragraph(self.image(spec.image_kb)))
+        for _ in range(links, spec.hyperlinks):
+            self.body.append(self.paragraph(self.hyperlink(self.words(1, 3))))
+
+    def document_xml(self):
+        return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}" xmlns:wp="{WP_NS}" '
+                f'xmlns:a="{A_NS}" xmlns:pic="{PIC_NS}"><w:body>{"".join(self.body)}'
+                f'<w:sectPr/></w:body></w:document>')
+
+    def rels_xml(self):
+        return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<Relationships xmlns="{REL_NS}">{"".join(self.rels)}</Relationships>')
+
+
+def scaled(spec, scale):
+    """Scale the counts of a shape, keeping table dimensions and image sizes"""
+    if scale == 1:
+        return spec
+    return spec._replace(**{name: max(1, int(getattr(spec, name) * scale)) if getattr(spec, name) else 0
+                            for name in ('paragraphs', 'tables', 'images', 'hyperlinks')})
+
+
+def generate_docx(path, spec, seed=0):
+    """Write a DOCX file with the given Shape to path"""
+    builder = DocumentBuilder(random.Random(seed))
+    builder.build(spec)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr('[Content_Types].xml', CONTENT_TYPES)
+        docx.writestr('_rels/.rels', PACKAGE_RELS)
+        docx.writestr('word/document.xml', builder.document_xml())
+        docx.writestr('word/_rels/document.xml.rels', builder.rels_xml())
+        docx.writestr('word/styles.xml', STYLES)
+        for name, data in builder.media.items():
+            # Images are already compressed
+            docx.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+    return path
+
+
+def generate_corpus(output_dir, names=None, scale=1.0, seed=0):
+    """Generate the documents of CORPUS into output_dir and return their paths by name"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for name in names or CORPUS:
+        paths[name] = generate_docx(output_dir / f'{name}.docx', scaled(CORPUS[name], scale), seed)
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate a synthetic DOCX corpus")
+    parser.add_argument('output_dir', help="directory for the generated documents")
+    parser.add_argument('--only', nargs='+', choices=list(CORPUS), help="shapes to generate")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="multiply paragraph, table, image and link counts")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    for name, path in generate_corpus(args.output_dir, args.only, args.scale, args.seed).items():
+        print(f"{name:<12} {path.stat().st_size / 1024:10.0f} KiB  {path}")
+    sys.exit(0)
@@ -0,0 +1,126 @@
+"""Measure throughput and latency of a running conversion server
+
+Usage: python benchmarks/load_generator.py input.docx [--url http://127.0.0.1:8765]
+                                           [--socket PATH] [--backend html]
+                                           [--requests 200] [--concurrency 8]
+
+Start the server first, e.g. ``docx2md serve -j 4`` or
+``docx2md serve --socket /tmp/docx2md.sock``. Every client thread keeps
+one connection open and posts the document repeatedly. Reports requests
+per second, latency percentiles and the count of each response status
+(503 means the server shed load, 504 a request timed out).
+"""
+import argparse
+import http.client
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix socket"""
+
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def make_connection(args):
+    if args.socket:
+        return UnixHTTPConnection(args.socket, timeout=args.client_timeout)
+    url = urlsplit(args.url)
+    return http.client.HTTPConnection(url.hostname, url.port or 80, timeout=args.client_timeout)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_client(args, body, counter, results, lock):
+    """Post the document until the shared request budget is used up"""
+    connection = make_connection(args)
+    path = f"/convert?backend={args.backend}"
+    headers = {'Content-Type': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'}
+    while True:
+        with lock:
+            if counter[0] >= args.requests:
+                break
+            counter[0] += 1
+
+        start = time.perf_counter()
+        try:
+            connection.request('POST', path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+        except (OSError, http.client.HTTPException) as e:
+            status = type(e).__name__
+            connection.close()
+        elapsed = time.perf_counter() - start
+
+        with lock:
+            results.append((status, elapsed))
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', help="DOCX file to post")
+    parser.add_argument('--url', default='http://127.0.0.1:8765', help="server URL")
+    parser.add_argument('--socket', default=None, help="Unix socket of the server (instead of --url)")
+    parser.add_argument('--backend', default='html', help="backend to request")
+    parser.add_argument('-n', '--requests', type=int, default=200, help="total number of requests")
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help="number of client threads")
+    parser.add_argument('--client-timeout', type=float, default=120.0,
+                        help="socket timeout of the clients in seconds")
+    args = parser.parse_args()
+
+    with open(args.input, 'rb') as f:
+        body = f.read()
+
+    counter = [0]
+    results = []
+    lock = threading.Lock()
+    threads = [threading.Thread(target=run_client, args=(args, body, counter, results, lock))
+               for _ in range(args.concurrency)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in results)
+    ok = sorted(elapsed for status, elapsed in results if status == 200)
+
+    print(f"{len(results)} requests, concurrency {args.concurrency}, "
+          f"{len(body) / 1024:.0f} KiB document, backend {args.backend}")
+    print(f"wall time   {wall:8.2f} s")
+    print(f"throughput  {len(ok) / wall:8.2f} successful requests/s")
+    if ok:
+        for label, fraction in (('p50', 0.50), ('p90', 0.90), ('p99', 0.99)):
+            print(f"{label:<11} {percentile(ok, fraction) * 1000:8.1f} ms")
+        print(f"{'max':<11} {ok[-1] * 1000:8.1f} ms")
+    print("statuses    " + ', '.join(f"{status}: {count}" for status, count in sorted(
+        statuses.items(), key=lambda item: str(item[0]))))
+
+    return 0 if statuses.get(200, 0) == len(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1 @@
+"""DOCX to Markdown converters and the docx2md command line"""
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from . import backends
+from .backends import DEFAULT_BACKEND, ConversionError
+from .conversion_cache import read_source_bytes
+
+
+# The outcome of one conversion. source is the path that was converted, or
+# None when the document was given as bytes; elapsed is in seconds.
+ConversionResult = namedtuple('ConversionResult', ['source', 'backend', 'markdown', 'elapsed'])
+
+
+async def read_source(source):
+    """Read a DOCX path or binary file object without blocking the event loop"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    try:
+        return await asyncio.to_thread(read_source_bytes, source)
+    except OSError as e:
+        raise ConversionError(f"Error reading file: {str(e)}") from e
+
+
+async def convert(source, backend=DEFAULT_BACKEND, executor=None):
+    """Convert a DOCX path or bytes to Markdown without blocking the event loop
+
+    The file is read in a thread and parsed in executor (the loop's default
+    thread pool when None). Returns a ConversionResult. Raises ValueError
+    for an unknown backend and ConversionError when the document cannot
+    be read or converted; nothing is printed.
+    """
+    backends.check_backend(backend)
+    start = time.perf_counter()
+    data = await read_source(source)
+    loop = asyncio.get_running_loop()
+    markdown = await loop.run_in_executor(executor, backends.convert, backend, data)
+
+    if isinstance(source, (bytes, bytearray, memoryview)) or hasattr(source, 'read'):
+        source = None
+    return ConversionResult(source, backend, markdown, time.perf_counter() - start)
+
+
+class AsyncConverter:
+    """Convert many documents concurrently from asyncio code
+
+    Parsing is CPU bound, so by default it runs in a pool of worker
+    processes that load the converters once. At most max_concurrency
+    conversions are in flight; further calls wait their turn. Cancelling a
+    call drops its conversion if it has not started; a running one
+    finishes in its worker and the result is discarded.
+
+        async with AsyncConverter(workers=4) as converter:
+            results = await converter.convert_many(paths, backend='mammoth')
+    """
+
+    def __init__(self, max_concurrency=None, executor=None, workers=None):
+        self._owns_executor = executor is None
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=backends.warm_up)
+        self.executor = executor
+        self.max_concurrency = max_concurrency or workers or os.cpu_count() or 1
+        # Created on first use so that it belongs to the running loop
+        self._semaphore = None
+
+    async def convert(self, source, backend=DEFAULT_BACKEND, timeout=None):
+        """Convert one document, see convert(); raises asyncio.TimeoutError after timeout seconds"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await asyncio.wait_for(convert(source, backend, self.executor), timeout)
+
+    async def convert_many(self, sources, backend=DEFAULT_BACKEND, timeout=None, return_exceptions=True):
+        """Convert several documents, returning results in the order of sources
+
+        With return_exceptions, a document that fails has its exception in
+        place of its ConversionResult and the others carry on.
+        """
+        return await asyncio.gather(*(self.convert(source, backend, timeout) for source in sources),
+                                    return_exceptions=return_exceptions)
+
+    def close(self):
+        """Shut down the worker pool if this converter created it"""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
@@ -0,0 +1,49 @@
+import importlib
+
+from .docx_to_html_markdown import ConversionError
+
+
+# backend name -> module of this package providing convert_docx_to_markdown(source)
+BACKENDS = {
+    'html': 'docx_to_html_markdown',
+    'mammoth': 'extract_text_mammoth',
+    'text': 'extract_text_docx2python',
+    'docx': 'docs_to_markdown',
+    'direct': 'mammoth_markdown',
+}
+DEFAULT_BACKEND = 'html'
+
+# Libraries the converters import lazily, loaded by warm_up
+WARM_IMPORTS = ('mammoth', 'html2text', 'tabulate', 'docx')
+
+
+def check_backend(backend):
+    """Raise ValueError unless backend is a known backend name"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+
+
+def warm_up():
+    """Import every backend and the libraries it uses, e.g. in a new worker process"""
+    for module in BACKENDS.values():
+        importlib.import_module('.' + module, __package__)
+    for module in WARM_IMPORTS:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+
+def convert(backend, source):
+    """Convert a DOCX path, bytes or binary file object to Markdown with a backend
+
+    Converter failures are raised as ConversionError.
+    """
+    check_backend(backend)
+    module = importlib.import_module('.' + BACKENDS[backend], __package__)
+    try:
+        return module.convert_docx_to_markdown(source)
+    except ConversionError:
+        raise
+    except Exception as e:
+        raise ConversionError(f"Error processing file: {str(e)}") from e
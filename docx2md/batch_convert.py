@@ -0,0 +1,218 @@
+import glob
+import os
+import sys
+import time
+from pathlib import Path
+
+from .conversion_cache import ConversionCache
+from .docx_to_html_markdown import process_file
+from .image_policy import DEFAULT_IMAGE_POLICY, MEDIA_DIR_NAME
+from .markdown_writer import remove_temporaries
+
+
+GLOB_CHARS = set('*?[')
+
+
+def read_manifest(manifest_path):
+    """Read input paths from a manifest file, one per line
+
+    Blank lines and lines starting with '#' are ignored. Relative paths are
+    resolved against the directory of the manifest.
+    """
+    manifest_path = Path(manifest_path)
+    paths = []
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            path = Path(line)
+            if not path.is_absolute():
+                path = manifest_path.parent / path
+            paths.append(path)
+    return paths
+
+
+def collect_inputs(source):
+    """Resolve a directory, glob pattern or manifest file to (base_dir, inputs)
+
+    base_dir is the directory the output tree is mirrored from.
+    """
+    if GLOB_CHARS & set(source):
+        # Everything before the first wildcard component is the base directory
+        parts = Path(source).parts
+        fixed = []
+        for part in parts:
+            if GLOB_CHARS & set(part):
+                break
+            fixed.append(part)
+        base_dir = Path(*fixed) if fixed else Path('.')
+        inputs = [Path(p) for p in glob.glob(source, recursive=True)]
+    elif os.path.isdir(source):
+        base_dir = Path(source)
+        inputs = list(base_dir.rglob('*.docx'))
+    elif source.lower().endswith('.docx'):
+        base_dir = Path(source).parent
+        inputs = [Path(source)]
+    else:
+        inputs = read_manifest(source)
+        if not inputs:
+            return Path('.'), []
+        base_dir = Path(os.path.commonpath([str(p.parent.resolve()) for p in inputs]))
+        inputs = [p.resolve() for p in inputs]
+
+    # Skip Word lock files such as "~$report.docx"
+    inputs = [p for p in inputs if p.is_file() and not p.name.startswith('~$')]
+    return base_dir, sorted(inputs)
+
+
+def output_path_for(input_path, base_dir, output_dir):
+    """Mirror input_path under output_dir with a .md extension"""
+    try:
+        relative = Path(input_path).resolve().relative_to(Path(base_dir).resolve())
+    except ValueError:
+        relative = Path(Path(input_path).name)
+    return Path(output_dir) / relative.with_suffix('.md')
+
+
+def is_up_to_date(input_path, output_path):
+    """Check whether output_path exists and is newer than input_path"""
+    try:
+        return os.path.getmtime(output_path) >= os.path.getmtime(input_path)
+    except OSError:
+        return False
+
+
+def convert_one(input_path, output_path, cache_dir=None, image_policy=DEFAULT_IMAGE_POLICY, media_dir=None):
+    """Convert a single file in a worker, returning an error message or None"""
+    cache = ConversionCache(cache_dir) if cache_dir else None
+    try:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        # The writer only replaces output_path once the Markdown is complete,
+        # so an interrupted conversion never leaves a partial output that
+        # looks up to date
+        process_file(input_path, output_path, verbose=False, cache=cache, image_policy=image_policy,
+                     media_dir=media_dir)
+        return None
+    except Exception as e:
+        return str(e)
+
+
+def _run_in_pool(job_args, workers, record):
+    """Run convert_one on job_args in a pool, with at most workers jobs in flight
+
+    record(input_path, error) is called for every finished job. If a worker
+    process dies, the pool is broken and the run stops; returns the jobs that
+    were in flight then, whose partial outputs are removed, and the jobs not
+    started yet.
+    """
+    # Imported here so that building the command line stays cheap
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from concurrent.futures.process import BrokenProcessPool
+
+    pending = list(reversed(job_args))
+    in_flight = {}
+    crashed = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while (pending or in_flight) and not crashed:
+            while pending and len(in_flight) < workers:
+                args = pending.pop()
+                in_flight[executor.submit(convert_one, *args)] = args
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            if any(isinstance(future.exception(), BrokenProcessPool) for future in finished):
+                # The pool is broken: the jobs in flight fail with it, unless they finished first
+                finished, _ = wait(in_flight)
+            for future in finished:
+                args = in_flight.pop(future)
+                try:
+                    error = future.result()
+                except BrokenProcessPool:
+                    crashed.append(args)
+                    continue
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+                record(args[0], error)
+    # The workers killed with the pool could not remove their temporary files
+    for args in crashed:
+        remove_temporaries(args[1])
+    return crashed, pending[::-1]
+
+
+def convert_batch(source, output_dir, workers=None, force=False, verbose=True, cache_dir=None,
+                  image_policy=DEFAULT_IMAGE_POLICY, media_dir=None):
+    """Convert every DOCX file found in source, mirroring the tree into output_dir
+
+    With cache_dir, conversions are shared through a ConversionCache there.
+    With image_policy 'extract', the images of all files are stored once in
+    media_dir (by default output_dir/media) under the hash of their content.
+
+    Returns a dict with lists of 'converted', 'skipped' and 'failed' files;
+    failed entries are (path, error message) tuples.
+    """
+    base_dir, inputs = collect_inputs(source)
+    if media_dir is None:
+        media_dir = Path(output_dir) / MEDIA_DIR_NAME
+    report = {'converted': [], 'skipped': [], 'failed': []}
+
+    jobs = []
+    for input_path in inputs:
+        output_path = output_path_for(input_path, base_dir, output_dir)
+        if not force and is_up_to_date(input_path, output_path):
+            report['skipped'].append(input_path)
+        else:
+            jobs.append((input_path, output_path))
+
+    if verbose:
+        print(f"Found {len(inputs)} files, {len(jobs)} to convert, "
+              f"{len(report['skipped'])} up to date")
+
+    if not jobs:
+        return report
+
+    done = 0
+
+    def record(input_path, error):
+        nonlocal done
+        done += 1
+        if error is None:
+            report['converted'].append(input_path)
+        else:
+            report['failed'].append((input_path, error))
+            if verbose:
+                print(f"FAILED {input_path}: {error}", file=sys.stderr)
+        if verbose and done % 100 == 0:
+            print(f"{done}/{len(jobs)} files processed")
+
+    job_args = [(input_path, output_path, cache_dir, image_policy, media_dir) for input_path, output_path in jobs]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    suspects = []
+    while job_args:
+        crashed, job_args = _run_in_pool(job_args, workers, record)
+        suspects.extend(crashed)
+    # One of the jobs running when a worker died killed it; running each of
+    # them alone finds which, without failing the others
+    for args in suspects:
+        if _run_in_pool([args], 1, record)[0]:
+            record(args[0], "The worker process died while converting this file")
+
+    return report
+
+
+def run(args):
+    """Run a batch conversion from parsed arguments and return the exit status"""
+    start = time.perf_counter()
+    report = convert_batch(args.source, args.output_dir, workers=args.workers, force=args.force,
+                           cache_dir=args.cache_dir, image_policy=args.images, media_dir=args.media_dir)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nConverted: {len(report['converted'])}, skipped: {len(report['skipped'])}, "
+          f"failed: {len(report['failed'])} in {elapsed:.1f}s")
+    for input_path, error in report['failed']:
+        print(f"  {input_path}: {error}", file=sys.stderr)
+
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    from . import cli
+    sys.exit(cli.main(['batch', *sys.argv[1:]]))
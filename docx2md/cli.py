@@ -0,0 +1,341 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+
+# Converter modules are imported inside the subcommands, so that a run only
+# loads the libraries of the backend it uses.
+
+IMPORTTIME_RE = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)\s*$')
+PROFILE_TOP = 15
+
+
+def make_cache(cache_dir):
+    """Return a ConversionCache if a cache directory is given or set in the environment"""
+    from .conversion_cache import CACHE_DIR_ENV, ConversionCache
+    if cache_dir or os.environ.get(CACHE_DIR_ENV):
+        return ConversionCache(cache_dir)
+    return None
+
+
+def make_stats(args):
+    """Return an instrumentation.Stats for --stats, or the no-op stand-in"""
+    from .instrumentation import NULL_STATS, Stats, format_stats
+    if not args.stats:
+        return NULL_STATS
+
+    def report(result):
+        print("\nConversion stages:", file=sys.stderr)
+        print(format_stats(result), file=sys.stderr)
+
+    return Stats(trace_memory=args.trace_memory, callback=report)
+
+
+def print_preview(preview):
+    print("\nPreview of the first few lines:")
+    print("-" * 80)
+    print(preview)
+    print("-" * 80)
+
+
+def run_html(args):
+    """mammoth HTML conversion followed by html2text, with tables as pipe tables"""
+    from .docx_to_html_markdown import ConversionError, process_file
+    try:
+        process_file(args.input, args.output, cache=make_cache(args.cache_dir), stats=make_stats(args),
+                     pad_tables=not args.no_pad_tables, table_workers=args.table_workers,
+                     image_policy=args.images, media_dir=args.media_dir)
+    except ConversionError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_direct(args):
+    """mammoth conversion handed straight to html2text, without the HTML round trip"""
+    from .mammoth_markdown import ConversionError, convert
+    output_path = args.output or os.path.splitext(args.input)[0] + '.md'
+    try:
+        preview = convert(args.input, output_path, stats=make_stats(args),
+                          pad_tables=not args.no_pad_tables, table_workers=args.table_workers,
+                          image_policy=args.images, media_dir=args.media_dir)
+    except ConversionError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    print(f"Markdown saved to {output_path}")
+    print_preview(preview)
+    return 0
+
+
+def run_mammoth(args):
+    """mammoth raw text with heuristic headings and lists"""
+    from .extract_text_mammoth import extract_text_mammoth
+    output_path = args.output or 'output.md'
+    preview = extract_text_mammoth(args.input, output_path, cache=make_cache(args.cache_dir),
+                                   stats=make_stats(args), preview_only=True)
+    print(f"Markdown text has been saved to {output_path}")
+    print_preview(preview)
+    return 0
+
+
+def run_text(args):
+    """Paragraph text with links, followed by the tables"""
+    from .extract_text_docx2python import extract_text
+    extract_text(args.input, args.output or 'output_docx2python.md', stats=make_stats(args))
+    return 0
+
+
+def run_tables(args):
+    """Raw table data as JSON, JSON Lines or Parquet (docx2python)"""
+    from .extract_tables import extract_tables
+    extract_tables(args.input, args.output or 'tables_data.json', table_format=args.format,
+                   verbose=args.verbose)
+    return 0
+
+
+def run_docx(args):
+    """python-docx paragraphs and tables in document order"""
+    output_path = args.output or 'output.md'
+    if args.workers is not None and args.workers > 1:
+        from . import parallel_convert
+        preview = parallel_convert.convert(args.input, output_path, args.workers, stats=make_stats(args))
+    else:
+        from .docs_to_markdown import convert
+        preview = convert(args.input, output_path, stats=make_stats(args))
+    print(f"Markdown has been saved to {output_path}")
+    print_preview(preview)
+    return 0
+
+
+def run_incremental(args):
+    """python-docx conversion that re-renders only the paragraphs and tables changed since the last run"""
+    from .incremental_convert import convert_incremental
+    output_path = args.output or os.path.splitext(args.input)[0] + '.md'
+    report = convert_incremental(args.input, output_path, args.index, stats=make_stats(args))
+    print(f"{report['blocks']} blocks: {report['rendered']} rendered, {report['reused']} reused")
+    print(f"Markdown saved to {output_path}")
+    return 0
+
+
+def run_render(args):
+    """Parse a document once and write any of the docx and text Markdown, table data and plain text"""
+    from .render_outputs import DEFAULT_OUTPUTS, OUTPUT_NAMES, convert
+    outputs = {name: getattr(args, name) for name in OUTPUT_NAMES if getattr(args, name)}
+    if not outputs and args.save_model is None:
+        outputs = dict(DEFAULT_OUTPUTS)
+    try:
+        count = convert(args.input, outputs, stats=make_stats(args), table_format=args.format,
+                        model_path=args.save_model)
+    except ValueError as e:  # a stale or unreadable saved model
+        print(str(e), file=sys.stderr)
+        return 1
+    for name, output_path in outputs.items():
+        print(f"{name} output saved to {output_path}" + (f" ({count} tables)" if name == 'tables' else ''))
+    if args.save_model is not None:
+        print(f"Document model saved to {args.save_model}")
+    return 0
+
+
+def run_batch(args):
+    """Convert a directory, glob or manifest of DOCX files in parallel"""
+    from . import batch_convert
+    return batch_convert.run(args)
+
+
+def run_serve(args):
+    """Keep the converters loaded and serve conversions over HTTP or a Unix socket"""
+    from .conversion_server import serve
+    serve(host=args.host, port=args.port, socket_path=args.socket, workers=args.workers,
+          queue_size=args.queue_size, timeout=args.timeout, max_bytes=args.max_bytes,
+          verbose=args.verbose)
+    return 0
+
+
+def add_html_arguments(parser, with_cache=True):
+    add_single_arguments(parser, with_cache=with_cache)
+    parser.add_argument('--no-pad-tables', action='store_true',
+                        help="do not pad table columns to a common width (smaller output)")
+    parser.add_argument('--table-workers', type=int, default=None,
+                        help="format the tables of documents with many of them in this many processes")
+    add_image_arguments(parser)
+
+
+def add_image_arguments(parser, media_dir_default='media next to the output'):
+    # Choices mirror image_policy.IMAGE_POLICIES, which is not imported to build the parser
+    parser.add_argument('--images', choices=('drop', 'extract', 'inline'), default='drop',
+                        help="drop images (keep their alt text, default), extract them to the media "
+                             "directory and link them, or inline them as data: URIs")
+    parser.add_argument('--media-dir', default=None,
+                        help=f"directory for extracted images (default: {media_dir_default})")
+
+
+def add_tables_arguments(parser):
+    add_single_arguments(parser, with_cache=False, with_stats=False)
+    parser.add_argument('--format', choices=('json', 'jsonl', 'parquet'), default=None,
+                        help="output format (default: from the output suffix, else json; parquet needs pyarrow)")
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help="report every table found (-vv: also print the structure of the document body)")
+
+
+def add_docx_arguments(parser):
+    add_single_arguments(parser, with_cache=False)
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="convert large documents in chunks in this many processes")
+
+
+def add_incremental_arguments(parser):
+    add_single_arguments(parser, with_cache=False)
+    parser.add_argument('--index', default=None,
+                        help="sidecar index of the previous run (default: the output path + .index.json)")
+
+
+def add_render_arguments(parser):
+    parser.add_argument('input', help="DOCX file to convert, or a document model saved with --save-model")
+    # Names mirror render_outputs.OUTPUT_NAMES, which is not imported to build the parser
+    parser.add_argument('--docx', default=None, metavar='PATH',
+                        help="Markdown of the docx command (python-docx paragraphs and tables)")
+    parser.add_argument('--text', default=None, metavar='PATH',
+                        help="Markdown of the text command (paragraph text with links, then the tables)")
+    parser.add_argument('--tables', default=None, metavar='PATH',
+                        help="data of the document tables as JSON, JSON Lines or Parquet "
+                             "(not the same tables as the tables command)")
+    parser.add_argument('--plain', default=None, metavar='PATH',
+                        help="plain text with list markers and tab-separated table rows")
+    parser.add_argument('--format', choices=('json', 'jsonl', 'parquet'), default=None,
+                        help="format of --tables (default: from its suffix, else json)")
+    parser.add_argument('--save-model', default=None, metavar='PATH',
+                        help="also save the parsed document model, to render from it later without the DOCX")
+    parser.add_argument('--stats', action='store_true',
+                        help="report the time and size of every conversion stage")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="with --stats, also report peak allocations per stage (slower)")
+
+
+def add_batch_arguments(parser):
+    # batch_convert imports the html converter, so it is only imported to run the batch
+    parser.add_argument('source', help="directory, glob pattern (quoted) or manifest file")
+    parser.add_argument('output_dir', help="directory for the mirrored Markdown tree")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="number of worker processes (default: number of CPU cores)")
+    parser.add_argument('-f', '--force', action='store_true',
+                        help="convert files even if their output is up to date")
+    parser.add_argument('--cache-dir', default=None,
+                        help="reuse conversions of unchanged documents from this cache directory")
+    add_image_arguments(parser, media_dir_default='OUTPUT_DIR/media')
+
+
+def add_single_arguments(parser, with_cache=True, with_stats=True):
+    parser.add_argument('input', help="DOCX file to convert")
+    parser.add_argument('-o', '--output', default=None,
+                        help="output file (.gz and .zst outputs are compressed)")
+    if with_cache:
+        parser.add_argument('--cache-dir', default=None,
+                            help="reuse conversions of unchanged documents from this cache directory")
+    if with_stats:
+        parser.add_argument('--stats', action='store_true',
+                            help="report the time and size of every conversion stage")
+        parser.add_argument('--trace-memory', action='store_true',
+                            help="with --stats, also report peak allocations per stage (slower)")
+
+
+def add_serve_arguments(parser):
+    # Defaults mirror conversion_server, which is only imported when serving
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port (default: 8765)")
+    parser.add_argument('--socket', default=None, help="listen on this Unix socket instead of TCP")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="number of converter processes (default: number of CPU cores)")
+    parser.add_argument('--queue-size', type=int, default=32,
+                        help="requests allowed to wait for a worker before new ones get 503 (default: 32)")
+    parser.add_argument('--timeout', type=float, default=60.0,
+                        help="seconds before a request gets 504 (default: 60)")
+    parser.add_argument('--max-bytes', type=int, default=64 * 1024 * 1024,
+                        help="largest accepted document in bytes (default: 64 MiB)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="log every request")
+
+
+# name -> (handler, argument setup)
+COMMANDS = {
+    'html': (run_html, add_html_arguments),
+    'direct': (run_direct, lambda parser: add_html_arguments(parser, with_cache=False)),
+    'mammoth': (run_mammoth, add_single_arguments),
+    'text': (run_text, lambda parser: add_single_arguments(parser, with_cache=False)),
+    'tables': (run_tables, add_tables_arguments),
+    'docx': (run_docx, add_docx_arguments),
+    'incremental': (run_incremental, add_incremental_arguments),
+    'render': (run_render, add_render_arguments),
+    'batch': (run_batch, add_batch_arguments),
+    'serve': (run_serve, add_serve_arguments),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='docx2md', description="Convert DOCX documents to Markdown")
+    parser.add_argument('--profile-import', action='store_true',
+                        help="report the time spent importing modules after the run")
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+    for name, (handler, add_arguments) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=handler.__doc__, description=handler.__doc__)
+        add_arguments(subparser)
+        subparser.set_defaults(handler=handler)
+    return parser
+
+
+def parse_importtime(lines):
+    """Parse -X importtime output into (self_us, cumulative_us, depth, module) tuples"""
+    entries = []
+    for line in lines:
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((int(self_us), int(cumulative_us), len(indent) // 2, module))
+    return entries
+
+
+def format_import_report(entries, top=PROFILE_TOP):
+    """Summarise import times: the total and the slowest top-level imports"""
+    total = sum(self_us for self_us, _, _, _ in entries)
+    roots = sorted((e for e in entries if e[3] and e[2] == 0), key=lambda e: e[1], reverse=True)
+
+    lines = [f"Imported {len(entries)} modules in {total / 1000:.1f} ms", ""]
+    lines.append(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    for self_us, cumulative_us, _, module in roots[:top]:
+        lines.append(f"{cumulative_us / 1000:>14.1f}  {self_us / 1000:>8.1f}  {module}")
+    return '\n'.join(lines)
+
+
+def profile_imports(argv):
+    """Run docx2md in a child interpreter with -X importtime and report its imports"""
+    command = [sys.executable, '-X', 'importtime', '-m', __package__, *argv]
+    # The child finds the package where this one was imported from, installed or not
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    python_path = os.pathsep.join(filter(None, [package_root, os.environ.get('PYTHONPATH')]))
+    env = dict(os.environ, PYTHONPATH=python_path)
+    result = subprocess.run(command, stderr=subprocess.PIPE, text=True, env=env)
+
+    # Pass the child's own error output through
+    other = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+    if other:
+        print('\n'.join(other), file=sys.stderr)
+
+    print("\nImport profile:", file=sys.stderr)
+    print("-" * 80, file=sys.stderr)
+    print(format_import_report(parse_importtime(result.stderr.splitlines())), file=sys.stderr)
+    print("-" * 80, file=sys.stderr)
+    return result.returncode
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    args = build_parser().parse_args(argv)
+    if args.profile_import:
+        return profile_imports([arg for arg in argv if arg != '--profile-import'])
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
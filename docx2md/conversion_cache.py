@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+
+CACHE_DIR_ENV = 'DOCX_MD_CACHE_DIR'
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'docx_to_markdown'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+EVICT_EVERY = 100  # run eviction once per this many writes
+
+
+def read_source_bytes(source):
+    """Read the whole DOCX from a path, bytes or binary file object"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, 'read'):
+        return source.read()
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+def converter_version(module_files, distributions):
+    """Describe a converter: the versions of the libraries it uses and a digest of its code
+
+    module_files is the converter's source file, or a tuple of the files
+    it is made of. Library versions are read from package metadata, so
+    nothing is imported. importlib.metadata itself is slow to import and
+    only loaded here.
+    """
+    from importlib import metadata
+    
+    versions = []
+    for name in distributions:
+        try:
+            versions.append(f"{name}={metadata.version(name)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{name}=missing")
+
+    if isinstance(module_files, (str, os.PathLike)):
+        module_files = (module_files,)
+    code_digest = hashlib.sha256()
+    for module_file in module_files:
+        with open(module_file, 'rb') as f:
+            code_digest.update(f.read())
+    versions.append(f"code={code_digest.hexdigest()[:16]}")
+    return ';'.join(versions)
+
+
+def cache_key(data, converter, version, options=None):
+    """Build the cache key from the DOCX bytes, converter name, version and options"""
+    digest = hashlib.sha256()
+    digest.update(data)
+    digest.update(b'\0' + converter.encode('utf-8'))
+    digest.update(b'\0' + version.encode('utf-8'))
+    digest.update(b'\0' + json.dumps(options or {}, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """On-disk cache of converted Markdown keyed on content hashes
+
+    Entries are plain files under cache_dir. Reading an entry refreshes its
+    modification time, so eviction removes entries that have not been used
+    for max_age seconds and then the least recently used ones until the
+    cache fits in max_bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE):
+        if cache_dir is None:
+            cache_dir = os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._writes = 0
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.md"
+
+    def open(self, key):
+        """Open the cached Markdown for key as a text file, or return None"""
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if self.max_age is not None and time.time() - stat.st_mtime > self.max_age:
+                path.unlink()
+                return None
+            f = open(path, 'r', encoding='utf-8')
+            os.utime(path)
+            return f
+        except OSError:
+            return None
+
+    def get(self, key):
+        """Return the cached Markdown for key, or None"""
+        f = self.open(key)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def store(self, key, pieces):
+        """Pass pieces of Markdown through, storing them under key as they go
+
+        The entry only becomes visible once every piece has been consumed.
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for piece in pieces:
+                    f.write(piece)
+                    yield piece
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        if self._writes % EVICT_EVERY == 0:
+            self.evict()
+        self._writes += 1
+
+    def put(self, key, markdown):
+        """Store Markdown under key"""
+        for _ in self.store(key, (markdown,)):
+            pass
+
+    def evict(self):
+        """Remove expired entries, then the least recently used ones over max_bytes"""
+        now = time.time()
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob('*/*.md'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self.max_age is not None and now - stat.st_mtime > self.max_age:
+                self._remove(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if self.max_bytes is None or total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove every entry"""
+        for path in self.cache_dir.glob('*/*.md'):
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,339 @@
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from . import backends
+from .backends import BACKENDS, DEFAULT_BACKEND
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 32
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+STOP_POLL_INTERVAL = 0.5
+
+
+class ServerBusy(Exception):
+    """Every worker is busy and the request queue is full"""
+
+
+class ConversionTimeout(Exception):
+    """A conversion did not finish within the request timeout"""
+
+
+class WorkerCrashed(Exception):
+    """A worker process died during the conversion; the pool has been restarted"""
+
+
+def _terminate_workers(executor):
+    """Kill the processes of a ProcessPoolExecutor, whatever they are doing, and wait for them to exit"""
+    processes = list((getattr(executor, '_processes', None) or {}).values())
+    terminate = getattr(executor, 'terminate_workers', None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+    else:
+        for process in processes:
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.join()
+
+
+class ConversionService:
+    """A bounded pool of warm converter processes
+
+    At most workers conversions run at once and queue_size more wait for a
+    worker; further requests are rejected with ServerBusy instead of piling
+    up. A slot is only freed when its conversion really finishes.
+
+    A worker that does not finish within the timeout is recycled: new
+    requests go to a fresh pool, and the old one is killed once the other
+    conversions it is running are done. A pool that lost a worker process
+    is replaced the same way. The fresh pool only takes work once the old
+    one is gone, so there are never more than workers conversions or
+    worker processes.
+    """
+
+    def __init__(self, workers=None, queue_size=DEFAULT_QUEUE_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.workers + queue_size)
+        self._lock = threading.Lock()
+        self._futures = {}  # executor -> its unfinished futures
+        self._hung = set()  # futures that timed out while running
+        self._ready = threading.Event()  # cleared while a retired pool is still running
+        self._ready.set()
+        self._executor = self._new_executor()
+        self.stats = {'requests': 0, 'completed': 0, 'failed': 0, 'rejected': 0,
+                      'timed_out': 0, 'crashed': 0, 'restarts': 0, 'pending': 0}
+
+    def _new_executor(self):
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=backends.warm_up)
+        self._futures[executor] = set()
+        return executor
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            self.stats[name] += delta
+
+    def _release(self, executor, future):
+        with self._lock:
+            self.stats['pending'] -= 1
+            futures = self._futures.get(executor, set())
+            futures.discard(future)
+            self._hung.discard(future)
+            if not futures and executor is not self._executor:
+                self._futures.pop(executor, None)
+        self._slots.release()
+
+    def _submit(self, backend, data, timeout):
+        """Submit a conversion to the current pool; returns the pool and the future
+
+        Waits up to timeout for a retired pool to be killed first; returns
+        None, None if it is still running then.
+        """
+        if not self._ready.wait(timeout):
+            return None, None
+        with self._lock:
+            executor = self._executor
+            try:
+                future = executor.submit(backends.convert, backend, data)
+            except BrokenProcessPool:
+                return executor, None
+            self._futures[executor].add(future)
+            self.stats['pending'] += 1
+        future.add_done_callback(lambda future: self._release(executor, future))
+        return executor, future
+
+    def _retire(self, executor):
+        """Send new requests to a fresh pool and kill executor once its other conversions finish"""
+        with self._lock:
+            if self._executor is not executor:
+                return  # already replaced
+            self._executor = self._new_executor()
+            self.stats['restarts'] += 1
+            self._ready.clear()
+        threading.Thread(target=self._stop_when_idle, args=(executor,), daemon=True).start()
+
+    def _stop_when_idle(self, executor):
+        while True:
+            with self._lock:
+                busy = [future for future in self._futures.get(executor, ()) if future not in self._hung]
+            if not busy:
+                break
+            # Look again now and then: a conversion that times out meanwhile is not waited for
+            wait(busy, timeout=STOP_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+        # The futures of the killed conversions fail, which releases their slots
+        _terminate_workers(executor)
+        self._ready.set()
+
+    def convert(self, backend, data, timeout=None):
+        """Convert DOCX bytes to Markdown in a worker and return the string
+
+        Raises ValueError for an unknown backend, ServerBusy when the queue
+        is full, ConversionTimeout when the conversion takes too long,
+        WorkerCrashed when its worker process died and ConversionError when
+        the converter fails.
+        """
+        backends.check_backend(backend)
+        self._count('requests')
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise ServerBusy(f"{self.workers} workers busy and {self.queue_size} requests queued")
+
+        if timeout is None:
+            timeout = self.timeout
+        deadline = time.monotonic() + timeout
+        executor, future = self._submit(backend, data, timeout)
+        if executor is None:
+            # The old pool was still finishing its conversions when the time ran out
+            self._slots.release()
+            self._count('timed_out')
+            raise ConversionTimeout(f"Conversion did not finish in {timeout} seconds")
+        if future is None:
+            self._slots.release()
+            self._count('crashed')
+            self._retire(executor)
+            raise WorkerCrashed("The worker pool had lost a process; it has been restarted")
+        try:
+            markdown = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            self._count('timed_out')
+            # A request that is still queued is just dropped; a running one holds its worker
+            if not future.cancel():
+                with self._lock:
+                    self._hung.add(future)
+                self._retire(executor)
+            raise ConversionTimeout(f"Conversion did not finish in {timeout} seconds")
+        except BrokenProcessPool as e:
+            self._count('crashed')
+            self._retire(executor)
+            raise WorkerCrashed(f"Worker process died during the conversion: {e}") from e
+        except Exception:
+            self._count('failed')
+            raise
+        self._count('completed')
+        return markdown
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats.update(workers=self.workers, queue_size=self.queue_size, timeout=self.timeout)
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executors = [self._executor, *self._futures]
+        for executor in set(executors):
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ConversionHandler(BaseHTTPRequestHandler):
+    """HTTP API of the conversion server
+
+    POST /convert?backend=html   request body: the DOCX file, response: Markdown
+    GET  /health                 JSON counters of the service
+    """
+
+    server_version = 'docx2md'
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status, body, content_type='text/plain; charset=utf-8', headers=()):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, message, headers=()):
+        self._send(status, message + '\n', headers=headers)
+
+    def do_GET(self):
+        if urlsplit(self.path).path != '/health':
+            self._error(404, "Not found")
+            return
+        self._send(200, json.dumps(self.server.service.snapshot()), 'application/json')
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/convert':
+            self.close_connection = True
+            self._error(404, "Not found")
+            return
+
+        backend = parse_qs(url.query).get('backend', [DEFAULT_BACKEND])[0]
+        length = self.headers.get('Content-Length')
+        if length is None:
+            self.close_connection = True
+            self._error(411, "Content-Length required")
+            return
+        try:
+            length = int(length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._error(400, "Invalid Content-Length")
+            return
+        if length > self.server.max_bytes:
+            # The body is not read, so the connection cannot be reused
+            self.close_connection = True
+            self._error(413, f"Document larger than {self.server.max_bytes} bytes")
+            return
+        data = self.rfile.read(length)
+        try:
+            backends.check_backend(backend)
+        except ValueError as e:
+            self._error(400, str(e))
+            return
+
+        start = time.perf_counter()
+        try:
+            markdown = self.server.service.convert(backend, data)
+        except ServerBusy as e:
+            self._error(503, str(e), headers=[('Retry-After', '1')])
+            return
+        except ConversionTimeout as e:
+            self._error(504, str(e))
+            return
+        except WorkerCrashed as e:
+            self._error(500, str(e))
+            return
+        except Exception as e:
+            self._error(422, str(e))
+            return
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._send(200, markdown, 'text/markdown; charset=utf-8',
+                   headers=[('X-Conversion-Time', f"{elapsed_ms:.1f}")])
+
+    def address_string(self):
+        # Unix socket clients have no address
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None,
+                max_bytes=DEFAULT_MAX_BYTES, verbose=False):
+    """Create the HTTP server for a ConversionService, on TCP or a Unix socket"""
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, ConversionHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ConversionHandler)
+    server.service = service
+    server.max_bytes = max_bytes
+    server.verbose = verbose
+    return server
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, workers=None,
+          queue_size=DEFAULT_QUEUE_SIZE, timeout=DEFAULT_TIMEOUT, max_bytes=DEFAULT_MAX_BYTES,
+          verbose=False):
+    """Run the conversion server until interrupted"""
+    service = ConversionService(workers, queue_size, timeout)
+    server = make_server(service, host, port, socket_path, max_bytes, verbose)
+    address = socket_path if socket_path is not None else f"http://{host}:{server.server_address[1]}"
+    print(f"Serving {', '.join(BACKENDS)} conversions on {address} "
+          f"with {service.workers} workers", file=sys.stderr)
+    # Shut down cleanly when a service manager stops the daemon
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        if socket_path is not None and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+if __name__ == '__main__':
+    from . import cli
+    sys.exit(cli.main(['serve', *sys.argv[1:]]))
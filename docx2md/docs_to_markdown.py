@@ -0,0 +1,285 @@
+import re
+import sys
+
+from .docx_container import open_python_docx
+from .docx_stream import P, W_NS, build_grid
+from .instrumentation import NULL_STATS
+from .markdown_writer import MarkdownWriter
+from .text_cleanup import Cleaner, replace, strip, sub
+
+# python-docx is imported by the functions that open documents
+
+def format_table(rows):
+    if not rows:
+        return ""
+    
+    # Remove empty rows and clean whitespace
+    rows = [[cell.strip() for cell in row] for row in rows if any(cell.strip() for cell in row)]
+    if not rows:
+        return ""
+
+    # Get max width for each column
+    col_widths = []
+    for col in range(len(rows[0])):
+        width = max(len(str(row[col])) for row in rows if col < len(row))
+        col_widths.append(width)
+
+    # Format the table
+    table_lines = []
+    for i, row in enumerate(rows):
+        # Format cells with proper padding
+        cells = []
+        for j, cell in enumerate(row):
+            if j < len(col_widths):
+                cells.append(str(cell).ljust(col_widths[j]))
+        
+        # Add the row
+        table_lines.append(f"| {' | '.join(cells)} |")
+        
+        # Add separator after header (first row)
+        if i == 0:
+            separators = ['-' * width for width in col_widths]
+            table_lines.append(f"| {' | '.join(separators)} |")
+
+    return '\n'.join(table_lines)
+
+CLEANER = Cleaner(
+    # Fix URLs by removing spaces
+    sub(r'(https?:\s*/\s*/[^\s]+)\s*', lambda m: m.group(1).replace(' ', ''), requires='http'),
+    
+    # Italicize French text
+    sub(r'["\'](appels à manifestation d\'intérêt)["\']', r'*\1*',
+        requires="appels à manifestation d'intérêt"),
+    
+    # Remove tab characters
+    replace('\t', ''),
+    
+    # Remove multiple consecutive newlines
+    sub(r'\n{3,}', '\n\n', requires='\n\n\n'),
+    
+    strip(),
+)
+
+def clean_text(text):
+    return CLEANER(text)
+
+def table_grid(table):
+    """The logical grid of a python-docx table, reading the text of every cell once
+
+    python-docx builds the cells of a row again on every ``row.cells`` and
+    resolves each vertically merged cell by walking the rows above it.
+    """
+    from docx.text.paragraph import Paragraph
+
+    def read_cell(tc):
+        # The text of python-docx _Cell: its own paragraphs, not those of nested tables
+        return '\n'.join(Paragraph(p, table).text for p in tc.findall(P)), None
+
+    return build_grid(table._tbl, read_cell)
+
+def process_table(table):
+    grid = table_grid(table)
+    return table_markdown([cell.text for cell in grid.positions(index)] for index in range(len(grid.rows)))
+
+def table_markdown(rows):
+    """Markdown of a table given as rows of cell texts, one per grid position"""
+    cleaned_rows = []
+    for row in rows:
+        cells = [clean_text(text) for text in row if text.strip()]
+        if cells:  # Only add non-empty rows
+            cleaned_rows.append(cells)
+    rows = cleaned_rows
+    
+    if not rows:
+        return ""
+    
+    # Create table header
+    md = []
+    header = rows[0]
+    md.append('| ' + ' | '.join(header) + ' |')
+    md.append('|' + '|'.join(['---' for _ in header]) + '|')
+    
+    # Add remaining rows
+    for row in rows[1:]:
+        # Ensure row has same number of columns as header
+        while len(row) < len(header):
+            row.append('')
+        md.append('| ' + ' | '.join(row) + ' |')
+    
+    return '\n'.join(md) + '\n\n'
+
+# Words naming heading styles in localized versions of Word; they are matched
+# as whole words, unlike 'heading' and 'title'
+LOCALIZED_HEADING_WORDS = {
+    'заголовок', 'название', 'überschrift', 'titel', 'titre', 'título', 'titolo',
+    'kop', 'nagłówek', 'rubrik', 'overskrift', 'otsikko', 'nadpis', 'címsor',
+    'başlık', '标题', '標題', '見出し', '제목',
+}
+WORD_RE = re.compile(r'\w+')
+
+# Outline level 9 is body text; levels 0-8 are headings 1-9, capped at 6
+BODY_TEXT_OUTLINE_LEVEL = 9
+MAX_HEADING_LEVEL = 6
+
+def _w(tag):
+    return '{%s}%s' % (W_NS, tag)
+
+def heading_level(style_name):
+    """Heading level (1-6) for a paragraph style name, or 0 for body text"""
+    if not style_name:
+        return 0
+    style = style_name.lower()
+    if ('heading' in style or 'title' in style
+            or any(word in LOCALIZED_HEADING_WORDS for word in WORD_RE.findall(style))):
+        return next((i for i in range(1, 7) if str(i) in style), 1)
+    return 0
+
+def _outline_level(style, styles_by_id):
+    """Outline level set by a style or the styles it is based on, or None"""
+    seen = set()
+    while style is not None and id(style) not in seen:
+        seen.add(id(style))
+        ppr = style.find(_w('pPr'))
+        outline = ppr.find(_w('outlineLvl')) if ppr is not None else None
+        if outline is not None:
+            try:
+                return int(outline.get(_w('val')))
+            except (TypeError, ValueError):
+                return None
+        based_on = style.find(_w('basedOn'))
+        style = styles_by_id.get(based_on.get(_w('val'))) if based_on is not None else None
+    return None
+
+def style_heading_levels(styles):
+    """Map the id of every paragraph style of styles.xml to its heading level
+
+    styles is the parsed <w:styles> element (ElementTree or lxml). A style is
+    a heading when its name says so, in English or in a localized version of
+    Word, or when it has an outline level, directly or through the style it
+    is based on. The None key holds the level of the default paragraph style,
+    which is what paragraphs without a style or with an unknown one get.
+    """
+    styles_by_id = {}
+    default = None
+    for style in styles.findall(_w('style')):
+        if style.get(_w('type'), 'paragraph') != 'paragraph':
+            continue
+        styles_by_id[style.get(_w('styleId'))] = style
+        if style.get(_w('default')) in ('1', 'true', 'on'):
+            default = style
+
+    levels = {}
+    for style_id, style in styles_by_id.items():
+        name = style.find(_w('name'))
+        level = heading_level(name.get(_w('val')) if name is not None else None)
+        if not level:
+            outline = _outline_level(style, styles_by_id)
+            if outline is not None and 0 <= outline < BODY_TEXT_OUTLINE_LEVEL:
+                level = min(outline + 1, MAX_HEADING_LEVEL)
+        levels[style_id] = level
+    levels[None] = levels[default.get(_w('styleId'))] if default is not None else 0
+    return levels
+
+def paragraph_heading_level(paragraph, levels=None):
+    """Heading level of a python-docx paragraph
+
+    levels is the table of style_heading_levels(); without it the table is
+    built from the paragraph's styles part on every call.
+    """
+    if levels is None:
+        levels = style_heading_levels(paragraph.part.styles.element)
+    level = levels.get(paragraph._p.style)
+    return level if level is not None else levels[None]
+
+def process_paragraph(paragraph, levels=None):
+    text = clean_text(paragraph.text)
+    if not text:
+        return ""
+        
+    # Check if it's a heading by style
+    return format_paragraph(text, paragraph_heading_level(paragraph, levels))
+
+def format_paragraph(text, level):
+    """Markdown of cleaned paragraph text, as a heading of the given level (0 for body text)"""
+    if level:
+        return '#' * level + ' ' + text + '\n\n'
+    
+    return text + '\n\n'
+
+def table_to_markdown(table):
+    if not table.rows:
+        return ''
+    
+    # For single-cell tables, convert to a header
+    if len(table.rows) == 1 and len(table.rows[0]) == 1:
+        return f"\n### {table.rows[0][0].strip()}\n"
+    
+    # Regular table processing
+    markdown_rows = []
+    for i, row in enumerate(table.rows):
+        cells = [cell.strip() for cell in row]
+        row_text = f"| {' | '.join(cells)} |"
+        markdown_rows.append(row_text)
+        
+        # Add separator after header
+        if i == 0:
+            separator = '|' + '|'.join('-' * len(cell) for cell in cells) + '|'
+            markdown_rows.append(separator)
+    
+    return '\n'.join(markdown_rows) + '\n'
+
+def iter_markdown_blocks(blocks, levels):
+    """Yield the Markdown of python-docx paragraphs and tables, in the order given
+
+    levels is the table of style_heading_levels() for the document.
+    """
+    from docx.table import Table
+
+    for block in blocks:
+        if isinstance(block, Table):
+            yield process_table(block)
+        else:
+            yield process_paragraph(block, levels)
+
+def open_document(source):
+    """Open a DOCX path, bytes or binary file object with python-docx, leaving out its media"""
+    return open_python_docx(source)
+
+def iter_markdown_pieces(source, stats=NULL_STATS):
+    """Convert a DOCX document, yielding the Markdown of its body in document order
+
+    The children of the body are visited in one pass, so paragraphs and
+    tables keep their interleaving.
+    """
+    with stats.stage('open'):
+        document = open_document(source)
+    with stats.stage('styles') as stage:
+        levels = style_heading_levels(document.styles.element)
+        stage.add(elements=len(levels) - 1)
+    yield from stats.iterate('markdown', iter_markdown_blocks(document.iter_inner_content(), levels))
+
+def convert_docx_to_markdown(source):
+    """Convert a DOCX path, bytes or binary file object to a Markdown string"""
+    return ''.join(iter_markdown_pieces(source))
+
+def convert(input_path, output_path, stats=NULL_STATS):
+    """Convert a DOCX file to Markdown, writing it to output_path; returns a preview"""
+    with stats.stage('write') as stage, MarkdownWriter(output_path) as writer:
+        writer.write_all(iter_markdown_pieces(input_path, stats))
+        stage.add(chars_out=writer.chars_written)
+    stats.finish()
+    return writer.preview
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python -m docx2md.docs_to_markdown <input_file> [output_file]")
+        sys.exit(1)
+
+    input_file = sys.argv[1]
+    output_file = sys.argv[2] if len(sys.argv) > 2 else 'output.md'
+    preview = convert(input_file, output_file)
+    print(f"Markdown has been saved to {output_file}")
+    print("\nPreview of the first few lines:")
+    print("-" * 80)
+    print(preview)
+    print("-" * 80)
@@ -0,0 +1,327 @@
+import marshal
+import os
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+from . import docs_to_markdown
+from . import docx_stream
+from . import extract_text_docx2python
+from .conversion_cache import converter_version
+from .docx_stream import (HYPERLINK, ILVL, NUM_ID, NUM_PR, NUMBERING_PART, NUMBERING_TYPE, P, PPR, SDT,
+                          SDT_CONTENT, TBL, W_NS, W_VAL, Cell, Run, Table, build_grid, build_paragraph,
+                          iter_body_elements, open_docx, read_hyperlink_targets, read_related_part, _run_text)
+from .extract_text_docx2python import ListLabels
+from .incremental_convert import read_styles_part
+from .instrumentation import NULL_STATS
+
+# python-docx is only imported for documents without a styles part, to get
+# the default styles it would use for them
+
+
+def _w(tag):
+    return '{%s}%s' % (W_NS, tag)
+
+
+R = _w('r')
+NUM = _w('num')
+ABSTRACT_NUM = _w('abstractNum')
+ABSTRACT_NUM_ID = _w('abstractNumId')
+LVL = _w('lvl')
+NUM_FMT = _w('numFmt')
+STYLE = _w('style')
+STYLE_ID = _w('styleId')
+BASED_ON = _w('basedOn')
+
+# Number formats of list levels that are not numbered
+UNORDERED_FORMATS = {'bullet', 'none'}
+
+# Saved models start with MODEL_MAGIC, followed by the marshalled
+# (MODEL_FORMAT, model_version(), encoded blocks)
+MODEL_MAGIC = b'DOCXMODEL\n'
+MODEL_FORMAT = 2
+_PARAGRAPH, _TABLE, _CONTROL = range(3)
+
+
+# A paragraph of the document model. text, style and runs are read as
+# docx_stream reads them: text boxes, content controls, fields and tracked
+# insertions inside the paragraph are included. heading is the heading level
+# of its style (0 for body text), list_item a ListItem or None, docx_text
+# the text python-docx gives for the paragraph when it differs from text
+# (only runs and hyperlinks directly in the paragraph), otherwise None, and
+# list_label the label docx2python puts in front of it ('' for none).
+Paragraph = namedtuple('Paragraph', ['text', 'style', 'runs', 'heading', 'list_item', 'docx_text',
+                                     'list_label'])
+
+# A numbered or bulleted paragraph: the numbering instance it belongs to, its
+# level in the list (0 for the outermost one) and whether that level is numbered
+ListItem = namedtuple('ListItem', ['num_id', 'level', 'ordered'])
+
+# A block-level content control and the paragraphs, tables and content
+# controls inside it. python-docx does not look into them; docx_stream does.
+ContentControl = namedtuple('ContentControl', ['blocks'])
+
+# A parsed document: the blocks of its body in document order. Tables are
+# docx_stream.Table grids whose cells hold the blocks of the model.
+Document = namedtuple('Document', ['blocks'])
+
+
+def iter_flat(blocks):
+    """Yield paragraphs and tables, with the blocks of content controls in their place"""
+    for block in blocks:
+        if isinstance(block, ContentControl):
+            yield from iter_flat(block.blocks)
+        else:
+            yield block
+
+
+def paragraph_docx_text(paragraph):
+    """The text python-docx gives for a paragraph of the model"""
+    return paragraph.text if paragraph.docx_text is None else paragraph.docx_text
+
+
+def cell_docx_text(cell):
+    """The text python-docx gives for a table cell: its own paragraphs, not those of content controls"""
+    return '\n'.join(paragraph_docx_text(block) for block in cell.blocks if isinstance(block, Paragraph))
+
+
+def _docx_text(p):
+    """Text of the runs directly in a <w:p> element or in its hyperlinks, as python-docx reads it"""
+    pieces = []
+    for child in p:
+        if child.tag == R:
+            runs = (child,)
+        elif child.tag == HYPERLINK:
+            runs = child.findall(R)
+        else:
+            continue
+        for run in runs:
+            for element in run:
+                _run_text(element, pieces)
+    return ''.join(pieces)
+
+
+def _numbering(ppr):
+    """(numId, ilvl) of the w:numPr of a paragraph or style, or None"""
+    num_pr = ppr.find(NUM_PR) if ppr is not None else None
+    if num_pr is None:
+        return None
+    num_id = num_pr.find(NUM_ID)
+    ilvl = num_pr.find(ILVL)
+    return (num_id.get(W_VAL) if num_id is not None else None,
+            int(ilvl.get(W_VAL, 0)) if ilvl is not None else 0)
+
+
+def style_numbering(styles):
+    """Map paragraph style ids to the (numId, ilvl) they set, directly or through their base styles"""
+    styles_by_id = {style.get(STYLE_ID): style for style in styles.findall(STYLE)}
+    numbering = {}
+    for style_id, style in styles_by_id.items():
+        seen = set()
+        while style is not None and id(style) not in seen:
+            seen.add(id(style))
+            found = _numbering(style.find(PPR))
+            if found is not None:
+                if found[0] is not None:
+                    numbering[style_id] = found
+                break
+            based_on = style.find(BASED_ON)
+            style = styles_by_id.get(based_on.get(W_VAL)) if based_on is not None else None
+    return numbering
+
+
+def list_formats(numbering):
+    """Map the numId of every list in numbering.xml to {ilvl: whether the level is numbered}"""
+    abstract = {}
+    for abstract_num in numbering.findall(ABSTRACT_NUM):
+        levels = {}
+        for lvl in abstract_num.findall(LVL):
+            num_fmt = lvl.find(NUM_FMT)
+            # decimal is the default number format
+            levels[int(lvl.get(ILVL, 0))] = num_fmt is None or num_fmt.get(W_VAL) not in UNORDERED_FORMATS
+        abstract[abstract_num.get(ABSTRACT_NUM_ID)] = levels
+
+    formats = {}
+    for num in numbering.findall(NUM):
+        abstract_id = num.find(ABSTRACT_NUM_ID)
+        formats[num.get(NUM_ID)] = abstract.get(abstract_id.get(W_VAL)) if abstract_id is not None else None
+    return formats
+
+
+class _Builder:
+    """Builds the blocks of the model from complete elements of the main document part"""
+
+    def __init__(self, links, levels, styles_numbering, formats, labels):
+        self.links = links
+        self.levels = levels
+        self.styles_numbering = styles_numbering
+        self.formats = formats
+        self.labels = labels
+
+    def blocks(self, container):
+        """The model blocks of the paragraphs, tables and content controls directly in container"""
+        blocks = []
+        for child in container:
+            tag = child.tag
+            if tag == P:
+                blocks.append(self.paragraph(child))
+            elif tag == TBL:
+                blocks.append(self.table(child))
+            elif tag == SDT:
+                content = child.find(SDT_CONTENT)
+                if content is not None:
+                    blocks.append(ContentControl(self.blocks(content)))
+        return blocks
+
+    def paragraph(self, p):
+        paragraph = build_paragraph(p, self.links)
+        heading = self.levels.get(paragraph.style)
+        if heading is None:
+            heading = self.levels[None]
+        docx_text = _docx_text(p)
+        return Paragraph(paragraph.text, paragraph.style, paragraph.runs, heading,
+                         self.list_item(p.find(PPR), paragraph.style),
+                         None if docx_text == paragraph.text else docx_text, self.labels(paragraph))
+
+    def list_item(self, ppr, style):
+        numbering = _numbering(ppr)
+        inherited = self.styles_numbering.get(style)
+        if numbering is None:
+            numbering = inherited
+        elif numbering[0] is None and inherited is not None:
+            numbering = (inherited[0], numbering[1])  # a level within the list of the style
+        if numbering is None or numbering[0] in (None, '0'):
+            return None  # numId 0 removes the numbering of the style
+        num_id, level = numbering
+        levels = self.formats.get(num_id)
+        return ListItem(num_id, level, bool(levels and levels.get(level, False)))
+
+    def table(self, tbl):
+        def read_cell(tc):
+            blocks = self.blocks(tc)
+            return '\n'.join(b.text for b in iter_flat(blocks) if isinstance(b, Paragraph)), blocks
+
+        return build_grid(tbl, read_cell)
+
+
+def _default_styles():
+    """The styles python-docx uses for a document without a styles part"""
+    from docx.parts.styles import StylesPart
+
+    return StylesPart.default(None).styles.element
+
+
+def build_document(source, stats=NULL_STATS):
+    """Parse a DOCX path, bytes or binary file object into a Document
+
+    The main document part is parsed once, incrementally, and each
+    top-level element is dropped once its blocks are built.
+    """
+    docx = open_docx(source)
+    try:
+        with stats.stage('styles') as stage:
+            links = read_hyperlink_targets(docx)
+            styles_xml = read_styles_part(docx)
+            styles = ET.fromstring(styles_xml) if styles_xml is not None else _default_styles()
+            numbering_xml = read_related_part(docx, NUMBERING_TYPE, NUMBERING_PART)
+            formats = list_formats(ET.fromstring(numbering_xml)) if numbering_xml is not None else {}
+            levels = docs_to_markdown.style_heading_levels(styles)
+            builder = _Builder(links, levels, style_numbering(styles), formats, ListLabels(numbering_xml))
+            stage.add(elements=len(levels) - 1)
+
+        with stats.stage('parse') as stage:
+            blocks = []
+            for element in iter_body_elements(docx):
+                blocks.extend(builder.blocks((element,)))
+            stage.add(blocks=len(blocks))
+    finally:
+        if docx is not source:
+            docx.close()
+    return Document(blocks)
+
+
+def model_version():
+    """Version of the code that builds models; saved models of another version are not loaded"""
+    return converter_version((__file__, docx_stream.__file__, docs_to_markdown.__file__,
+                              extract_text_docx2python.__file__), ())
+
+
+def _encode(blocks):
+    encoded = []
+    for block in blocks:
+        if isinstance(block, Paragraph):
+            encoded.append((_PARAGRAPH, block.text, block.style, tuple(tuple(run) for run in block.runs),
+                            block.heading, tuple(block.list_item) if block.list_item else None,
+                            block.docx_text, block.list_label))
+        elif isinstance(block, Table):
+            index = {id(cell): i for i, cell in enumerate(block.cells)}
+            cells = tuple((cell.text, _encode(cell.blocks), cell.row, cell.col, cell.row_span, cell.col_span)
+                          for cell in block.cells)
+            rows = tuple(tuple(index[id(cell)] for cell in row) for row in block.rows)
+            encoded.append((_TABLE, cells, rows))
+        else:
+            encoded.append((_CONTROL, _encode(block.blocks)))
+    return tuple(encoded)
+
+
+def _decode(encoded):
+    blocks = []
+    for item in encoded:
+        kind = item[0]
+        if kind == _PARAGRAPH:
+            _, text, style, runs, heading, list_item, docx_text, list_label = item
+            blocks.append(Paragraph(text, style, [Run(*run) for run in runs], heading,
+                                    ListItem(*list_item) if list_item else None, docx_text, list_label))
+        elif kind == _TABLE:
+            table = Table()
+            table.cells = [Cell(text, _decode(cell_blocks), row, col, row_span, col_span)
+                           for text, cell_blocks, row, col, row_span, col_span in item[1]]
+            table.rows = [[table.cells[i] for i in row] for row in item[2]]
+            blocks.append(table)
+        else:
+            blocks.append(ContentControl(_decode(item[1])))
+    return blocks
+
+
+def save_document(document, path):
+    """Save a Document to path in a compact binary form, for caching
+
+    The data is marshalled, so it is only meant to be read back by the same
+    Python version and the same version of the model code.
+    """
+    data = marshal.dumps((MODEL_FORMAT, model_version(), _encode(document.blocks)))
+    with open(path, 'wb') as f:
+        f.write(MODEL_MAGIC)
+        f.write(data)
+
+
+def is_saved_document(path):
+    """Whether path holds a Document saved by save_document"""
+    if not isinstance(path, (str, os.PathLike)):
+        return False
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MODEL_MAGIC)) == MODEL_MAGIC
+    except OSError:
+        return False
+
+
+def load_document(path):
+    """Load a Document saved by save_document; raises ValueError if it is stale or not a model"""
+    with open(path, 'rb') as f:
+        if f.read(len(MODEL_MAGIC)) != MODEL_MAGIC:
+            raise ValueError(f"{path} is not a saved document model")
+        try:
+            model_format, version, encoded = marshal.loads(f.read())
+        except (EOFError, TypeError, ValueError) as e:
+            raise ValueError(f"{path} is not a readable document model: {e}") from e
+    if model_format != MODEL_FORMAT or version != model_version():
+        raise ValueError(f"{path} was saved by another version of the document model")
+    return Document(_decode(encoded))
+
+
+def read_document(source, stats=NULL_STATS):
+    """Return the Document of a DOCX path, bytes or file object, or of a model saved by save_document"""
+    if is_saved_document(source):
+        with stats.stage('load'):
+            return load_document(source)
+    return build_document(source, stats)
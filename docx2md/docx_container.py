@@ -0,0 +1,121 @@
+import io
+import mmap
+import os
+import zipfile
+
+# Parts with these suffixes hold the markup of a package; everything else
+# (images, embedded objects, fonts, VBA projects, thumbnails) is payload
+MARKUP_SUFFIXES = ('.xml', '.rels')
+
+
+def is_markup_part(name):
+    """Whether a part of the package holds XML rather than media or other payload"""
+    return name.lower().endswith(MARKUP_SUFFIXES)
+
+
+def open_python_docx(source):
+    """Open a DOCX path, bytes, binary file object or DocxContainer with python-docx
+
+    python-docx loads every part of a package when it opens it, so it is
+    given the markup_package() of the document, without media.
+    """
+    from docx import Document
+
+    container = source if isinstance(source, DocxContainer) else DocxContainer(source)
+    try:
+        return Document(container.markup_package())
+    finally:
+        if container is not source:
+            container.close()
+
+
+class _MappedFile:
+    """Binary file interface over an mmap, with the seekable() that zipfile needs"""
+
+    def __init__(self, mapped):
+        self.read = mapped.read
+        self.seek = mapped.seek
+        self.tell = mapped.tell
+
+    def seekable(self):
+        return True
+
+
+class DocxContainer:
+    """A DOCX package read through a memory map
+
+    The central directory is read once, when the container is opened, and a
+    part is only decompressed when it is read; media are never touched
+    unless asked for. Paths and real files are memory-mapped, other binary
+    file objects and bytes are read in place. The container offers the read
+    side of zipfile.ZipFile (read, open, namelist, infolist, close), so it
+    can be used wherever docx_stream takes a ZipFile.
+    """
+
+    def __init__(self, source):
+        self._file = None
+        self._map = None
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            fileobj = io.BytesIO(source)
+        elif hasattr(source, 'read'):
+            fileobj = self._map_file(source) or source
+        else:
+            self._file = open(source, 'rb')
+            fileobj = self._map_file(self._file) or self._file
+        try:
+            self.zip = zipfile.ZipFile(fileobj)
+        except Exception:
+            self.close()
+            raise
+
+    def _map_file(self, f):
+        """Memory-map the file behind f, or return None when it has none"""
+        try:
+            fileno = f.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+        if os.fstat(fileno).st_size == 0:
+            return None  # empty files cannot be mapped; zipfile reports them
+        self._map = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        return _MappedFile(self._map)
+
+    def read(self, name):
+        return self.zip.read(name)
+
+    def open(self, name):
+        return self.zip.open(name)
+
+    def namelist(self):
+        return self.zip.namelist()
+
+    def infolist(self):
+        return self.zip.infolist()
+
+    def markup_package(self):
+        """A copy of the package with every payload part left empty, as a BytesIO
+
+        For libraries that load every part of a package, such as python-docx:
+        they get the XML and relationships they need, while images and
+        embedded objects are neither decompressed nor copied. Parts are
+        stored uncompressed, so nothing is compressed again.
+        """
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as package:
+            for info in self.zip.infolist():
+                package.writestr(info.filename, self.zip.read(info) if is_markup_part(info.filename) else b'')
+        buffer.seek(0)
+        return buffer
+
+    def close(self):
+        if getattr(self, 'zip', None) is not None:
+            self.zip.close()
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,351 @@
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+from .docx_container import DocxContainer
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+MC_NS = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+HYPERLINK_TYPE = R_NS + '/hyperlink'
+NUMBERING_TYPE = R_NS + '/numbering'
+
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS_PART = 'word/_rels/document.xml.rels'
+NUMBERING_PART = 'word/numbering.xml'
+
+
+def _w(tag):
+    return '{%s}%s' % (W_NS, tag)
+
+
+P = _w('p')
+TBL = _w('tbl')
+TR = _w('tr')
+TC = _w('tc')
+BODY = _w('body')
+T = _w('t')
+TAB = _w('tab')
+PTAB = _w('ptab')
+BR = _w('br')
+CR = _w('cr')
+NO_BREAK_HYPHEN = _w('noBreakHyphen')
+HYPERLINK = _w('hyperlink')
+SDT = _w('sdt')
+SDT_CONTENT = _w('sdtContent')
+PPR = _w('pPr')
+PSTYLE = _w('pStyle')
+NUM_PR = _w('numPr')
+NUM_ID = _w('numId')
+ILVL = _w('ilvl')
+TRPR = _w('trPr')
+TCPR = _w('tcPr')
+GRID_BEFORE = _w('gridBefore')
+GRID_SPAN = _w('gridSpan')
+VMERGE = _w('vMerge')
+W_VAL = _w('val')
+W_TYPE = _w('type')
+R_ID = '{%s}id' % R_NS
+MC_FALLBACK = '{%s}Fallback' % MC_NS
+
+# Elements whose subtree never contributes text (alternate renderings, cell/row
+# properties and the like)
+_SKIPPED = {MC_FALLBACK, PPR, TRPR, TCPR, _w('rPr'), _w('sectPr')}
+
+
+# A stretch of paragraph text, with the target URL when it belongs to a hyperlink
+Run = namedtuple('Run', ['text', 'href'])
+
+# A paragraph: its plain text, style id (or None), the runs it is made of and
+# the (numId, ilvl) of the w:numPr set on the paragraph itself, either of them
+# None when missing, or None without one
+Paragraph = namedtuple('Paragraph', ['text', 'style', 'runs', 'numbering'])
+
+
+class Cell:
+    """A cell of the logical grid of a table
+
+    text holds the paragraphs of the cell joined by newlines, like python-docx,
+    and blocks the paragraphs and nested tables it contains, in document order
+    (None when the reader of the table does not collect them). row and col
+    are the grid position of its top-left corner, row_span and col_span the
+    number of rows and grid columns it covers.
+    """
+
+    __slots__ = ('text', 'blocks', 'row', 'col', 'row_span', 'col_span')
+
+    def __init__(self, text, blocks, row, col, row_span=1, col_span=1):
+        self.text = text
+        self.blocks = blocks
+        self.row = row
+        self.col = col
+        self.row_span = row_span
+        self.col_span = col_span
+
+    def __repr__(self):
+        return (f'Cell({self.text!r}, row={self.row}, col={self.col}, '
+                f'row_span={self.row_span}, col_span={self.col_span})')
+
+
+class Table:
+    """The logical grid of a table, built by build_grid
+
+    cells holds every cell once, in document order. rows[i] holds the cells
+    covering row i, left to right, each once: a cell merged over several
+    columns appears once in the row, a cell merged over several rows appears
+    in each of them.
+    """
+
+    __slots__ = ('cells', 'rows')
+
+    def __init__(self):
+        self.cells = []
+        self.rows = []
+
+    def positions(self, index):
+        """The cells of row index, one per grid column they cover, like python-docx ``row.cells``"""
+        return [cell for cell in self.rows[index] for _ in range(cell.col_span)]
+
+
+def read_hyperlink_targets(docx):
+    """Map relationship ids of the main document part to hyperlink URLs"""
+    try:
+        data = docx.read(DOCUMENT_RELS_PART)
+    except KeyError:
+        return {}
+
+    targets = {}
+    for rel in ET.fromstring(data).iter('{%s}Relationship' % PKG_REL_NS):
+        if rel.get('Type') == HYPERLINK_TYPE:
+            targets[rel.get('Id')] = rel.get('Target')
+    return targets
+
+
+def read_related_part(docx, rel_type, default_name):
+    """Return the bytes of the part of type rel_type of the main document part, or None
+
+    The part is looked up in the relationships of the main document part,
+    falling back to default_name when they do not list one.
+    """
+    name = default_name
+    try:
+        rels = ET.fromstring(docx.read(DOCUMENT_RELS_PART))
+    except KeyError:
+        rels = None
+    if rels is not None:
+        for rel in rels.iter('{%s}Relationship' % PKG_REL_NS):
+            if rel.get('Type') == rel_type:
+                target = rel.get('Target')
+                name = target.lstrip('/') if target.startswith('/') else 'word/' + target
+                break
+    try:
+        return docx.read(name)
+    except KeyError:
+        return None
+
+
+def _run_text(element, pieces):
+    """Append the text of a run-level element to pieces, like python-docx does"""
+    tag = element.tag
+    if tag == T:
+        pieces.append(element.text or '')
+    elif tag == TAB or tag == PTAB:
+        pieces.append('\t')
+    elif tag == CR:
+        pieces.append('\n')
+    elif tag == BR:
+        # Page and column breaks carry no text
+        if element.get(W_TYPE, 'textWrapping') == 'textWrapping':
+            pieces.append('\n')
+    elif tag == NO_BREAK_HYPHEN:
+        pieces.append('-')
+
+
+def _collect_runs(element, runs, links, href=None):
+    """Walk a paragraph subtree and collect its text runs in order"""
+    pieces = []
+    for child in element:
+        tag = child.tag
+        if tag in _SKIPPED:
+            continue
+        if tag == HYPERLINK:
+            if pieces:
+                runs.append(Run(''.join(pieces), href))
+                pieces = []
+            _collect_runs(child, runs, links, links.get(child.get(R_ID), href))
+        elif len(child):
+            if pieces:
+                runs.append(Run(''.join(pieces), href))
+                pieces = []
+            _collect_runs(child, runs, links, href)
+        else:
+            _run_text(child, pieces)
+    if pieces:
+        runs.append(Run(''.join(pieces), href))
+
+
+def build_paragraph(p, links):
+    """Build a Paragraph from a complete <w:p> element"""
+    style = None
+    numbering = None
+    ppr = p.find(PPR)
+    if ppr is not None:
+        pstyle = ppr.find(PSTYLE)
+        if pstyle is not None:
+            style = pstyle.get(W_VAL)
+        num_pr = ppr.find(NUM_PR)
+        if num_pr is not None:
+            num_id = num_pr.find(NUM_ID)
+            ilvl = num_pr.find(ILVL)
+            numbering = (num_id.get(W_VAL) if num_id is not None else None,
+                         ilvl.get(W_VAL) if ilvl is not None else None)
+
+    runs = []
+    _collect_runs(p, runs, links)
+
+    # Word splits text into many runs; merge neighbours that share a link target
+    merged = []
+    for run in runs:
+        if merged and merged[-1].href == run.href:
+            merged[-1] = Run(merged[-1].text + run.text, run.href)
+        else:
+            merged.append(run)
+    runs = merged
+    return Paragraph(''.join(run.text for run in runs), style, runs, numbering)
+
+
+def _int_val(parent, tag, default):
+    if parent is None:
+        return default
+    element = parent.find(tag)
+    if element is None:
+        return default
+    return int(element.get(W_VAL, default))
+
+
+def build_grid(tbl, read_cell):
+    """Build the logical grid of a <w:tbl> element in one pass over its cells
+
+    Spans come from w:gridSpan and w:vMerge. read_cell(tc) returns the text
+    and the blocks of a cell and is called once per cell, on the <w:tc> where
+    it starts, however many grid positions the cell covers. Works on
+    ElementTree and lxml (python-docx) elements alike.
+    """
+    table = Table()
+    above = {}  # grid column -> cell starting there in the row above, for vertical merges
+
+    for index, tr in enumerate(tbl.findall(TR)):
+        row = []
+        current = {}
+        col = _int_val(tr.find(TRPR), GRID_BEFORE, 0)
+
+        for tc in tr.findall(TC):
+            tcpr = tc.find(TCPR)
+            span = _int_val(tcpr, GRID_SPAN, 1)
+            vmerge = tcpr.find(VMERGE) if tcpr is not None else None
+
+            cell = None
+            if vmerge is not None and vmerge.get(W_VAL, 'continue') == 'continue':
+                cell = above.get(col)
+            if cell is None:
+                text, blocks = read_cell(tc)
+                cell = Cell(text, blocks, index, col, 1, span)
+                table.cells.append(cell)
+                row.append(cell)
+            elif cell.row + cell.row_span == index:
+                cell.row_span += 1
+                row.append(cell)
+            # else: a second continuation of the same cell in this row, already listed
+
+            current[col] = cell
+            col += span
+
+        above = current
+        table.rows.append(row)
+
+    return table
+
+
+def build_table(tbl, links):
+    """Build a Table from a complete <w:tbl> element"""
+    def read_cell(tc):
+        blocks = list(iter_blocks(tc, links))
+        return '\n'.join(b.text for b in blocks if isinstance(b, Paragraph)), blocks
+
+    return build_grid(tbl, read_cell)
+
+
+def iter_blocks(container, links):
+    """Yield the paragraphs and tables directly inside a body, cell or content control"""
+    for child in container:
+        if child.tag == P:
+            yield build_paragraph(child, links)
+        elif child.tag == TBL:
+            yield build_table(child, links)
+        elif child.tag == SDT:
+            content = child.find(SDT_CONTENT)
+            if content is not None:
+                yield from iter_blocks(content, links)
+
+
+def open_docx(source):
+    """Open a DOCX path, bytes or binary file object as a memory-mapped DocxContainer
+
+    A ZipFile or DocxContainer is returned as it is.
+    """
+    if isinstance(source, (zipfile.ZipFile, DocxContainer)):
+        return source
+    return DocxContainer(source)
+
+
+def iter_body_elements(docx):
+    """Yield the top-level elements of the body of an open DOCX as each one is complete
+
+    The main document part is parsed incrementally; an element is removed
+    from the tree once the caller asks for the next one.
+    """
+    with docx.open(DOCUMENT_PART) as xml_stream:
+        depth = 0
+        body = None
+        for event, element in ET.iterparse(xml_stream, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 2 and element.tag == BODY:
+                    body = element
+                continue
+
+            depth -= 1
+            if depth != 2 or body is None:
+                continue
+
+            # A top-level block of the body is complete
+            yield element
+            body.remove(element)
+
+
+def iter_body(source):
+    """Yield Paragraph and Table events of the document body in document order
+
+    The main document part is parsed incrementally, so only one top-level
+    block is held in memory at a time.
+    """
+    docx = open_docx(source)
+    try:
+        links = read_hyperlink_targets(docx)
+        for element in iter_body_elements(docx):
+            yield from iter_blocks((element,), links)
+    finally:
+        if docx is not source:
+            docx.close()
+
+
+def iter_paragraphs(block):
+    """Yield every paragraph of a block, descending into table cells"""
+    if isinstance(block, Paragraph):
+        yield block
+        return
+    for cell in block.cells:
+        for nested in cell.blocks:
+            yield from iter_paragraphs(nested)
@@ -0,0 +1,438 @@
+import io
+import os
+import sys
+from pathlib import Path
+import re
+from html.parser import HTMLParser
+
+from .conversion_cache import (CACHE_DIR_ENV, ConversionCache, cache_key,
+                               converter_version, read_source_bytes)
+from .image_policy import DEFAULT_IMAGE_POLICY, MEDIA_DIR_NAME, check_image_policy, image_converter
+from .instrumentation import NULL_STATS
+from .markdown_writer import MarkdownWriter, collapse_blank_lines, iter_file_chunks
+from . import pipe_table
+
+# mammoth and html2text are imported where they are used, so that cache hits
+# never load them. tabulate is only needed for the rare cells pipe_table
+# hands back to it.
+
+CONVERTER_NAME = 'docx_to_html_markdown'
+CONVERTER_DISTRIBUTIONS = ('mammoth', 'html2text', 'tabulate')
+
+HTML2TEXT_OPTIONS = {
+    'body_width': 0,  # Disable line wrapping
+    'protect_links': True,  # Don't convert links to references
+    'unicode_snob': True,  # Use Unicode characters
+    'single_line_break': True,  # Use single line breaks
+    'tables': False,  # Disable table formatting
+    'images_to_alt': True,  # Convert images to alt text
+}
+
+TABLE_PLACEHOLDER_RE = re.compile(r'TABLE_PLACEHOLDER_(\d+)')
+HEADER_RE = re.compile(r'(#+\s+.*)\n')
+
+# Formatting tables in worker processes only pays off for documents with
+# many of them; each worker is sent TABLE_CHUNK_SIZE tables at a time
+PARALLEL_MIN_TABLES = 64
+TABLE_CHUNK_SIZE = 16
+
+
+class ConversionError(Exception):
+    """Raised when a document cannot be converted"""
+
+
+def format_table_markdown(table_data, pad=True):
+    """Format table data as a markdown pipe table
+
+    The output is the same as tabulate's "pipe" format; without pad the
+    columns are not padded to a common width.
+    """
+    if not table_data:
+        return ""
+    
+    # Clean and prepare table data
+    cleaned_data = []
+    for row in table_data:
+        # Clean cells in the row but preserve all cells
+        cleaned_row = []
+        for cell in row:
+            # Remove newlines and extra spaces
+            cell = " ".join(cell.split())
+            cleaned_row.append(cell)
+        
+        cleaned_data.append(cleaned_row)
+    
+    if not cleaned_data:
+        return ""
+    
+    table = pipe_table.render_pipe_table(cleaned_data, pad=pad)
+    
+    # Add empty lines before and after table
+    return f"\n{table}\n"
+
+
+def format_tables(tables, pad=True, workers=None):
+    """Yield the formatted markdown of each table, in order
+
+    With workers > 1 and at least PARALLEL_MIN_TABLES tables, the tables are
+    formatted in that many worker processes.
+    """
+    if workers is None or workers <= 1 or len(tables) < PARALLEL_MIN_TABLES:
+        for table_data in tables:
+            yield format_table_markdown(table_data, pad)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(partial(format_table_markdown, pad=pad), tables,
+                                chunksize=TABLE_CHUNK_SIZE)
+
+
+class TableCollector:
+    """Collects the rows of every table from start tag, end tag and text events
+
+    Nested tables are collected too, in document order, and a row belongs to
+    every table it is nested in. Cell texts are the stripped text between
+    tags, joined, like BeautifulSoup's get_text(strip=True). The handlers
+    have HTMLParser's names, so TableSplitter gets them from here.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tables = []  # list of rows per table
+        self._open_tables = []
+        self._open_rows = []
+        self._open_cells = []
+
+    @property
+    def in_table(self):
+        return bool(self._open_tables)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            rows = []
+            self.tables.append(rows)
+            self._open_tables.append(rows)
+        elif tag == 'tr' and self._open_tables:
+            # A row belongs to every table it is nested in
+            row = []
+            for rows in self._open_tables:
+                rows.append(row)
+            self._open_rows.append(row)
+        elif tag in ('td', 'th') and self._open_rows:
+            cell = []
+            for row in self._open_rows:
+                row.append(cell)
+            self._open_cells.append(cell)
+
+    def handle_endtag(self, tag):
+        if tag == 'table' and self._open_tables:
+            self._open_tables.pop()
+        elif tag == 'tr' and self._open_rows:
+            self._open_rows.pop()
+        elif tag in ('td', 'th') and self._open_cells:
+            self._open_cells.pop()
+
+    def handle_data(self, data):
+        data = data.strip()
+        if data:
+            for cell in self._open_cells:
+                cell.append(data)
+
+
+class TableSplitter(TableCollector, HTMLParser):
+    """Single pass over HTML that separates tables from the surrounding prose
+
+    Collects the rows of every table like TableCollector, and records where
+    each top-level table starts and ends in the source so the prose can be
+    sliced out without re-serializing a tree.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.spans = []  # (start, end, first table index) of top-level tables
+        self._line_offsets = [0]
+        self._html = ''
+        self._start = None
+
+    def _offset(self):
+        line, column = self.getpos()
+        return self._line_offsets[line - 1] + column
+
+    def split(self, html_content):
+        # HTMLParser.getpos() counts lines by '\n' only, unlike str.splitlines()
+        find = html_content.find
+        newline = find('\n')
+        while newline >= 0:
+            self._line_offsets.append(newline + 1)
+            newline = find('\n', newline + 1)
+        self._html = html_content
+        self.feed(html_content)
+        self.close()
+        return self.tables, self.spans
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table' and not self.in_table:
+            self._start = (self._offset(), len(self.tables))
+        super().handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        super().handle_endtag(tag)
+        if tag == 'table' and self._start is not None and not self.in_table:
+            end = self._html.index('>', self._offset()) + 1
+            start, index = self._start
+            self.spans.append((start, end, index))
+            self._start = None
+
+
+def _cell_texts(tables):
+    """Turn the collected text fragments of each cell into cell strings"""
+    return [[[''.join(cell) for cell in row] for row in rows] for rows in tables]
+
+
+def extract_tables_from_html(html_content):
+    """Extract tables from HTML content"""
+    tables, _ = TableSplitter().split(html_content)
+    # Only return non-empty tables
+    return [table for table in _cell_texts(tables) if table]
+
+
+def split_tables_from_html(html_content):
+    """Replace top-level tables with placeholders in a single pass
+
+    Returns the prose HTML and the data of every table; placeholder N refers
+    to the N-th table of the document.
+    """
+    tables, spans = TableSplitter().split(html_content)
+    parts = []
+    last_end = 0
+    for start, end, index in spans:
+        parts.append(html_content[last_end:start])
+        parts.append(f'TABLE_PLACEHOLDER_{index}')
+        last_end = end
+    parts.append(html_content[last_end:])
+    return ''.join(parts), _cell_texts(tables)
+
+
+def convert_docx_to_html(docx_path, stats=NULL_STATS, convert_image=None):
+    """Convert DOCX file (path or binary file object) to HTML string
+
+    convert_image is passed to mammoth (see image_policy.image_converter);
+    by default images are inlined as data: URIs.
+    """
+    import mammoth
+
+    options = {} if convert_image is None else {'convert_image': convert_image}
+    try:
+        with stats.stage('docx_to_html') as stage:
+            if hasattr(docx_path, 'read'):
+                html_content = mammoth.convert_to_html(docx_path, **options).value
+            else:
+                stage.add(bytes_in=os.path.getsize(docx_path))
+                with open(docx_path, 'rb') as docx_file:
+                    result = mammoth.convert_to_html(docx_file, **options)
+                    html_content = result.value
+            stage.add(bytes_out=len(html_content))
+        return html_content
+    except Exception as e:
+        raise ConversionError(f"Error converting DOCX to HTML: {str(e)}") from e
+
+
+def iter_markdown_pieces(html_content, stats=NULL_STATS, pad_tables=True, table_workers=None,
+                         image_policy=DEFAULT_IMAGE_POLICY):
+    """Convert HTML string to Markdown, yielding prose and tables in document order
+
+    pad_tables and table_workers are passed to format_tables(). Images are
+    written as links unless image_policy is 'drop', which keeps their alt
+    text only.
+    """
+    try:
+        # Separate tables from the prose in one pass over the HTML
+        with stats.stage('split_tables') as stage:
+            prose_html, tables = split_tables_from_html(html_content)
+            stage.add(bytes_in=len(html_content), bytes_out=len(prose_html), elements=len(tables))
+        
+        # Convert to Markdown
+        with stats.stage('html2text') as stage:
+            markdown = make_html2text(image_policy).handle(prose_html)
+            stage.add(bytes_in=len(prose_html), bytes_out=len(markdown))
+        del prose_html
+        
+        yield from iter_finished_markdown(markdown, tables, stats, pad_tables, table_workers)
+    except Exception as e:
+        raise ConversionError(f"Error converting HTML to Markdown: {str(e)}") from e
+
+
+def make_html2text(image_policy=DEFAULT_IMAGE_POLICY):
+    """An html2text converter configured with HTML2TEXT_OPTIONS
+
+    Unless image_policy is 'drop', images are written as Markdown images
+    instead of their alt text.
+    """
+    import html2text
+
+    converter = html2text.HTML2Text()
+    for option, value in HTML2TEXT_OPTIONS.items():
+        setattr(converter, option, value)
+    converter.images_to_alt = image_policy == 'drop'
+    return converter
+
+
+def iter_finished_markdown(markdown, tables, stats=NULL_STATS, pad_tables=True, table_workers=None):
+    """Finish html2text output whose top-level tables are placeholders, yielding it in pieces
+
+    Headers get a blank line after them, placeholders are replaced by the
+    formatted tables and runs of blank lines are collapsed.
+    """
+    # Add extra newlines after headers (tables never hold headers)
+    with stats.stage('headers') as stage:
+        markdown = HEADER_RE.sub(r'\1\n\n', markdown)
+        stage.add(bytes_out=len(markdown))
+    
+    # Clean up multiple newlines while replacing placeholders with tables
+    pieces = stats.iterate('tables', _expand_placeholders(markdown, tables, pad_tables, table_workers))
+    yield from stats.iterate('blank_lines', collapse_blank_lines(pieces))
+
+
+def _expand_placeholders(markdown, tables, pad=True, workers=None):
+    """Yield slices of markdown with table placeholders replaced by formatted tables"""
+    matches = [match for match in TABLE_PLACEHOLDER_RE.finditer(markdown)
+               if int(match.group(1)) < len(tables)]
+    formatted = format_tables([tables[int(match.group(1))] for match in matches], pad, workers)
+    last_end = 0
+    for match, table in zip(matches, formatted):
+        yield markdown[last_end:match.start()]
+        yield table
+        last_end = match.end()
+    yield markdown[last_end:]
+
+
+def convert_html_to_markdown(html_content, pad_tables=True, table_workers=None,
+                             image_policy=DEFAULT_IMAGE_POLICY):
+    """Convert HTML string to Markdown"""
+    return ''.join(iter_markdown_pieces(html_content, pad_tables=pad_tables, table_workers=table_workers,
+                                        image_policy=image_policy))
+
+
+def convert_docx_to_markdown(source, pad_tables=True, table_workers=None,
+                             image_policy=DEFAULT_IMAGE_POLICY, media_dir=MEDIA_DIR_NAME):
+    """Convert a DOCX path, bytes or binary file object to a Markdown string
+
+    With image_policy 'extract', images are stored in media_dir and linked
+    relative to the current directory.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    html_content = convert_docx_to_html(source, convert_image=image_converter(image_policy, media_dir))
+    return convert_html_to_markdown(html_content, pad_tables, table_workers, image_policy)
+
+
+def conversion_cache_key(docx_bytes, pad_tables=True, image_policy=DEFAULT_IMAGE_POLICY):
+    """Cache key for converting docx_bytes with the current converter and options"""
+    version = converter_version((__file__, pipe_table.__file__), CONVERTER_DISTRIBUTIONS)
+    return cache_key(docx_bytes, CONVERTER_NAME, version,
+                     dict(HTML2TEXT_OPTIONS, pad_tables=pad_tables, image_policy=image_policy))
+
+
+def process_file(input_path, output_path=None, verbose=True, cache=None, stats=NULL_STATS,
+                 pad_tables=True, table_workers=None, image_policy=DEFAULT_IMAGE_POLICY, media_dir=None):
+    """Process DOCX file and convert it to Markdown
+
+    Returns the path of the written file. Errors are raised as
+    ConversionError so that batch drivers can handle them per file.
+    With a ConversionCache, unchanged inputs are served from the cache.
+    With an instrumentation.Stats, the time and size of every stage are
+    recorded in it. Without pad_tables, table columns are not padded to a
+    common width; with table_workers, documents with many tables have them
+    formatted in that many processes. image_policy is one of
+    image_policy.IMAGE_POLICIES; with 'extract', images are stored in
+    media_dir (by default 'media' next to the output) and the cache is not
+    used, since it only holds the Markdown.
+    """
+    check_image_policy(image_policy)
+    try:
+        # Convert input path to Path object
+        input_path = Path(input_path)
+        
+        # If output path is not specified, use input filename with .md extension
+        if output_path is None:
+            output_path = input_path.with_suffix('.md')
+        output_dir = Path(output_path).parent
+        if media_dir is None:
+            media_dir = output_dir / MEDIA_DIR_NAME
+        if image_policy == 'extract':
+            cache = None
+        
+        pieces = None
+        if cache is not None:
+            with stats.stage('cache_lookup') as stage:
+                docx_bytes = read_source_bytes(input_path)
+                key = conversion_cache_key(docx_bytes, pad_tables, image_policy)
+                cached = cache.open(key)
+                stage.add(bytes_in=len(docx_bytes), hits=int(cached is not None))
+            if cached is not None:
+                if verbose:
+                    print("Using cached conversion...")
+                pieces = iter_file_chunks(cached)
+        
+        if pieces is None:
+            # Convert DOCX to HTML
+            if verbose:
+                print("Converting DOCX to HTML...")
+            convert_image = image_converter(image_policy, media_dir, relative_to=output_dir)
+            if cache is not None:
+                html_content = convert_docx_to_html(io.BytesIO(docx_bytes), stats, convert_image)
+            else:
+                html_content = convert_docx_to_html(input_path, stats, convert_image)
+            
+            # Convert HTML to Markdown
+            if verbose:
+                print("Converting HTML to Markdown...")
+            pieces = iter_markdown_pieces(html_content, stats, pad_tables, table_workers, image_policy)
+            
+            if cache is not None:
+                pieces = cache.store(key, pieces)
+        
+        # Write output as it is produced (.gz and .zst outputs are compressed)
+        with stats.stage('write') as stage, MarkdownWriter(output_path) as writer:
+            writer.write_all(pieces)
+            stage.add(chars_out=writer.chars_written)
+        preview = writer.preview
+    except ConversionError:
+        raise
+    except Exception as e:
+        raise ConversionError(f"Error processing file: {str(e)}") from e
+    
+    stats.finish()
+    
+    if verbose:
+        print(f"\nConversion completed successfully!")
+        print(f"Output saved to: {output_path}")
+        
+        # Print preview
+        print("\nPreview of the first few lines:")
+        print("-" * 80)
+        print(preview)
+        print("-" * 80)
+    
+    return output_path
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python -m docx2md.docx_to_html_markdown <input_file> [output_file]")
+        sys.exit(1)
+    
+    input_file = sys.argv[1]
+    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    
+    # Set DOCX_MD_CACHE_DIR to reuse conversions of unchanged documents
+    cache = ConversionCache() if os.environ.get(CACHE_DIR_ENV) else None
+    
+    try:
+        process_file(input_file, output_file, cache=cache)
+    except ConversionError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
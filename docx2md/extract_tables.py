@@ -0,0 +1,152 @@
+import sys
+import re
+
+from .table_model import CompactTable, StringPool, write_tables
+
+def clean_cell(cell):
+    """Clean cell content by removing extra brackets, quotes and whitespace"""
+    if not isinstance(cell, str):
+        return ""
+    
+    # Remove array markers and quotes
+    text = re.sub(r'^\[\'|\'\]$', '', cell)
+    text = re.sub(r'\',\s*\'', ' ', text)
+    
+    # Remove extra quotes and brackets
+    text = text.strip('[]"\' ')
+    
+    # Clean whitespace
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    
+    return text
+
+def format_path(path):
+    """Index path of a block inside the docx2python body, e.g. body[2][0]"""
+    return 'body' + ''.join(f'[{index}]' for index in path)
+
+def print_block_structure(block, max_items=2):
+    """Print the structure of a block for debugging (the first max_items items of every list)"""
+    stack = [(block, 0)]
+    while stack:
+        block, level = stack.pop()
+        indent = "  " * level
+        if block is None:  # marker for the items left out of a list
+            print(f"{indent}...")
+        elif isinstance(block, (list, tuple)):
+            print(f"{indent}List/Tuple of length {len(block)}:")
+            if len(block) > max_items:
+                stack.append((None, level + 1))
+            stack.extend((item, level + 1) for item in reversed(block[:max_items]))
+        else:
+            print(f"{indent}Value ({type(block)}): {str(block)[:100]}")
+
+def iter_tables(body, pool, verbose=0):
+    """Yield a CompactTable for every block of the docx2python body that looks like a table
+
+    A block looks like a table when it is a non-empty list whose items are
+    all lists. Blocks are visited once, depth first in document order, with
+    an explicit stack instead of recursion; only lists that hold further
+    lists are pushed, so rows of plain cell texts are read once, while
+    building their table. With verbose >= 1 every table is reported with
+    its path in the body and the table it is nested in, if any.
+    """
+    count = 0
+    # (block, path, (number, path) of the enclosing table or None)
+    stack = [(body, (), None)]
+    while stack:
+        block, path, parent = stack.pop()
+        is_table = len(block) > 0 and all(isinstance(row, (list, tuple)) for row in block)
+        if is_table:
+            count += 1
+            if verbose:
+                nested = f" (nested in table #{parent[0]} at {format_path(parent[1])})" if parent else ""
+                print(f"\nPotential table #{count} at {format_path(path)}{nested}:")
+                print(f"Number of rows: {len(block)}")
+                print(f"Sample row structure: {[type(cell) for cell in block[0]]}")
+            
+            # Convert all cells to strings and remove empty and repeated rows
+            table = CompactTable(pool)
+            for row in block:
+                cleaned_row = [text for text in map(clean_cell, row) if text]
+                if cleaned_row:
+                    table.add_row(cleaned_row)
+            table.freeze()
+            
+            if len(table):  # Only add non-empty tables
+                if verbose:
+                    print(f"Added table with {len(table)} rows after cleaning")
+                yield table
+                parent = (count, path)
+            elif verbose:
+                print("Table was empty after cleaning")
+        
+        # Nested blocks, pushed in reverse so that they are popped in document order
+        for index in range(len(block) - 1, -1, -1):
+            item = block[index]
+            if isinstance(item, (list, tuple)) and any(isinstance(child, (list, tuple)) for child in item):
+                stack.append((item, path + (index,), parent))
+
+def extract_tables(file_path, output_path, table_format=None, verbose=0):
+    """Extract raw table data from DOCX file and save it as JSON, JSON Lines or Parquet
+
+    The format is guessed from the suffix of output_path unless table_format
+    is given (see table_model.write_tables). Tables are written one at a
+    time as they are found. verbose 1 reports every table found and 2 also
+    prints the structure of the document body.
+    """
+    try:
+        from docx2python import docx2python
+        
+        # Extract document content
+        doc = docx2python(file_path)
+        
+        if verbose >= 2:
+            print("\nDocument structure:")
+            print("-" * 80)
+            print_block_structure(doc.body)
+            print("-" * 80)
+        
+        # Cell texts are interned once for the whole document
+        pool = StringPool()
+        first_table = []
+        
+        def keep_first(tables):
+            for table in tables:
+                if not first_table:
+                    first_table.append(table)
+                yield table
+        
+        # Process each block in the document, saving tables as they are found
+        count = write_tables(keep_first(iter_tables(doc.body, pool, verbose)), output_path, table_format)
+            
+        print(f"\nFound {count} tables")
+        print(f"Table data has been saved to {output_path}")
+        
+        # Print preview of first table
+        if first_table:
+            table = first_table[0]
+            print("\nPreview of first table:")
+            print("-" * 80)
+            for index in range(min(3, len(table))):  # Show first 3 rows
+                print(table.row(index))
+            if len(table) > 3:
+                print("...")
+            print("-" * 80)
+        
+    except Exception as e:
+        print(f"Error processing file: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    verbose = 0
+    while args and args[0] in ('-v', '-vv'):
+        verbose += len(args.pop(0)) - 1
+    if len(args) not in (1, 2):
+        print("Usage: python -m docx2md.extract_tables [-v | -vv] <input_file> [output_file (.json, .jsonl or .parquet)]")
+        sys.exit(1)
+    
+    input_file = args[0]
+    output_file = args[1] if len(args) > 1 else 'tables_data.json'
+    extract_tables(input_file, output_file, verbose=verbose)
@@ -1,20 +1,20 @@
-from docx import Document
+from .docs_to_markdown import table_grid
+from .docx_container import open_python_docx
+
 
 def extract_tables(file_path):
-    """Extract all text from DOCX using python-docx"""
-    doc = Document(file_path)
+    """Extract all text from DOCX using python-docx
+
+    A merged cell appears once in every row it covers, however many columns
+    it spans; adjacent cells holding the same text are kept apart.
+    """
+    doc = open_python_docx(file_path)
     tables = []
     
     for table in doc.tables:
         rows = []
-        for row in table.rows:
-            columns = []
-            text = set()
-            for cell in row.cells:
-                if cell.text.strip():
-                    if cell.text not in text:
-                        columns.append(cell.text)
-                        text.add(cell.text)
+        for row in table_grid(table).rows:
+            columns = [cell.text for cell in row if cell.text.strip()]
             if columns:
                 rows.append(columns)
 
@@ -25,7 +25,7 @@ def extract_tables(file_path):
 
 def extract_paragraphs(file_path):
     """Extract all text from DOCX using python-docx"""
-    doc = Document(file_path)
+    doc = open_python_docx(file_path)
     paragraphs = []
     
     for paragraph in doc.paragraphs:
@@ -37,7 +37,7 @@ def extract_paragraphs(file_path):
 if __name__ == '__main__':
     import sys
     if len(sys.argv) != 2:
-        print("Usage: python extract_text_docx.py input.docx")
+        print("Usage: python -m docx2md.extract_text_docx input.docx")
         sys.exit(1)
     
     # tables = extract_tables(sys.argv[1])
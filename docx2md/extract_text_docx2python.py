@@ -0,0 +1,351 @@
+import io
+import sys
+import re
+import textwrap
+import xml.etree.ElementTree as ET
+
+from . import docx_stream
+from .instrumentation import NULL_STATS
+from .markdown_writer import MarkdownWriter
+from .text_cleanup import Cleaner, strip, sub
+
+
+CLEANER = Cleaner(
+    # Remove extra whitespace (single spaces are left alone)
+    sub(r'[^\S ]\s*| \s+', ' '),
+    strip(),
+    
+    # Convert HTML links to markdown
+    sub(r'<a href="([^"]+)">([^<]+)</a>', r'[\2](\1)', requires='<a href="'),
+    
+    # Fix broken URLs
+    sub(r'https:\s*//', 'https://', requires='https:'),
+    sub(r'www\.\s*', 'www.', requires='www.'),
+    
+    # Fix email addresses (a match always starts at the beginning of a word,
+    # so other positions are rejected without backtracking through the word)
+    sub(r'(?<!\w)(\w+)\s*\.\s*(\w+)\s*@', r'\1.\2@', requires='@'),
+    
+    # Format URLs as markdown links (if not already formatted)
+    sub(r'\[(https?://[^\]]+)\]\([^)]+\)[.)\s]*', r'[\1](\1)', requires='://'),
+    sub(r'(?<!\[)(https?://[^\s]+)(?!\])', r'[\1](\1)', requires='://'),
+)
+
+# Applied to the whole output: collapse blank lines and tidy spaces around links
+POSTPROCESS = Cleaner(
+    sub(r'\n{3,}', '\n\n', requires='\n\n\n'),
+    sub(r'\s+\[', ' [', requires='['),
+    sub(r'\]\s+', '] ', requires=']'),
+)
+
+def clean_text(text):
+    """Clean and format text"""
+    if not isinstance(text, str):
+        return ""
+    
+    return CLEANER(text)
+
+def wrap_text(text, width=100):
+    """Wrap text to specified width while preserving markdown formatting"""
+    # Don't wrap URLs
+    parts = []
+    last_end = 0
+    for match in re.finditer(r'\[([^\]]+)\]\([^)]+\)', text):
+        # Add wrapped text before the URL
+        if match.start() > last_end:
+            parts.extend(textwrap.wrap(text[last_end:match.start()], width=width))
+        # Add the URL unchanged
+        parts.append(text[match.start():match.end()])
+        last_end = match.end()
+    
+    # Add remaining text
+    if last_end < len(text):
+        parts.extend(textwrap.wrap(text[last_end:], width=width))
+    
+    return '\n'.join(parts)
+
+def table_rows(table):
+    """Convert a streamed table to rows of non-empty cell texts, each merged cell once per row"""
+    rows = []
+    for row in table.rows:
+        columns = [cell.text for cell in row if cell.text.strip()]
+        if columns:
+            rows.append(columns)
+
+    return rows
+
+def extract_tables(file_path):
+    """Extract tables from DOCX file"""
+    return [table_rows(block) for block in docx_stream.iter_body(file_path)
+            if isinstance(block, docx_stream.Table)]
+
+ROMAN_NUMERALS = ((1000, 'm'), (900, 'cm'), (500, 'd'), (400, 'cd'), (100, 'c'), (90, 'xc'),
+                  (50, 'l'), (40, 'xl'), (10, 'x'), (9, 'ix'), (5, 'v'), (4, 'iv'), (1, 'i'))
+
+def lower_letter(n):
+    """a, b, ... z, aa, ab, ... as in numbered lists and spreadsheet columns"""
+    letters = ''
+    while n > 0:
+        n, remainder = divmod(n - 1, 26)
+        letters = chr(ord('a') + remainder) + letters
+    return letters
+
+def lower_roman(n):
+    numeral = ''
+    for value, letters in ROMAN_NUMERALS:
+        count, n = divmod(n, value)
+        numeral += letters * count
+    return numeral
+
+# numFmt of a list level -> its number as text; other formats get the bullet
+NUMBER_FORMATS = {
+    'decimal': str,
+    'lowerLetter': lower_letter,
+    'upperLetter': lambda n: lower_letter(n).upper(),
+    'lowerRoman': lower_roman,
+    'upperRoman': lambda n: lower_roman(n).upper(),
+}
+BULLET = '--'
+
+class ListLabels:
+    """Labels of list paragraphs as docx2python writes them: '--', '1)', 'b)', 'iv)'
+
+    numbering_xml is the numbering part of the document (or None). Items are
+    counted per numId in document order, paragraphs of table cells included,
+    and the levels below an item start again after it. As in docx2python,
+    only numbering set on the paragraph itself counts, the text of the label
+    comes from the numFmt and w:start of the level, not its w:lvlText, and
+    formats other than decimal, letters and roman numerals get the bullet;
+    levels without a number (numFmt 'none') and numId 0 get no label.
+    """
+
+    def __init__(self, numbering_xml=None):
+        self.levels = {}  # numId -> [(numFmt, start)] by level
+        self.counts = {}  # numId -> {level: items so far}
+        if numbering_xml is None:
+            return
+        root = ET.fromstring(numbering_xml)
+        abstract = {}
+        for abstract_num in root.iter(docx_stream._w('abstractNum')):
+            levels = []
+            for lvl in abstract_num.iter(docx_stream._w('lvl')):
+                num_fmt = lvl.find(docx_stream._w('numFmt'))
+                start = lvl.find(docx_stream._w('start'))
+                levels.append((num_fmt.get(docx_stream.W_VAL) if num_fmt is not None else None,
+                               int(start.get(docx_stream.W_VAL, 0)) if start is not None else 0))
+            abstract[abstract_num.get(docx_stream._w('abstractNumId'))] = levels
+        for num in root.iter(docx_stream._w('num')):
+            abstract_id = num.find(docx_stream._w('abstractNumId'))
+            if abstract_id is not None:
+                self.levels[num.get(docx_stream.NUM_ID)] = abstract.get(abstract_id.get(docx_stream.W_VAL), [])
+
+    def __call__(self, paragraph):
+        """The label of a docx_stream.Paragraph, or '' when it is not a list item; counts it"""
+        if paragraph.numbering is None:
+            return ''
+        num_id, ilvl = paragraph.numbering
+        try:
+            level = int(ilvl)
+        except (TypeError, ValueError):
+            return ''
+        if num_id in (None, '0') or level < 0:
+            return ''
+
+        counts = self.counts.setdefault(num_id, {})
+        counts[level] = counts.get(level, 0) + 1
+        for deeper in [other for other in counts if other > level]:
+            del counts[deeper]
+
+        levels = self.levels.get(num_id, ())
+        num_fmt, start = levels[level] if level < len(levels) else (None, 0)
+        if num_fmt == 'none':
+            return ''
+        number_format = NUMBER_FORMATS.get(num_fmt)
+        if number_format is None:
+            return BULLET
+        number = counts[level] + max(start - 1, 0)
+        return (number_format(number) if number > 0 else str(number)) + ')'
+
+def with_list_label(paragraph, label):
+    """The paragraph with its list label as a first run, where docx2python puts it"""
+    if not label:
+        return paragraph
+    return paragraph._replace(runs=[docx_stream.Run(label + '\t', None), *paragraph.runs])
+
+def labeled_table(table, label_of, flatten=iter):
+    """The table with the list paragraphs of its cells starting with their labels
+
+    label_of gives the label of a paragraph and is called for every paragraph
+    of the table, nested tables included, in document order; flatten turns
+    the blocks of a cell into paragraphs and tables. The table is copied
+    only when it has list paragraphs.
+    """
+    cells = {}
+    labeled = False
+    for cell in table.cells:
+        lines = []
+        for block in flatten(cell.blocks or ()):
+            if isinstance(block, docx_stream.Table):
+                labeled_table(block, label_of, flatten)  # counts its list items
+                continue
+            label = label_of(block)
+            lines.append(f'{label} {block.text}' if label else block.text)
+            labeled = labeled or bool(label)
+        cells[id(cell)] = docx_stream.Cell('\n'.join(lines), cell.blocks, cell.row, cell.col,
+                                           cell.row_span, cell.col_span)
+    if not labeled:
+        return table
+    copy = docx_stream.Table()
+    copy.cells = list(cells.values())
+    copy.rows = [[cells[id(cell)] for cell in row] for row in table.rows]
+    return copy
+
+def iter_labeled_blocks(blocks, labels):
+    """Put the ListLabels labels in front of the list paragraphs of docx_stream blocks"""
+    for block in blocks:
+        if isinstance(block, docx_stream.Table):
+            yield labeled_table(block, labels)
+        else:
+            yield with_list_label(block, labels(block))
+
+def paragraph_markup(paragraph):
+    """Render paragraph text with hyperlinks as <a> tags, as clean_text expects"""
+    parts = []
+    for run in paragraph.runs:
+        if run.href:
+            parts.append(f'<a href="{run.href}">{run.text}</a>')
+        else:
+            parts.append(run.text)
+    return ''.join(parts)
+
+def format_table_as_markdown(table_data):
+    """Format table data as markdown table"""
+    if not table_data:
+        return ""
+    
+    # Find the maximum number of columns
+    max_cols = max(len(row) for row in table_data)
+    
+    # Format rows
+    rows = []
+    for i, row in enumerate(table_data):
+        # Pad row to have the same number of columns
+        padded_row = row + [""] * (max_cols - len(row))
+        
+        # Format row with separators
+        formatted_row = "| " + " | ".join(padded_row) + " |"
+        rows.append(formatted_row)
+        
+        # Add separator after header row
+        if i == 0:
+            separator = "|" + "|".join(["---" for _ in range(max_cols)]) + "|"
+            rows.append(separator)
+    
+    return "\n---\n\n" + "\n".join(rows) + "\n\n"
+
+def iter_postprocessed(pieces):
+    """Apply POSTPROCESS to a stream of pieces as if they were one string
+
+    Trailing whitespace, and a closing bracket just before it, is carried over
+    to the next piece, so no match is split between two pieces.
+    """
+    carry = ''
+    for piece in pieces:
+        text = carry + piece
+        body = text.rstrip()
+        if body.endswith(']'):
+            body = body[:-1]
+        carry = text[len(body):]
+        if body:
+            yield POSTPROCESS(body)
+    if carry:
+        yield POSTPROCESS(carry)
+
+def iter_markdown_pieces(file_path, stats=NULL_STATS):
+    """Yield the Markdown of a document piece by piece: prose first, then tables"""
+    docx = docx_stream.open_docx(file_path)
+    try:
+        labels = ListLabels(docx_stream.read_related_part(docx, docx_stream.NUMBERING_TYPE,
+                                                          docx_stream.NUMBERING_PART))
+        blocks = iter_labeled_blocks(docx_stream.iter_body(docx), labels)
+        yield from iter_block_markdown(stats.iterate('parse', blocks), stats)
+    finally:
+        if docx is not file_path:
+            docx.close()
+
+def iter_block_markdown(blocks, stats=NULL_STATS):
+    """Yield the Markdown of top-level paragraphs and tables: prose first, then tables
+
+    Anything that is not a docx_stream.Table is taken for a paragraph with
+    runs, such as docx_stream.Paragraph.
+    """
+    # Walk the document once, collecting tables and paragraph texts together.
+    # Only paragraphs at the top level of the body are prose: the paragraphs
+    # of table cells are table content by position and go to the tables only.
+    tables = []
+    paragraphs = []
+    for block in blocks:
+        with stats.stage('clean') as stage:
+            if isinstance(block, docx_stream.Table):
+                tables.append(table_rows(block))
+                stage.add(tables=1)
+            else:
+                paragraphs.append(clean_text(paragraph_markup(block)))
+                stage.add(paragraphs=1)
+    
+    # Process and format text
+    seen_paragraphs = set()  # To avoid duplicates
+    
+    for text in paragraphs:
+        if text and text not in seen_paragraphs:
+            # Wrap long paragraphs
+            wrapped_text = wrap_text(text)
+            yield f"{wrapped_text}\n\n"
+            seen_paragraphs.add(text)
+    
+    # Add tables to the output after processing all text
+    for table in tables:
+        yield format_table_as_markdown(table)
+
+def convert_docx_to_markdown(source):
+    """Convert a DOCX path, bytes or binary file object to a Markdown string"""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    return ''.join(iter_postprocessed(iter_markdown_pieces(source)))
+
+def extract_text(file_path, output_path, stats=NULL_STATS):
+    """Extract text from DOCX file and save as markdown
+    
+    With an instrumentation.Stats, the time and size of every stage are
+    recorded in it.
+    """
+    try:
+        # Clean up multiple newlines and spaces around URLs while writing
+        pieces = stats.iterate('format', iter_markdown_pieces(file_path, stats))
+        pieces = stats.iterate('postprocess', iter_postprocessed(pieces))
+        with stats.stage('write') as stage, MarkdownWriter(output_path) as writer:
+            writer.write_all(pieces)
+            stage.add(chars_out=writer.chars_written)
+        stats.finish()
+        preview = writer.preview
+            
+        print(f"Text has been extracted and saved to {output_path}")
+        
+        # Print preview
+        print("\nPreview of the first few lines:")
+        print("-" * 80)
+        print(preview)
+        print("-" * 80)
+        
+    except Exception as e:
+        print(f"Error processing file: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python -m docx2md.extract_text_docx2python <input_file>")
+        sys.exit(1)
+    
+    input_file = sys.argv[1]
+    output_file = 'output_docx2python.md'
+    extract_text(input_file, output_file) 
\ No newline at end of file
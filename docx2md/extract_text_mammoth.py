@@ -0,0 +1,293 @@
+import io
+import os
+import re
+import sys
+
+from .conversion_cache import (CACHE_DIR_ENV, ConversionCache, cache_key,
+                               converter_version, read_source_bytes)
+from .instrumentation import NULL_STATS
+from .markdown_writer import MarkdownWriter, iter_file_chunks, join_blocks
+from .text_cleanup import Cleaner, sub
+
+# mammoth is imported in extract_text_mammoth, so that cache hits never load it
+
+CONVERTER_NAME = 'extract_text_mammoth'
+CONVERTER_DISTRIBUTIONS = ('mammoth',)
+
+CLEANER = Cleaner(
+    # Fix broken URLs
+    sub(r'https:\s*//', 'https://', requires='https:'),
+    sub(r'www\.\s*', 'www.', requires='www.'),
+    
+    # Join broken lines (where a line ends with a word break)
+    sub(r'(\w)\s*\n\s*(\w)', r'\1\2', requires='\n'),
+    
+    # Remove multiple newlines
+    sub(r'\n{3,}', '\n\n', requires='\n\n\n'),
+    
+    # Remove spaces before punctuation (anchored at the start of the whitespace
+    # run so that long runs are not rescanned from every position)
+    sub(r'(?<!\s)\s+([.,;:!?)])', r'\1'),
+    
+    # Ensure proper spacing after punctuation
+    sub(r'([.,;:!?])([^\s\n])', r'\1 \2'),
+    
+    # Remove spaces at the start of lines
+    sub(r'^\s+', '', flags=re.MULTILINE),
+    
+    # Fix list formatting
+    sub(r'\n\s*-\s*', '\n- ', requires='-'),
+    
+    # Remove extra spaces (single spaces are left alone)
+    sub(r' {2,}', ' ', requires='  '),
+    
+    # Fix email addresses (a match always starts at the beginning of a word,
+    # so other positions are rejected without backtracking through the word)
+    sub(r'(?<!\w)(\w+)\s*\.\s*(\w+)\s*@', r'\1.\2@', requires='@'),
+    
+    # Fix broken lines that end with hyphen
+    sub(r'(\w)-\s*\n\s*(\w)', r'\1\2', requires='-'),
+)
+
+URL_RE = re.compile(r'(https?://[^\s)]+)')
+EMAIL_RE = re.compile(r'(\S+@\S+\.\S+)')
+FRENCH_RE = re.compile(r'"([^"]*appels à manifestation d\'intérêt[^"]*)"')
+RULE_RE = re.compile(r'\n+---\n+')
+
+def is_title(line):
+    """Section titles are upper-case lines of more than one word"""
+    return line.isupper() and len(line.split()) > 1
+
+def iter_lines(text):
+    """Yield the stripped, non-empty lines of text without splitting it up front"""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        line = (text[start:] if end == -1 else text[start:end]).strip()
+        if line:
+            yield line
+        if end == -1:
+            return
+        start = end + 1
+
+def iter_sections(text):
+    """Group lines into sections that start at title lines
+    
+    A titled section keeps one line per row; the untitled text before the
+    first title is joined into a single paragraph.
+    """
+    current = []
+    titled = False
+    
+    for line in iter_lines(text):
+        if is_title(line):
+            if current:
+                yield '\n'.join(current) if titled else ' '.join(current)
+            current = [line]
+            titled = True
+        else:
+            current.append(line)
+    
+    if current:
+        yield '\n'.join(current) if titled else ' '.join(current)
+
+def clean_text(text):
+    """Clean and format the extracted text"""
+    return '\n\n'.join(iter_sections(CLEANER(text)))
+
+def format_table_data(data):
+    """Format data as a markdown table"""
+    if not data:
+        return ""
+        
+    # Find the maximum width of each column
+    col_widths = [max(len(str(row[i])) for row in data) for i in range(len(data[0]))]
+    
+    # Create the header row
+    header = "| " + " | ".join(f"**{str(cell)}**".ljust(width) for cell, width in zip(data[0], col_widths)) + " |"
+    
+    # Create the separator row
+    separator = "|" + "|".join("-" * (width + 2) for width in col_widths) + "|"
+    
+    # Create the data rows
+    rows = []
+    for row in data[1:]:
+        rows.append("| " + " | ".join(str(cell).ljust(width) for cell, width in zip(row, col_widths)) + " |")
+    
+    return "\n".join([header, separator] + rows)
+
+def iter_markdown_blocks(sections):
+    """Convert sections to Markdown blocks, yielding each block as soon as it is final"""
+    table_data = []
+    in_table = False
+    previous = None  # the last block, held back until we know what follows it
+    
+    def emit(block):
+        nonlocal previous
+        if previous is not None:
+            # A horizontal rule is separated from the block before it by
+            # exactly one blank line
+            yield previous.rstrip('\n') if block == '---' else previous
+        previous = block
+    
+    for i, section in enumerate(sections):
+        section = section.strip()
+        if not section:
+            continue
+        
+        single_line = '\n' not in section
+        
+        # Convert main title
+        if i == 0 and section.isupper():
+            yield from emit(f"# {section}\n")
+            continue
+        
+        # Convert section titles
+        if section.isupper() and len(section.split()) > 1:
+            if previous is not None:
+                yield from emit("---")
+                yield from emit(f"## {section}")
+            else:
+                yield from emit(f"\n## {section}")
+            continue
+        
+        # Handle table-like data
+        if ':' in section and single_line:
+            title, value = section.split(':', 1)
+            title = title.strip()
+            value = value.strip()
+            
+            if title.istitle() and not title.isupper():
+                if not in_table:
+                    in_table = True
+                    table_data = [["Field", "Value"]]
+                table_data.append([title, value])
+                continue
+        
+        # If we were in a table and now we're not, format the table
+        if in_table and (not ':' in section or not single_line):
+            in_table = False
+            if table_data:
+                yield from emit(format_table_data(table_data))
+                table_data = []
+        
+        # Convert URLs to markdown links
+        section = URL_RE.sub(r'[\1](\1)', section)
+        
+        # Convert email addresses to markdown links
+        section = EMAIL_RE.sub(r'[\1](mailto:\1)', section)
+        
+        # Add emphasis to French text
+        section = FRENCH_RE.sub(r'*"\1"*', section)
+        
+        # Format lists
+        if section.startswith('- '):
+            lines = section.split('\n')
+            section = '\n'.join('- ' + line.strip().lstrip('- ') for line in lines if line.strip())
+        
+        yield from emit(section)
+    
+    # Format any remaining table
+    if in_table and table_data:
+        yield from emit(format_table_data(table_data))
+    
+    if previous is not None:
+        yield previous
+
+def convert_to_markdown(text):
+    """Convert text to markdown format"""
+    text = '\n\n'.join(iter_markdown_blocks(text.split('\n\n')))
+    
+    # Fix spacing around horizontal rules written by hand
+    return RULE_RE.sub('\n\n---\n\n', text)
+
+def iter_document_blocks(text, stats=NULL_STATS):
+    """Stream the Markdown blocks of raw extracted text, one section at a time"""
+    with stats.stage('clean') as stage:
+        cleaned = CLEANER(text)
+        stage.add(bytes_in=len(text), bytes_out=len(cleaned))
+    return stats.iterate('markdown_blocks', iter_markdown_blocks(iter_sections(cleaned)))
+
+def convert_docx_to_markdown(source):
+    """Convert a DOCX path, bytes or binary file object to a Markdown string"""
+    import mammoth
+    
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    if hasattr(source, 'read'):
+        result = mammoth.extract_raw_text(source)
+    else:
+        with open(source, "rb") as docx_file:
+            result = mammoth.extract_raw_text(docx_file)
+    return ''.join(join_blocks(iter_document_blocks(result.value)))
+
+def conversion_cache_key(docx_bytes):
+    """Cache key for converting docx_bytes with the current converter"""
+    version = converter_version(__file__, CONVERTER_DISTRIBUTIONS)
+    return cache_key(docx_bytes, CONVERTER_NAME, version)
+
+def extract_text_mammoth(file_path, output_path, cache=None, stats=NULL_STATS, preview_only=False):
+    """Extract all text from DOCX using mammoth with enhanced formatting
+    
+    The Markdown is written to output_path as it is produced and returned.
+    With preview_only, only its first lines are returned, so the whole
+    Markdown is never held in memory. With an instrumentation.Stats, the
+    time and size of every stage are recorded in it.
+    """
+    try:
+        pieces = None
+        if cache is not None:
+            with stats.stage('cache_lookup') as stage:
+                docx_bytes = read_source_bytes(file_path)
+                key = conversion_cache_key(docx_bytes)
+                cached = cache.open(key)
+                stage.add(bytes_in=len(docx_bytes), hits=int(cached is not None))
+            if cached is not None:
+                pieces = iter_file_chunks(cached)
+        
+        if pieces is None:
+            import mammoth
+            
+            with stats.stage('extract_raw_text') as stage:
+                if cache is not None:
+                    result = mammoth.extract_raw_text(io.BytesIO(docx_bytes))
+                else:
+                    stage.add(bytes_in=os.path.getsize(file_path))
+                    with open(file_path, "rb") as docx_file:
+                        result = mammoth.extract_raw_text(docx_file)
+                stage.add(bytes_out=len(result.value))
+            
+            # Clean the text and convert it to markdown in a single pass over its lines
+            pieces = join_blocks(iter_document_blocks(result.value, stats))
+            
+            if cache is not None:
+                pieces = cache.store(key, pieces)
+        
+        # Save to output file as the blocks are produced
+        markdown = []
+        with stats.stage('write') as stage, MarkdownWriter(output_path) as writer:
+            for piece in pieces:
+                writer.write(piece)
+                if not preview_only:
+                    markdown.append(piece)
+            stage.add(chars_out=writer.chars_written)
+        stats.finish()
+        return writer.preview if preview_only else ''.join(markdown)
+    except Exception as e:
+        print(f"Error processing file: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python -m docx2md.extract_text_mammoth <input_file>")
+        sys.exit(1)
+    
+    output_path = 'output.md'
+    # Set DOCX_MD_CACHE_DIR to reuse conversions of unchanged documents
+    cache = ConversionCache() if os.environ.get(CACHE_DIR_ENV) else None
+    preview = extract_text_mammoth(sys.argv[1], output_path, cache=cache, preview_only=True)
+    print(f"Markdown text has been saved to {output_path}")
+    print("\nPreview of the first few lines:")
+    print("-" * 80)
+    print(preview)
+    print("-" * 80)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import hashlib
+import mimetypes
+import os
+from pathlib import Path
+
+# How images end up in the Markdown:
+#   drop    - only their alt text is kept; the image data is never read
+#   extract - written once to a media directory under the hash of their
+#             content and linked from the Markdown
+#   inline  - linked as base64 data: URIs, as mammoth writes them in HTML
+IMAGE_POLICIES = ('drop', 'extract', 'inline')
+DEFAULT_IMAGE_POLICY = 'drop'
+
+# Default media directory, next to the Markdown output
+MEDIA_DIR_NAME = 'media'
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def check_image_policy(policy):
+    """Raise ValueError unless policy is a known image policy"""
+    if policy not in IMAGE_POLICIES:
+        raise ValueError(f"Unknown image policy {policy!r}, expected one of {', '.join(IMAGE_POLICIES)}")
+
+
+def image_extension(content_type):
+    """File extension for an image content type, e.g. '.png' for 'image/png'"""
+    extension = mimetypes.guess_extension(content_type or '')
+    if extension is None:
+        subtype = (content_type or '').rpartition('/')[2]
+        extension = '.' + subtype if subtype.isalnum() else '.bin'
+    return extension
+
+
+def store_media(source, media_dir, extension):
+    """Copy a binary file object into media_dir, named after the hash of its content
+
+    The data is hashed while it is copied, so it is never held in memory as
+    a whole. Identical images, from one document or from every document of a
+    batch sharing media_dir, are stored once. Returns the path of the file.
+    """
+    media_dir = Path(media_dir)
+    media_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.blake2b(digest_size=16)
+    tmp_path = media_dir / f'.{os.getpid()}.{id(source)}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                f.write(chunk)
+        path = media_dir / (digest.hexdigest() + extension)
+        if path.exists():
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, path)
+        return path
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def image_converter(policy=DEFAULT_IMAGE_POLICY, media_dir=MEDIA_DIR_NAME, relative_to='.'):
+    """mammoth convert_image function for an image policy
+
+    With 'extract', images are stored in media_dir and their src is the path
+    of the stored file relative to the directory relative_to, where the
+    Markdown is written.
+    """
+    from mammoth import images
+
+    check_image_policy(policy)
+    if policy == 'inline':
+        return images.data_uri
+    if policy == 'drop':
+        # html2text only keeps the alt text, but needs a src to write it
+        return images.img_element(lambda image: {'src': ''})
+
+    def extract(image):
+        with image.open() as image_file:
+            path = store_media(image_file, media_dir, image_extension(image.content_type))
+        return {'src': Path(os.path.relpath(path, relative_to)).as_posix()}
+
+    return images.img_element(extract)
@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from . import docs_to_markdown
+from . import docx_stream
+from . import text_cleanup
+from .conversion_cache import converter_version
+from .docx_stream import DOCUMENT_PART, W_NS, open_docx, read_related_part
+from .instrumentation import NULL_STATS
+from .markdown_writer import MarkdownWriter
+
+# python-docx is only imported when some block has to be rendered, so that a
+# run on an unchanged document never loads it
+
+INDEX_SUFFIX = '.index.json'
+INDEX_FORMAT = 1
+CONVERTER_DISTRIBUTIONS = ('python-docx',)
+
+STYLES_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles'
+STYLES_PART = 'word/styles.xml'
+
+ROOT_TAG_RE = re.compile(rb'<(?![?!])[^>]*>')
+W_PREFIX_RE = re.compile(rb'xmlns(?::([\w.-]+))?="' + re.escape(W_NS.encode('ascii')) + rb'"')
+
+
+# Top-level elements of the body that contain other blocks. python-docx skips
+# them, and so do we.
+_SKIPPED_KINDS = (b'sdt', b'customXml')
+
+
+def _element_end(xml, tag_re, pos, end):
+    """Return the offset just past the end tag of the element whose start tag ends at pos
+
+    tag_re matches the start, end and empty tags of the element's own kind;
+    other elements nested inside it are skipped over by the search.
+    """
+    depth = 1
+    for tag in tag_re.finditer(xml, pos, end):
+        closing, empty = tag.groups()
+        if closing:
+            depth -= 1
+            if depth == 0:
+                return tag.end()
+        elif not empty:
+            depth += 1
+    raise ValueError("document.xml has an unterminated element")
+
+
+def split_body(xml):
+    """Find the top-level paragraphs and tables of document.xml without parsing it
+
+    Returns the root start tag, the namespace prefix of WordprocessingML
+    ('w:' in practice) and (kind, start, end) byte ranges of the blocks in
+    document order, kind being b'p' or b'tbl'. Only start and end tags of
+    the block kinds are searched for, and the end of a block is found by
+    counting tags of its own kind, so the runs inside paragraphs and the
+    cells of tables are never looked at one by one. Like python-docx,
+    top-level content controls and custom XML are skipped.
+    """
+    root = ROOT_TAG_RE.search(xml)
+    if root is None:
+        raise ValueError("document.xml has no root element")
+    root_tag = root.group(0)
+    match = W_PREFIX_RE.search(root_tag)
+    if match is None:
+        raise ValueError("document.xml does not use the WordprocessingML namespace")
+    prefix = match.group(1) + b':' if match.group(1) else b''
+
+    body = re.compile(rb'<' + prefix + rb'body\b[^>]*>').search(xml, root.end())
+    if body is None:
+        return root_tag, prefix, []
+    body_end = xml.rfind(b'</' + prefix + b'body>')
+    if body_end < 0:
+        raise ValueError("document.xml has an unterminated body")
+
+    start_re = re.compile(rb'<' + prefix + rb'(p|tbl|sdt|customXml)\b[^>]*?(/?)>')
+    end_res = {}
+    blocks = []
+    pos = body.end()
+    while True:
+        tag = start_re.search(xml, pos, body_end)
+        if tag is None:
+            break
+        kind, empty = tag.groups()
+        if empty:
+            pos = tag.end()
+        else:
+            if kind not in end_res:
+                end_res[kind] = re.compile(rb'<(/?)' + prefix + kind + rb'\b[^>]*?(/?)>')
+            pos = _element_end(xml, end_res[kind], tag.end(), body_end)
+        if kind not in _SKIPPED_KINDS:
+            blocks.append((kind, tag.start(), pos))
+    return root_tag, prefix, blocks
+
+
+def fingerprint(data):
+    """Fingerprint of the XML of one block"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def read_styles_part(docx):
+    """Return the bytes of the document's styles part, or None when it has none"""
+    return read_related_part(docx, STYLES_TYPE, STYLES_PART)
+
+
+class _StylesPart:
+    """Stands in for python-docx's document part as the parent of rendered blocks
+
+    Paragraphs and tables only go to their part to look up styles, so the
+    styles part is all that has to be loaded; document.xml is never parsed
+    as a whole.
+    """
+
+    def __init__(self, styles_xml):
+        from docx.oxml import parse_xml
+        from docx.parts.styles import StylesPart
+        from docx.styles.styles import Styles
+
+        if styles_xml is None:
+            # python-docx falls back to its default styles in the same way
+            self.styles = StylesPart.default(None).styles
+        else:
+            self.styles = Styles(parse_xml(styles_xml))
+
+    @property
+    def part(self):
+        return self
+
+    def get_style(self, style_id, style_type):
+        return self.styles.get_by_id(style_id, style_type)
+
+
+def render_blocks(fragments, root_tag, prefix, styles_xml):
+    """Render the XML of top-level blocks to Markdown with python-docx, in one parse"""
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import qn
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    root_name = root_tag[1:].split(None, 1)[0].rstrip(b'>')
+    xml = b''.join([root_tag, b'<', prefix, b'body>', *fragments,
+                    b'</', prefix, b'body></', root_name, b'>'])
+    body = parse_xml(xml)[0]
+
+    parent = _StylesPart(styles_xml)
+    blocks = [Table(element, parent) if element.tag == qn('w:tbl') else Paragraph(element, parent)
+              for element in body]
+    levels = docs_to_markdown.style_heading_levels(parent.styles.element)
+    return list(docs_to_markdown.iter_markdown_blocks(blocks, levels))
+
+
+def index_path_for(output_path):
+    """Default location of the sidecar index of an output file"""
+    return Path(str(output_path) + INDEX_SUFFIX)
+
+
+def load_index(index_path, context):
+    """Return the fingerprint -> Markdown map of the index, or {} if it is missing or stale"""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get('format') != INDEX_FORMAT or index.get('context') != context:
+        return {}
+    return index.get('blocks', {})
+
+
+def save_index(index_path, context, blocks):
+    """Write the index atomically, so an interrupted run leaves the previous one"""
+    index_path = Path(index_path)
+    tmp_path = index_path.with_name(f'{index_path.name}.{os.getpid()}.tmp')
+    try:
+        # json.dumps encodes in C; json.dump would go through the Python encoder
+        data = json.dumps({'format': INDEX_FORMAT, 'context': context, 'blocks': blocks},
+                          ensure_ascii=False, separators=(',', ':'))
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, index_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def conversion_context(root_tag, styles_xml):
+    """Digest of everything besides its own XML that the Markdown of a block depends on"""
+    digest = hashlib.sha256()
+    version = converter_version((__file__, docs_to_markdown.__file__, docx_stream.__file__,
+                                 text_cleanup.__file__), CONVERTER_DISTRIBUTIONS)
+    digest.update(version.encode('utf-8'))
+    digest.update(b'\0' + root_tag)
+    digest.update(b'\0' + (styles_xml or b''))
+    return digest.hexdigest()
+
+
+def convert_incremental(input_path, output_path, index_path=None, stats=NULL_STATS):
+    """Convert a DOCX file with docs_to_markdown, re-rendering only changed blocks
+
+    Every top-level paragraph and table is fingerprinted from its XML. The
+    sidecar index (output_path + '.index.json' by default) maps the
+    fingerprints of the previous run to the Markdown they produced; blocks
+    found there are reused and only new or edited ones are rendered with
+    python-docx. A change of styles or of the converter code invalidates
+    the whole index. Returns a dict with the number of 'blocks', of
+    'rendered' ones and of 'reused' ones.
+    """
+    if index_path is None:
+        index_path = index_path_for(output_path)
+
+    with stats.stage('read') as stage:
+        with open_docx(input_path) as docx:
+            xml = docx.read(DOCUMENT_PART)
+            styles_xml = read_styles_part(docx)
+        stage.add(bytes_in=len(xml))
+
+    with stats.stage('fingerprint') as stage:
+        root_tag, prefix, blocks = split_body(xml)
+        view = memoryview(xml)
+        fingerprints = [fingerprint(view[start:end]) for _, start, end in blocks]
+        context = conversion_context(root_tag, styles_xml)
+        previous = load_index(index_path, context)
+        stage.add(elements=len(blocks))
+
+    # Render every block that is not in the index, once per distinct fingerprint
+    missing = {}
+    for key, (_, start, end) in zip(fingerprints, blocks):
+        if key not in previous and key not in missing:
+            missing[key] = view[start:end]
+    with stats.stage('render') as stage:
+        if missing:
+            rendered = render_blocks(missing.values(), root_tag, prefix, styles_xml)
+            missing = dict(zip(missing, rendered))
+        stage.add(elements=len(missing))
+
+    current = {}
+    for key in fingerprints:
+        current[key] = missing[key] if key in missing else previous[key]
+
+    with stats.stage('write') as stage, MarkdownWriter(output_path) as writer:
+        writer.write_all(current[key] for key in fingerprints)
+        stage.add(chars_out=writer.chars_written)
+        # The index only changes when blocks were added, edited or removed
+        if missing or len(current) != len(previous):
+            save_index(index_path, context, current)
+    stats.finish()
+
+    return {'blocks': len(blocks), 'rendered': len(missing),
+            'reused': sum(1 for key in fingerprints if key not in missing)}
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("Usage: python -m docx2md.incremental_convert <input_file> <output_file> [index_file]")
+        sys.exit(1)
+
+    report = convert_incremental(sys.argv[1], sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+    print(f"{report['blocks']} blocks: {report['rendered']} rendered, {report['reused']} reused")
+    print(f"Markdown saved to {sys.argv[2]}")
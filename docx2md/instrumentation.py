@@ -0,0 +1,201 @@
+import time
+import tracemalloc
+
+
+class Stage:
+    """Measurements of one named stage, accumulated over every time it runs"""
+
+    __slots__ = ('name', 'seconds', 'calls', 'counts', 'alloc_peak')
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.calls = 0
+        self.counts = {}
+        self.alloc_peak = None
+
+    def add(self, **counts):
+        """Add to the counters of the stage, e.g. bytes_in=..., elements=..."""
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+
+    def as_dict(self):
+        result = {'seconds': self.seconds, 'calls': self.calls}
+        result.update(self.counts)
+        if self.alloc_peak is not None:
+            result['alloc_peak_bytes'] = self.alloc_peak
+        return result
+
+
+class _Frame:
+    """An active run of a stage"""
+
+    __slots__ = ('stage', 'start', 'children', 'base', 'peak')
+
+    def __init__(self, stage, start):
+        self.stage = stage
+        self.start = start
+        self.children = 0.0
+        self.base = 0
+        self.peak = 0
+
+
+class _StageContext:
+    __slots__ = ('stats', 'stage')
+
+    def __init__(self, stats, stage):
+        self.stats = stats
+        self.stage = stage
+
+    def __enter__(self):
+        self.stats._enter(self.stage)
+        return self.stage
+
+    def __exit__(self, *exc_info):
+        self.stats._exit()
+
+
+class Stats:
+    """Opt-in per-stage instrumentation of a conversion
+
+    Pipelines wrap their stages in ``with stats.stage(name) as stage:`` and
+    record counters with ``stage.add(bytes_in=..., elements=...)``. Lazy
+    stages are measured with ``stats.iterate(name, iterable)``, which only
+    counts the time spent producing items. Time spent in a nested stage is
+    subtracted from the enclosing one, so the seconds of all stages add up
+    to the instrumented time.
+
+    With trace_memory, tracemalloc records the peak of memory allocated
+    during each stage. It slows conversions down noticeably, so it is off
+    by default. finish() passes the results to callback, for forwarding to
+    a metrics system.
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory=False, callback=None):
+        self.trace_memory = trace_memory
+        self.callback = callback
+        self.stages = {}
+        self._stack = []
+        self._started = time.perf_counter()
+        self._finished = None
+        self._own_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracing = True
+
+    def stage(self, name):
+        """Context manager measuring one run of the stage name"""
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = Stage(name)
+        return _StageContext(self, stage)
+
+    def iterate(self, name, iterable):
+        """Yield from iterable, counting the time spent producing items as stage name"""
+        context = self.stage(name)
+        iterator = iter(iterable)
+        while True:
+            with context as stage:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                stage.add(items=1)
+            yield item
+
+    def _enter(self, stage):
+        frame = _Frame(stage, time.perf_counter())
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # The peak counter is reset for the new stage; keep the parent's so far
+                parent = self._stack[-1]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            frame.base = current
+            frame.peak = current
+        self._stack.append(frame)
+
+    def _exit(self):
+        frame = self._stack.pop()
+        elapsed = time.perf_counter() - frame.start
+        stage = frame.stage
+        stage.seconds += elapsed - frame.children
+        stage.calls += 1
+        if self._stack:
+            self._stack[-1].children += elapsed
+        if self.trace_memory:
+            peak = max(frame.peak, tracemalloc.get_traced_memory()[1]) - frame.base
+            stage.alloc_peak = peak if stage.alloc_peak is None else max(stage.alloc_peak, peak)
+
+    def finish(self):
+        """Stop measuring and pass the results to the callback; returns them"""
+        if self._finished is None:
+            self._finished = time.perf_counter()
+            if self._own_tracing:
+                tracemalloc.stop()
+                self._own_tracing = False
+        result = self.as_dict()
+        if self.callback is not None:
+            self.callback(result)
+        return result
+
+    def as_dict(self):
+        """The measurements as a dict: total seconds and the stages in the order they first ran"""
+        end = self._finished if self._finished is not None else time.perf_counter()
+        return {
+            'total_seconds': end - self._started,
+            'stages': {name: stage.as_dict() for name, stage in self.stages.items()},
+        }
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def add(self, **counts):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class NullStats:
+    """Stand-in for Stats when instrumentation is off; every call is a no-op"""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+    def iterate(self, name, iterable):
+        return iterable
+
+    def finish(self):
+        return None
+
+    def as_dict(self):
+        return None
+
+
+NULL_STATS = NullStats()
+
+
+def format_stats(result):
+    """Render the dict of Stats.as_dict() as a table"""
+    lines = [f"{'stage':<16} {'ms':>10} {'%':>6} {'calls':>7} {'alloc peak':>12}  counts"]
+    total = result['total_seconds'] or 1e-12
+    for name, stage in result['stages'].items():
+        counts = ', '.join(f"{key}={value}" for key, value in stage.items()
+                           if key not in ('seconds', 'calls', 'alloc_peak_bytes'))
+        alloc = stage.get('alloc_peak_bytes')
+        alloc = f"{alloc / 1024:.0f} KiB" if alloc is not None else '-'
+        lines.append(f"{name:<16} {stage['seconds'] * 1000:>10.1f} {stage['seconds'] / total:>6.1%} "
+                     f"{stage['calls']:>7} {alloc:>12}  {counts}")
+    lines.append(f"{'total':<16} {result['total_seconds'] * 1000:>10.1f}")
+    return '\n'.join(lines)
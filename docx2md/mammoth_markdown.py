@@ -0,0 +1,264 @@
+import inspect
+import io
+import os
+import re
+import sys
+from html.parser import HTMLParser
+
+from .docx_to_html_markdown import (ConversionError, TableCollector, _cell_texts,
+                                    iter_finished_markdown, make_html2text, split_tables_from_html)
+from .image_policy import DEFAULT_IMAGE_POLICY, MEDIA_DIR_NAME, check_image_policy, image_converter
+from .instrumentation import NULL_STATS
+from .markdown_writer import MarkdownWriter
+
+# mammoth and html2text are imported where they are used
+
+# Name under which the writer of every image policy is registered as a mammoth output format
+OUTPUT_FORMAT = 'docx_to_markdown_events_{}'
+
+# Characters mammoth's HTML writer escapes in text, and the entities it uses
+ESCAPED_RE = re.compile(r'([&<>"])')
+ENTITIES = {'&': 'amp', '<': 'lt', '>': 'gt', '"': 'quot'}
+
+# HTML elements without an end tag
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
+
+# html2text internals MarkdownEventWriter calls, with the number of arguments it passes
+HTML2TEXT_HOOKS = {'handle_tag': 3, 'handle_data': 1, 'handle_entityref': 1, 'finish': 0, 'optwrap': 1}
+
+
+class _EventReplayer(HTMLParser):
+    """Parses raw HTML into the text(), start(), end() and self_closing() calls of a writer"""
+
+    def __init__(self, writer):
+        super().__init__(convert_charrefs=True)
+        self._writer = writer
+
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: value or '' for name, value in attrs}
+        if tag in VOID_ELEMENTS:
+            self._writer.self_closing(tag, attributes)
+        else:
+            self._writer.start(tag, attributes)
+
+    def handle_startendtag(self, tag, attrs):
+        self._writer.self_closing(tag, {name: value or '' for name, value in attrs})
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_ELEMENTS:
+            self._writer.end(tag)
+
+    def handle_data(self, data):
+        self._writer.text(data)
+
+
+class MarkdownEventWriter:
+    """mammoth writer that hands the elements of a document straight to html2text
+
+    mammoth walks its document model and calls text(), start(), end() and
+    self_closing() with the HTML elements its style map produces. Instead of
+    serializing them, they are passed to html2text's tag and data handlers
+    in the same calls html2text's parser would make on mammoth's HTML: text
+    between tags is delivered in one piece, split at the characters mammoth
+    escapes, which html2text receives as entities. Top-level tables are
+    collected with TableCollector and replaced by placeholders, as
+    docx_to_html_markdown.split_tables_from_html does. The Markdown is the
+    same as the HTML backend's, without writing or parsing the HTML.
+    as_string() returns html2text's Markdown and the rows of every table.
+    mammoth creates writers without arguments, so there is one subclass per
+    image policy (see writer_for).
+    """
+
+    image_policy = DEFAULT_IMAGE_POLICY
+
+    def __init__(self):
+        self._converter = make_html2text(self.image_policy)
+        self._converter.start = True
+        self._tables = TableCollector()
+        self._text = []  # prose text since the last tag
+        self._cell_text = []  # table text since the last tag
+
+    def _flush(self):
+        if self._tables.in_table:
+            if self._cell_text:
+                self._tables.handle_data(''.join(self._cell_text))
+                self._cell_text = []
+            return
+        if not self._text:
+            return
+        text = ''.join(self._text)
+        self._text = []
+        for index, part in enumerate(ESCAPED_RE.split(text)):
+            if index % 2:
+                self._converter.handle_entityref(ENTITIES[part])
+            elif part:
+                self._converter.handle_data(part)
+
+    def text(self, text):
+        (self._cell_text if self._tables.in_table else self._text).append(text)
+
+    def start(self, name, attributes=None):
+        if name == 'table' and not self._tables.in_table:
+            # The prose around a table is one piece of text with its placeholder
+            self._placeholder = f'TABLE_PLACEHOLDER_{len(self._tables.tables)}'
+        else:
+            self._flush()
+        if self._tables.in_table or name == 'table':
+            self._tables.handle_starttag(name, attributes)
+        else:
+            # html2text changes the attributes it is given
+            self._converter.handle_tag(name, dict(attributes or {}), True)
+
+    def end(self, name):
+        self._flush()
+        if self._tables.in_table:
+            self._tables.handle_endtag(name)
+            if not self._tables.in_table:
+                self._text.append(self._placeholder)
+        else:
+            self._converter.handle_tag(name, {}, False)
+
+    def self_closing(self, name, attributes=None):
+        self.start(name, attributes)
+        self.end(name)
+
+    def append(self, html):
+        # Raw HTML (mammoth's own conversion never writes any) is parsed into writer calls
+        replayer = _EventReplayer(self)
+        replayer.feed(html)
+        replayer.close()
+
+    def as_string(self):
+        self._flush()
+        return self._converter.optwrap(self._converter.finish()), _cell_texts(self._tables.tables)
+
+
+def drives_html2text(converter):
+    """Check that an html2text converter has the handlers MarkdownEventWriter calls
+
+    They are not part of html2text's public API: every hook must take the
+    arguments it is given, and the converter must have the start flag
+    handle() sets before parsing.
+    """
+    if not hasattr(converter, 'start'):
+        return False
+    for name, arg_count in HTML2TEXT_HOOKS.items():
+        hook = getattr(converter, name, None)
+        if not callable(hook):
+            return False
+        try:
+            inspect.signature(hook).bind(*[None] * arg_count)
+        except (TypeError, ValueError):
+            return False
+    return True
+
+
+def writer_for(image_policy):
+    """Register the writer of an image policy with mammoth; returns its output format name
+
+    mammoth has no public way to add a writer, so it goes into the registry
+    mammoth.writers.writer() picks writers from. Returns None when this
+    version of mammoth has no such registry, or when html2text lacks the
+    handlers the writer calls (see drives_html2text).
+    """
+    from mammoth import writers
+
+    if not drives_html2text(make_html2text(image_policy)):
+        return None
+    registry = getattr(writers, '_writers', None)
+    if not isinstance(registry, dict) or not callable(getattr(writers, 'writer', None)):
+        return None
+    output_format = OUTPUT_FORMAT.format(image_policy)
+    if output_format not in registry:
+        registry[output_format] = type(f'MarkdownEventWriter_{image_policy}', (MarkdownEventWriter,),
+                                       {'image_policy': image_policy})
+    return output_format
+
+
+def convert_docx(docx_file, stats=NULL_STATS, image_policy=DEFAULT_IMAGE_POLICY, media_dir=MEDIA_DIR_NAME,
+                 relative_to='.'):
+    """Convert a DOCX binary file object with mammoth; returns html2text's Markdown and the tables
+
+    image_policy, media_dir and relative_to are passed to
+    image_policy.image_converter. If the writer cannot be registered with
+    mammoth or cannot drive html2text, the document goes through mammoth's
+    HTML like the html backend.
+    """
+    import mammoth
+
+    check_image_policy(image_policy)
+    convert_image = image_converter(image_policy, media_dir, relative_to)
+    output_format = writer_for(image_policy)
+    with stats.stage('mammoth_html2text') as stage:
+        if output_format is not None:
+            markdown, tables = mammoth.convert(docx_file, output_format=output_format,
+                                               convert_image=convert_image).value
+        else:
+            prose_html, tables = split_tables_from_html(
+                mammoth.convert_to_html(docx_file, convert_image=convert_image).value)
+            markdown = make_html2text(image_policy).handle(prose_html)
+        stage.add(bytes_out=len(markdown), elements=len(tables))
+    return markdown, tables
+
+
+def iter_markdown_pieces(source, stats=NULL_STATS, pad_tables=True, table_workers=None,
+                         image_policy=DEFAULT_IMAGE_POLICY, media_dir=MEDIA_DIR_NAME, relative_to='.'):
+    """Convert a DOCX path, bytes or binary file object, yielding the Markdown in pieces
+
+    pad_tables and table_workers are passed to format_tables(); image_policy,
+    media_dir and relative_to to image_policy.image_converter.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    options = (stats, image_policy, media_dir, relative_to)
+    try:
+        if hasattr(source, 'read'):
+            markdown, tables = convert_docx(source, *options)
+        else:
+            with open(source, 'rb') as docx_file:
+                markdown, tables = convert_docx(docx_file, *options)
+        yield from iter_finished_markdown(markdown, tables, stats, pad_tables, table_workers)
+    except Exception as e:
+        raise ConversionError(f"Error converting DOCX to Markdown: {str(e)}") from e
+
+
+def convert_docx_to_markdown(source, pad_tables=True, table_workers=None,
+                             image_policy=DEFAULT_IMAGE_POLICY, media_dir=MEDIA_DIR_NAME):
+    """Convert a DOCX path, bytes or binary file object to a Markdown string"""
+    return ''.join(iter_markdown_pieces(source, pad_tables=pad_tables, table_workers=table_workers,
+                                        image_policy=image_policy, media_dir=media_dir))
+
+
+def convert(input_path, output_path=None, stats=NULL_STATS, pad_tables=True, table_workers=None,
+            image_policy=DEFAULT_IMAGE_POLICY, media_dir=None):
+    """Convert a DOCX file to Markdown, writing it to output_path; returns a preview
+
+    With image_policy 'extract', images go to media_dir, by default 'media'
+    next to the output.
+    """
+    if output_path is None:
+        output_path = os.path.splitext(input_path)[0] + '.md'
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    if media_dir is None:
+        media_dir = os.path.join(output_dir, MEDIA_DIR_NAME)
+    with stats.stage('write') as stage, MarkdownWriter(output_path) as writer:
+        writer.write_all(iter_markdown_pieces(input_path, stats, pad_tables, table_workers,
+                                              image_policy, media_dir, output_dir))
+        stage.add(chars_out=writer.chars_written)
+    stats.finish()
+    return writer.preview
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python -m docx2md.mammoth_markdown <input_file> [output_file]")
+        sys.exit(1)
+
+    input_file = sys.argv[1]
+    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    try:
+        convert(input_file, output_file)
+    except ConversionError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    print(f"Markdown saved to {output_file or os.path.splitext(input_file)[0] + '.md'}")
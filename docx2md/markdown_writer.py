@@ -0,0 +1,227 @@
+import glob
+import gzip
+import io
+import os
+import re
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+
+PREVIEW_LINES = 10
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.zst': 'zstd'}
+
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# Temporary files are created private; the output gets the mode a new file
+# would get (or keeps the mode of the file it replaces)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def compression_for(output_path):
+    """Guess the compression of an output file from its suffix"""
+    for suffix, compression in COMPRESSION_SUFFIXES.items():
+        if str(output_path).endswith(suffix):
+            return compression
+    return None
+
+
+def _open_zstd(output_path):
+    """Open a zstd-compressed binary sink, with the stdlib module or zstandard"""
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd.open(output_path, 'wb')
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd output requires Python 3.14+ or the 'zstandard' package")
+    return zstandard.ZstdCompressor().stream_writer(open(output_path, 'wb'), closefd=True)
+
+
+def temporary_path_for(output_path):
+    """Create the file to write output_path to before moving it in place, or return None
+
+    The file has a unique name next to output_path, so writers of the same
+    output, in this process or others, never share it. Outputs that exist
+    and are not regular files (/dev/stdout, a named pipe) are written
+    directly, since they cannot be replaced.
+    """
+    mode = 0o666 & ~_UMASK
+    try:
+        st = os.stat(output_path)
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        mode = stat.S_IMODE(st.st_mode)
+    except OSError:
+        pass
+    path = Path(output_path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        os.chmod(tmp_path, mode)
+    finally:
+        os.close(fd)
+    return Path(tmp_path)
+
+
+def remove_temporaries(output_path):
+    """Remove the temporary files of output_path left by writers that were killed
+
+    Only call it when no writer of output_path is running.
+    """
+    path = Path(output_path)
+    for tmp_path in path.parent.glob(glob.escape(path.name) + '.*.tmp'):
+        _discard(tmp_path)
+
+
+def _discard(tmp_path):
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
+@contextmanager
+def atomic_output(output_path):
+    """Yield the path to write output_path to; the output only appears if the block succeeds
+
+    The data goes to a temporary file in the same directory, which replaces
+    output_path at the end, so a failed run leaves the previous output.
+    """
+    tmp_path = temporary_path_for(output_path)
+    if tmp_path is None:
+        yield output_path
+        return
+    try:
+        yield tmp_path
+    except BaseException:
+        _discard(tmp_path)
+        raise
+    os.replace(tmp_path, output_path)
+
+
+def open_sink(output_path, compression=None):
+    """Open a UTF-8 text sink for output_path, optionally compressed"""
+    if compression is None:
+        return open(output_path, 'w', encoding='utf-8')
+    if compression == 'gzip':
+        return gzip.open(output_path, 'wt', encoding='utf-8')
+    if compression == 'zstd':
+        return io.TextIOWrapper(_open_zstd(output_path), encoding='utf-8')
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+class MarkdownWriter:
+    """Write Markdown incrementally, keeping only a short preview in memory
+
+    Pieces are written as they arrive, to a temporary file next to
+    output_path that replaces it when the writer is closed. Used as a
+    context manager, an exception discards it and leaves the previous output.
+    The first preview_lines lines are kept so callers can show a preview
+    without reading the output back.
+    """
+
+    def __init__(self, output_path, compression='auto', preview_lines=PREVIEW_LINES):
+        if compression == 'auto':
+            compression = compression_for(output_path)
+        self.output_path = output_path
+        self.preview_lines = preview_lines
+        self.chars_written = 0
+        self._preview = []
+        self._preview_newlines = 0
+        self._tmp_path = temporary_path_for(output_path)
+        try:
+            self._sink = open_sink(self._tmp_path or output_path, compression)
+        except BaseException:
+            if self._tmp_path is not None:
+                _discard(self._tmp_path)
+            raise
+
+    def write(self, text):
+        """Write a piece of Markdown"""
+        if not text:
+            return
+        self._sink.write(text)
+        self.chars_written += len(text)
+
+        if self._preview_newlines < self.preview_lines:
+            self._preview.append(text)
+            self._preview_newlines += text.count('\n')
+
+    def write_all(self, pieces):
+        """Write every piece of an iterable"""
+        for piece in pieces:
+            self.write(piece)
+
+    @property
+    def preview(self):
+        """The first preview_lines lines written"""
+        return '\n'.join(''.join(self._preview).split('\n')[:self.preview_lines])
+
+    def close(self, discard=False):
+        """Finish the output, or drop it with discard=True"""
+        if self._sink.closed:
+            return
+        try:
+            self._sink.close()
+        except BaseException:
+            discard = True
+            raise
+        finally:
+            if self._tmp_path is not None:
+                if discard:
+                    _discard(self._tmp_path)
+                else:
+                    os.replace(self._tmp_path, self.output_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(discard=exc_type is not None)
+
+
+def write_markdown(pieces, output_path, compression='auto', preview_lines=PREVIEW_LINES):
+    """Stream pieces of Markdown to output_path and return the preview"""
+    with MarkdownWriter(output_path, compression, preview_lines) as writer:
+        writer.write_all(pieces)
+    return writer.preview
+
+
+def iter_file_chunks(f, size=1 << 16):
+    """Yield an open text file in chunks and close it"""
+    with f:
+        for chunk in iter(lambda: f.read(size), ''):
+            yield chunk
+
+
+def join_blocks(blocks, separator='\n\n'):
+    """Yield blocks with separator between them, like separator.join(blocks)"""
+    for i, block in enumerate(blocks):
+        if i:
+            yield separator
+        yield block
+
+
+def collapse_blank_lines(pieces):
+    """Streaming equivalent of re.sub(r'\\n{3,}', '\\n\\n', ''.join(pieces))
+
+    Newlines at the end of a piece are held back and merged with the next
+    one, so runs of newlines that span pieces are collapsed as well.
+    """
+    newlines = 0
+    for piece in pieces:
+        stripped = piece.lstrip('\n')
+        newlines += len(piece) - len(stripped)
+        if not stripped:
+            continue
+
+        body = stripped.rstrip('\n')
+        yield ('\n' * newlines if newlines < 3 else '\n\n') + _BLANK_LINES_RE.sub('\n\n', body)
+        newlines = len(stripped) - len(body)
+
+    if newlines:
+        yield '\n' * newlines if newlines < 3 else '\n\n'
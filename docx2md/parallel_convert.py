@@ -0,0 +1,147 @@
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+from . import docs_to_markdown
+from .docx_stream import DOCUMENT_PART, open_docx
+from .incremental_convert import read_styles_part, render_blocks, split_body
+from .instrumentation import NULL_STATS
+from .markdown_writer import MarkdownWriter
+
+# python-docx is only imported by the processes that render chunks
+
+# Documents with fewer top-level blocks are converted in one process
+PARALLEL_MIN_BLOCKS = 2000
+# Chunks per worker, so that a slow chunk does not leave the other workers idle
+CHUNKS_PER_WORKER = 4
+
+
+def _paragraph_properties(xml, prefix, start, end):
+    """Byte range of the <w:pPr> of the paragraph at xml[start:end], or None"""
+    ppr = xml.find(b'<' + prefix + b'pPr', start, end)
+    # pPr is the first child of a paragraph; a later one belongs to a nested paragraph
+    if ppr < 0 or xml.find(b'<' + prefix + b'r', start, ppr) >= 0:
+        return None
+    ppr_end = xml.find(b'</' + prefix + b'pPr>', ppr, end)
+    return (ppr, ppr_end) if ppr_end >= 0 else None
+
+
+def boundary_kinds(xml, prefix, blocks, levels):
+    """Classify every block as a place to cut the body into chunks
+
+    Returns a list with, for every block, 'heading' for paragraphs with a
+    heading style (a chunk may start before them), 'section' for the
+    paragraphs that end a section (a chunk may start after them) and None
+    otherwise. levels is the table of docs_to_markdown.style_heading_levels().
+    """
+    style_re = re.compile(rb'<' + prefix + rb'pStyle\b[^>]*?' + prefix + rb'val="([^"]*)"')
+    sect_pr = b'<' + prefix + b'sectPr'
+    kinds = []
+    for kind, start, end in blocks:
+        ppr = _paragraph_properties(xml, prefix, start, end) if kind == b'p' else None
+        if ppr is None:
+            kinds.append(None)
+            continue
+        if xml.find(sect_pr, *ppr) >= 0:
+            kinds.append('section')
+            continue
+        style = style_re.search(xml, *ppr)
+        level = levels.get(style.group(1).decode('utf-8')) if style else None
+        kinds.append('heading' if level else None)
+    return kinds
+
+
+def split_chunks(blocks, kinds, chunks):
+    """Cut the blocks into at most about chunks runs of consecutive blocks, by size
+
+    Once a chunk has reached its share of the body, it ends before the next
+    heading or after the next section break. Without either within another
+    share, it ends where it is. Returns (first, last + 1) block index pairs.
+    """
+    if not blocks:
+        return []
+    target = max(1, (blocks[-1][2] - blocks[0][1]) // max(1, chunks))
+    ranges = []
+    first = 0
+    size = 0
+    for index, (_, start, end) in enumerate(blocks):
+        if size >= target and index > first:
+            if kinds[index] == 'heading' or kinds[index - 1] == 'section' or size >= 2 * target:
+                ranges.append((first, index))
+                first, size = index, 0
+        size += end - start
+    ranges.append((first, len(blocks)))
+    return ranges
+
+
+def render_chunk(fragments, root_tag, prefix, styles_xml):
+    """Render the XML of a run of consecutive top-level blocks to Markdown
+
+    fragments holds the XML of each block on its own: the bookmarks,
+    content controls and custom XML between blocks are not sent, as the
+    serial conversion skips them too.
+    """
+    return ''.join(render_blocks(fragments, root_tag, prefix, styles_xml))
+
+
+def _render_chunk(args):
+    return render_chunk(*args)
+
+
+def iter_markdown_pieces(input_path, workers=None, chunks=None, stats=NULL_STATS):
+    """Convert a DOCX file like docs_to_markdown, rendering chunks of the body in parallel
+
+    The top-level blocks of document.xml are cut into chunks, preferably
+    before headings and after section breaks, and the chunks are rendered
+    in a pool of workers processes (os.cpu_count() by default). The Markdown
+    of every block only depends on the block and the styles, so the chunks
+    are independent and the pieces, yielded in document order, join up to
+    the output of docs_to_markdown.
+    """
+    workers = workers or os.cpu_count() or 1
+    with stats.stage('read') as stage:
+        with open_docx(input_path) as docx:
+            xml = docx.read(DOCUMENT_PART)
+            styles_xml = read_styles_part(docx)
+        stage.add(bytes_in=len(xml))
+
+    with stats.stage('split') as stage:
+        root_tag, prefix, blocks = split_body(xml)
+        if workers <= 1 or len(blocks) < PARALLEL_MIN_BLOCKS:
+            ranges = [(0, len(blocks))] if blocks else []
+        else:
+            levels = docs_to_markdown.style_heading_levels(ET.fromstring(styles_xml)) if styles_xml else {}
+            kinds = boundary_kinds(xml, prefix, blocks, levels)
+            ranges = split_chunks(blocks, kinds, chunks or workers * CHUNKS_PER_WORKER)
+        jobs = [([xml[start:end] for _, start, end in blocks[first:last]], root_tag, prefix, styles_xml)
+                for first, last in ranges]
+        stage.add(elements=len(jobs))
+    del xml
+
+    if len(jobs) <= 1:
+        yield from stats.iterate('render', map(_render_chunk, jobs))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        yield from stats.iterate('render', executor.map(_render_chunk, jobs))
+
+
+def convert(input_path, output_path, workers=None, chunks=None, stats=NULL_STATS):
+    """Convert a DOCX file to Markdown in parallel, writing it to output_path; returns a preview"""
+    with stats.stage('write') as stage, MarkdownWriter(output_path) as writer:
+        writer.write_all(iter_markdown_pieces(input_path, workers, chunks, stats))
+        stage.add(chars_out=writer.chars_written)
+    stats.finish()
+    return writer.preview
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("Usage: python -m docx2md.parallel_convert <input_file> <output_file> [workers]")
+        sys.exit(1)
+
+    convert(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else None)
+    print(f"Markdown saved to {sys.argv[2]}")
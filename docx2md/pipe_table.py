@@ -0,0 +1,217 @@
+import math
+import re
+from itertools import zip_longest
+
+
+# Cell types in order of generality, as tabulate deduces them
+NONE, BOOL, INT, FLOAT, STR = range(5)
+
+MIN_PADDING = 2
+THOUSANDS_RE = re.compile(r'^(([+-]?[0-9]{1,3})(?:,([0-9]{3}))*)?(?(1)\.[0-9]*|\.[0-9]+)?$')
+
+# Cells tabulate treats specially: ANSI escape sequences are invisible, line
+# breaks make multiline rows and a cell holding only \x01 marks a separating
+# line. Tables with them are handed to tabulate itself.
+_SPECIAL_CHARS = ('\x1b', '\n', '\r')
+_SEPARATING_LINE = '\x01'
+
+_wcswidth = None
+
+
+def _is_float(string):
+    try:
+        value = float(string)
+    except ValueError:
+        return False
+    return not (math.isinf(value) or math.isnan(value)) or string.lower() in ('inf', '-inf', 'nan')
+
+
+def _is_int(string):
+    try:
+        int(string)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_thousands(string):
+    return THOUSANDS_RE.match(string) is not None
+
+
+def cell_type(string):
+    """The type tabulate deduces for a cell string"""
+    if not string:
+        return NONE
+    if string == 'True' or string == 'False':
+        return BOOL
+    if _is_int(string) or ('.' not in string and _is_thousands(string)):
+        return INT
+    if _is_float(string) or _is_thousands(string):
+        return FLOAT
+    return STR
+
+
+def _format_float(string):
+    if ',' in string:
+        string = string.replace(',', '')
+    try:
+        return format(float(string), 'g')
+    except ValueError:
+        return string
+
+
+def _after_point(string):
+    """Digits after the decimal point of a number, or -1"""
+    if _is_float(string) or _is_thousands(string):
+        if _is_int(string):
+            return -1
+        pos = string.rfind('.')
+        if pos < 0:
+            pos = string.lower().rfind('e')
+        return len(string) - pos - 1 if pos >= 0 else -1
+    return -1
+
+
+def _width(string):
+    """Display width of a string, counting wide characters twice when wcwidth is available"""
+    global _wcswidth
+    if string.isascii() and string.isprintable():
+        return len(string)
+    if _wcswidth is None:
+        try:
+            from wcwidth import wcswidth
+        except ImportError:
+            wcswidth = len
+        _wcswidth = wcswidth
+    return _wcswidth(string)
+
+
+def _needs_tabulate(rows):
+    for row in rows:
+        for cell in row:
+            if any(char in cell for char in _SPECIAL_CHARS):
+                return True
+    # tabulate drops separating-line rows, judged on their first two cells
+    return any(cell.strip() == _SEPARATING_LINE for row in rows[1:] for cell in row[:2])
+
+
+def _separator(widths, aligns):
+    """The line below the header, with colons showing the alignment of each column"""
+    segments = []
+    for width, align in zip(widths, aligns):
+        if align == 'decimal':
+            segments.append('-' * (width + 1) + ':')
+        elif align == 'left':
+            segments.append(':' + '-' * (width + 1))
+        else:
+            segments.append('-' * (width + 2))
+    return '|' + '|'.join(segments) + '|'
+
+
+def render_pipe_table(rows, pad=True):
+    """Render rows of strings as a Markdown pipe table, the first row being the header
+
+    With pad, the result is identical to ``tabulate(rows, headers="firstrow",
+    tablefmt="pipe")``: numeric columns are right aligned on the decimal
+    point, floats are normalised with the 'g' format and every column is
+    padded to its widest cell. Cell types and column widths are worked out
+    from the strings in one pass per column, without building a number per
+    cell. Without pad, the same cells are written unpadded and the separator
+    row only shows the alignment, which keeps large tables small.
+    """
+    if _needs_tabulate(rows):
+        from tabulate import tabulate
+        return tabulate(rows, headers="firstrow", tablefmt="pipe")
+
+    if not rows:
+        return ''
+    headers = [str(cell) for cell in rows[0]]
+    data = rows[1:]
+    if headers and data:
+        headers = [''] * max(0, len(data[0]) - len(headers)) + headers
+
+    # Columns beyond the header are dropped, as tabulate does
+    columns = list(zip_longest(*data))
+    if headers:
+        columns = columns[:len(headers)]
+
+    formatted = []
+    aligns = []
+    for column in columns:
+        kind = BOOL
+        for cell in column:
+            if cell is not None:
+                kind = max(kind, cell_type(cell))
+                if kind == STR:
+                    break
+        if kind == FLOAT:
+            column = [_format_float(cell) if cell else '' for cell in column]
+            aligns.append('decimal')
+        elif kind == INT:
+            column = [cell or '' for cell in column]
+            aligns.append('decimal')
+        else:
+            column = [cell.strip() if cell else '' for cell in column]
+            aligns.append('left')
+        formatted.append(column)
+
+    if not pad:
+        return _render_compact(headers, formatted, aligns)
+
+    # Decimal columns are aligned on the point; then every column is padded
+    # to its widest cell, and at least to its header plus MIN_PADDING
+    widths = []
+    for index, align in enumerate(aligns):
+        column = formatted[index]
+        if align == 'decimal':
+            decimals = [_after_point(cell) for cell in column]
+            most = max(decimals)
+            column = formatted[index] = [cell + ' ' * (most - decs)
+                                         for cell, decs in zip(column, decimals)]
+        width = max(_width(cell) for cell in column)
+        if headers:
+            width = max(width, _width(headers[index]) + MIN_PADDING)
+        widths.append(width)
+
+    lines = []
+    if headers:
+        if columns:
+            header_aligns = aligns
+        else:
+            # A header without any data rows
+            widths = [_width(header) + MIN_PADDING for header in headers]
+            header_aligns = ['left'] * len(headers)
+        cells = []
+        for header, align, width in zip(headers, header_aligns, widths):
+            width += len(header) - _width(header)
+            cells.append(header.ljust(width) if align == 'left' else header.rjust(width))
+        lines.append('| ' + ' | '.join(cells) + ' |')
+        lines.append(_separator(widths, aligns or [None] * len(widths)))
+    elif columns:
+        # Without a header the separator goes on top
+        lines.append(_separator(widths, aligns))
+
+    for row in zip(*formatted):
+        cells = []
+        for cell, align, width in zip(row, aligns, widths):
+            width += len(cell) - _width(cell)
+            cells.append(cell.rjust(width) if align == 'decimal' else cell.ljust(width))
+        lines.append('| ' + ' | '.join(cells) + ' |')
+
+    return '\n'.join(lines)
+
+
+def _render_compact(headers, columns, aligns):
+    """Pipe table without width padding"""
+    lines = []
+    if columns:
+        headers = headers[:len(columns)]
+    if headers:
+        lines.append('| ' + ' | '.join(headers) + ' |')
+    if aligns:
+        lines.append('|' + '|'.join(':---' if align == 'left' else '---:' for align in aligns) + '|')
+    elif headers:
+        lines.append('|' + '|'.join('---' for _ in headers) + '|')
+    for row in zip(*columns):
+        lines.append('| ' + ' | '.join(row) + ' |')
+    return '\n'.join(lines)
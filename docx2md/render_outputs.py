@@ -0,0 +1,167 @@
+import os
+import sys
+from operator import attrgetter
+
+from .docs_to_markdown import clean_text, format_paragraph, table_markdown
+from .document_model import (ContentControl, Paragraph, cell_docx_text, iter_flat, paragraph_docx_text,
+                             read_document, save_document)
+from .docx_stream import Table
+from .extract_text_docx2python import iter_block_markdown, iter_postprocessed, labeled_table, with_list_label
+from .instrumentation import NULL_STATS
+from .markdown_writer import MarkdownWriter
+from .table_model import CompactTable, StringPool, write_tables
+
+# Outputs written when none are asked for, the Markdown under the names the
+# separate scripts use. The table data only holds the real tables of the
+# document, unlike tables_data.json of extract_tables, hence its own name.
+# 'plain' is only written on request.
+DEFAULT_OUTPUTS = {
+    'docx': 'output.md',
+    'text': 'output_docx2python.md',
+    'tables': 'document_tables.json',
+}
+
+
+def iter_docx_markdown(document):
+    """Markdown of docs_to_markdown: paragraphs with headings and tables, in document order
+
+    Content controls are left out and paragraphs read as python-docx reads
+    them, so the output is the same as docs_to_markdown's.
+    """
+    for block in document.blocks:
+        if isinstance(block, Paragraph):
+            text = clean_text(paragraph_docx_text(block))
+            if text:
+                yield format_paragraph(text, block.heading)
+        elif isinstance(block, Table):
+            texts = {id(cell): cell_docx_text(cell) for cell in block.cells}
+            yield table_markdown([texts[id(cell)] for cell in block.positions(index)]
+                                 for index in range(len(block.rows)))
+
+
+def iter_text_markdown(document, stats=NULL_STATS):
+    """Markdown of extract_text_docx2python: paragraph text with links and list labels, then the tables"""
+    blocks = (labeled_table(block, attrgetter('list_label'), iter_flat) if isinstance(block, Table)
+              else with_list_label(block, block.list_label)
+              for block in iter_flat(document.blocks))
+    return iter_postprocessed(iter_block_markdown(blocks, stats))
+
+
+def iter_plain_text(document):
+    """Plain text: paragraphs, list items with their markers and tables as tab-separated rows"""
+    counters = {}  # numId -> item count at every level
+    after_list = False
+    for block in iter_flat(document.blocks):
+        if isinstance(block, Table):
+            rows = []
+            for row in block.rows:
+                cells = [' '.join(cell.text.split()) for cell in row]
+                if any(cells):
+                    rows.append('\t'.join(cells))
+            if rows:
+                yield ('\n' if after_list else '') + '\n'.join(rows) + '\n\n'
+                after_list = False
+            continue
+
+        text = block.text.strip()
+        if not text:
+            continue
+        item = block.list_item
+        if item is None:
+            yield ('\n' if after_list else '') + text + '\n\n'
+            after_list = False
+            continue
+
+        counts = counters.setdefault(item.num_id, [])
+        del counts[item.level + 1:]  # deeper levels start again
+        counts.extend([0] * (item.level + 1 - len(counts)))
+        counts[item.level] += 1
+        marker = f'{counts[item.level]}.' if item.ordered else '-'
+        yield '  ' * item.level + marker + ' ' + text + '\n'
+        after_list = True
+
+
+def iter_compact_tables(document, pool):
+    """Yield a CompactTable for every table with text, nested ones after the table they are in
+
+    Each cell appears once in every row it covers, with its whitespace
+    collapsed; empty cells, empty rows and repeated rows are left out.
+    """
+    stack = [iter(document.blocks)]
+    while stack:
+        block = next(stack[-1], None)
+        if block is None:
+            stack.pop()
+        elif isinstance(block, ContentControl):
+            stack.append(iter(block.blocks))
+        elif isinstance(block, Table):
+            table = CompactTable(pool)
+            for row in block.rows:
+                texts = [text for text in (' '.join(cell.text.split()) for cell in row) if text]
+                if texts:
+                    table.add_row(texts)
+            table.freeze()
+            if len(table):
+                yield table
+            # The blocks of the cells, pushed so that the first cell is visited first
+            stack.extend(iter(cell.blocks) for cell in reversed(block.cells))
+
+
+# renderer name -> function of a Document yielding pieces of text
+RENDERERS = {
+    'docx': iter_docx_markdown,
+    'text': iter_text_markdown,
+    'plain': iter_plain_text,
+}
+OUTPUT_NAMES = (*RENDERERS, 'tables')
+
+
+def render_document(document, outputs, stats=NULL_STATS, table_format=None):
+    """Write the outputs of a Document; outputs maps renderer names to output paths
+
+    Besides the names of RENDERERS, 'tables' writes the table data with
+    table_model.write_tables, in table_format or the format of its suffix.
+    Returns the number of tables written, or None without a tables output.
+    """
+    unknown = set(outputs) - set(OUTPUT_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown outputs {', '.join(sorted(unknown))}, expected some of {', '.join(OUTPUT_NAMES)}")
+
+    count = None
+    for name, output_path in outputs.items():
+        if name == 'tables':
+            with stats.stage('tables') as stage:
+                count = write_tables(iter_compact_tables(document, StringPool()), output_path, table_format)
+                stage.add(elements=count)
+            continue
+        with stats.stage(f'write_{name}') as stage, MarkdownWriter(output_path) as writer:
+            writer.write_all(stats.iterate(name, RENDERERS[name](document)))
+            stage.add(chars_out=writer.chars_written)
+    return count
+
+
+def convert(source, outputs, stats=NULL_STATS, table_format=None, model_path=None):
+    """Parse a DOCX (or a saved document model) once and write every output of outputs
+
+    With model_path, the document model is also saved there, so that later
+    runs can render from it without parsing the DOCX again.
+    """
+    document = read_document(source, stats)
+    if model_path is not None:
+        with stats.stage('save_model'):
+            save_document(document, model_path)
+    count = render_document(document, outputs, stats, table_format)
+    stats.finish()
+    return count
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python -m docx2md.render_outputs <input_file> [output_dir]")
+        sys.exit(1)
+
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else '.'
+    outputs = {name: os.path.join(output_dir, path) for name, path in DEFAULT_OUTPUTS.items()}
+    convert(sys.argv[1], outputs)
+    for name, path in outputs.items():
+        print(f"{name} output saved to {path}")
@@ -0,0 +1,227 @@
+import json
+from array import array
+
+from .markdown_writer import atomic_output
+
+
+# Array type code of string ids and row offsets (unsigned, at least 32 bits)
+ID_TYPE = 'I'
+
+TABLE_FORMATS = ('json', 'jsonl', 'parquet')
+FORMAT_SUFFIXES = {'.jsonl': 'jsonl', '.parquet': 'parquet'}
+
+
+class StringPool:
+    """Interned cell texts, shared by the tables of a document
+
+    Every distinct text is stored once and referred to by its index.
+    """
+
+    __slots__ = ('ids', 'strings')
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, text):
+        """Return the id of text, adding it to the pool if it is new"""
+        index = self.ids.get(text)
+        if index is None:
+            index = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+    def __getitem__(self, index):
+        return self.strings[index]
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class CompactTable:
+    """A table kept as string ids in two flat arrays
+
+    Row i is made of the ids cells[offsets[i]:offsets[i + 1]], which point
+    into pool. add_row() skips rows equal to an earlier one: rows are
+    indexed by a hash of their ids and only compared cell by cell when the
+    hashes match, so no copy of the rows is kept for deduplication. freeze()
+    drops that index once the table is complete.
+    """
+
+    __slots__ = ('pool', 'cells', 'offsets', '_hashes')
+
+    def __init__(self, pool=None):
+        self.pool = pool if pool is not None else StringPool()
+        self.cells = array(ID_TYPE)
+        self.offsets = array(ID_TYPE, [0])
+        self._hashes = {}  # row hash -> row index, or list of them on collisions
+
+    def add_row(self, texts):
+        """Append a row of cell texts unless an identical row is already there; returns True if added"""
+        pool_ids, strings = self.pool.ids, self.pool.strings
+        ids = []
+        for text in texts:
+            index = pool_ids.get(text)
+            if index is None:
+                index = pool_ids[text] = len(strings)
+                strings.append(text)
+            ids.append(index)
+        key = hash(tuple(ids))
+        seen = self._hashes.get(key)
+        if seen is not None:
+            for index in (seen if isinstance(seen, list) else (seen,)):
+                if self.row_ids(index).tolist() == ids:
+                    return False
+
+        index = len(self.offsets) - 1
+        if seen is None:
+            self._hashes[key] = index
+        elif isinstance(seen, list):
+            seen.append(index)
+        else:
+            self._hashes[key] = [seen, index]
+        self.cells.extend(ids)
+        self.offsets.append(len(self.cells))
+        return True
+
+    def freeze(self):
+        """Release the deduplication index; no rows can be added afterwards"""
+        self._hashes = None
+
+    def row_ids(self, index):
+        return self.cells[self.offsets[index]:self.offsets[index + 1]]
+
+    def row(self, index):
+        """The cell texts of a row, as a list"""
+        strings = self.pool.strings
+        return [strings[i] for i in self.row_ids(index)]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def to_lists(self):
+        """The table as a list of rows, each a list of cell texts"""
+        return list(self)
+
+
+def format_for(output_path):
+    """Guess the table output format from the suffix of output_path"""
+    for suffix, table_format in FORMAT_SUFFIXES.items():
+        if str(output_path).endswith(suffix):
+            return table_format
+    return 'json'
+
+
+class _EncodedStrings:
+    """JSON encodings of the strings of string pools, each encoded once"""
+
+    def __init__(self):
+        self._pools = {}  # id(pool) -> (pool, encodings)
+
+    def __call__(self, pool):
+        """The list of encodings of pool, brought up to date"""
+        entry = self._pools.get(id(pool))
+        if entry is None:
+            entry = self._pools[id(pool)] = (pool, [])
+        encoded = entry[1]
+        if len(encoded) < len(pool.strings):
+            encoded.extend(json.dumps(text, ensure_ascii=False) for text in pool.strings[len(encoded):])
+        return encoded
+
+
+def write_json(tables, f):
+    """Write tables as one JSON array, formatted exactly like json.dump(..., indent=2)
+
+    Tables are written one row at a time, and every distinct cell text is
+    JSON-encoded only once.
+    """
+    encodings = _EncodedStrings()
+    count = 0
+    for table in tables:
+        encoded = encodings(table.pool)
+        f.write('[\n  ' if count == 0 else ',\n  ')
+        if not len(table):
+            f.write('[]')
+        for index in range(len(table)):
+            f.write('[\n    ' if index == 0 else ',\n    ')
+            ids = table.row_ids(index)
+            if ids:
+                f.write('[\n      ' + ',\n      '.join([encoded[i] for i in ids]) + '\n    ]')
+            else:
+                f.write('[]')
+        if len(table):
+            f.write('\n  ]')
+        count += 1
+    f.write('\n]' if count else '[]')
+    return count
+
+
+def write_jsonl(tables, f):
+    """Write one JSON object per line: {"table": index, "rows": [[cell, ...], ...]}"""
+    encodings = _EncodedStrings()
+    count = 0
+    for count, table in enumerate(tables, 1):
+        encoded = encodings(table.pool)
+        rows = ', '.join(['[' + ', '.join([encoded[i] for i in table.row_ids(index)]) + ']'
+                          for index in range(len(table))])
+        f.write(f'{{"table": {count - 1}, "rows": [{rows}]}}\n')
+    return count
+
+
+def write_parquet(tables, output_path):
+    """Write tables to Parquet in long form, one row group per table
+
+    Columns: table, row and column (int32) and text (string). Requires
+    pyarrow.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet output requires the 'pyarrow' package")
+
+    schema = pa.schema([('table', pa.int32()), ('row', pa.int32()),
+                        ('column', pa.int32()), ('text', pa.string())])
+    count = 0
+    with pq.ParquetWriter(str(output_path), schema) as writer:
+        for table in tables:
+            rows, columns = array('i'), array('i')
+            for index in range(len(table)):
+                width = table.offsets[index + 1] - table.offsets[index]
+                rows.extend([index] * width)
+                columns.extend(range(width))
+            strings = table.pool.strings
+            texts = [strings[i] for i in table.cells]
+            writer.write_table(pa.table([
+                pa.array([count] * len(texts), pa.int32()),
+                pa.array(rows, pa.int32()),
+                pa.array(columns, pa.int32()),
+                pa.array(texts, pa.string()),
+            ], schema=schema))
+            count += 1
+    return count
+
+
+def write_tables(tables, output_path, table_format=None):
+    """Stream an iterable of CompactTable to output_path; returns the number of tables
+
+    table_format is 'json' (the default, one indented array), 'jsonl' or
+    'parquet'; when None it is guessed from the suffix of output_path.
+    """
+    if table_format is None:
+        table_format = format_for(output_path)
+    if table_format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown table format: {table_format}")
+
+    # Tables are written as they are found, so a failed run must not replace the previous output
+    with atomic_output(output_path) as path:
+        if table_format == 'parquet':
+            return write_parquet(tables, path)
+        with open(path, 'w', encoding='utf-8') as f:
+            if table_format == 'jsonl':
+                return write_jsonl(tables, f)
+            return write_json(tables, f)
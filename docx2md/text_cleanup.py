@@ -0,0 +1,69 @@
+import re
+from collections import namedtuple
+
+
+# A regex substitution. requires is a literal that must occur in the text for
+# the pattern to match at all; when it is absent the pass is skipped.
+Sub = namedtuple('Sub', ['pattern', 'repl', 'flags', 'requires'])
+
+# A literal str.replace
+Replace = namedtuple('Replace', ['old', 'new'])
+
+# str.strip of the whole text
+Strip = namedtuple('Strip', [])
+
+
+def sub(pattern, repl, flags=0, requires=None):
+    """Declare a regex substitution rule"""
+    return Sub(pattern, repl, flags, requires)
+
+
+def replace(old, new):
+    """Declare a literal replacement rule"""
+    return Replace(old, new)
+
+
+def strip():
+    """Declare stripping of leading and trailing whitespace"""
+    return Strip()
+
+
+class Cleaner:
+    """Pre-compiled sequence of cleanup rules
+
+    Converters declare their rules once at import time; calling the cleaner
+    applies them in order without any per-call pattern compilation. Rules
+    with a required literal are skipped outright when it is missing, so
+    short texts usually take only a few substring checks.
+
+    Rules are deliberately not merged into alternations: re only uses its
+    fast literal-prefix search for patterns that start with a literal, so
+    one combined pass is slower than several separate ones.
+    """
+
+    def __init__(self, *rules):
+        self.rules = rules
+        self._steps = [self._compile(rule) for rule in rules]
+
+    @staticmethod
+    def _compile(rule):
+        if isinstance(rule, Sub):
+            compiled = re.compile(rule.pattern, rule.flags)
+            return ('sub', compiled, rule.repl, rule.requires)
+        if isinstance(rule, Replace):
+            return ('replace', rule.old, rule.new, rule.old)
+        if isinstance(rule, Strip):
+            return ('strip', None, None, None)
+        raise TypeError(f"Unknown cleanup rule: {rule!r}")
+
+    def __call__(self, text):
+        for kind, first, second, requires in self._steps:
+            if requires is not None and requires not in text:
+                continue
+            if kind == 'sub':
+                text = first.sub(second, text)
+            elif kind == 'replace':
+                text = text.replace(first, second)
+            else:
+                text = text.strip()
+        return text
@@ -0,0 +1,46 @@
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from docx_corpus import CONTENT_TYPES, PACKAGE_RELS, REL_NS, REL_TYPE, STYLES, W_NS  # noqa: E402
+
+
+def write_docx(path, body, styles=STYLES, numbering=None):
+    """Write a minimal DOCX whose body (and numbering part) is the given WordprocessingML (w: prefix)"""
+    document = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<w:document xmlns:w="{W_NS}"><w:body>{body}<w:sectPr/></w:body></w:document>')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr('[Content_Types].xml', CONTENT_TYPES)
+        docx.writestr('_rels/.rels', PACKAGE_RELS)
+        docx.writestr('word/document.xml', document)
+        rels = f'<Relationship Id="rIdStyles" Type="{REL_TYPE}/styles" Target="styles.xml"/>' if styles else ''
+        if numbering is not None:
+            rels += f'<Relationship Id="rIdNumbering" Type="{REL_TYPE}/numbering" Target="numbering.xml"/>'
+            docx.writestr('word/numbering.xml',
+                          f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                          f'<w:numbering xmlns:w="{W_NS}">{numbering}</w:numbering>')
+        docx.writestr('word/_rels/document.xml.rels',
+                      f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                      f'<Relationships xmlns="{REL_NS}">{rels}</Relationships>')
+        if styles is not None:
+            docx.writestr('word/styles.xml', styles)
+    return path
+
+
+@pytest.fixture
+def make_docx(tmp_path):
+    """Function writing a DOCX with the given body into tmp_path and returning its path"""
+    count = 0
+
+    def make(body, styles=STYLES, numbering=None):
+        nonlocal count
+        count += 1
+        return write_docx(tmp_path / f'document{count}.docx', body, styles, numbering)
+
+    return make
@@ -0,0 +1,46 @@
+import os
+from pathlib import Path
+
+from docx2md import batch_convert
+from docx2md.markdown_writer import MarkdownWriter
+
+
+def fake_process_file(input_path, output_path, **kwargs):
+    """Stands in for the html conversion in the workers: files named crash* kill the worker mid-write"""
+    with MarkdownWriter(output_path) as writer:
+        writer.write(Path(input_path).name)
+        if Path(input_path).name.startswith('crash'):
+            os._exit(1)
+
+
+def test_crashed_worker_fails_only_its_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_convert, 'process_file', fake_process_file)
+    source = tmp_path / 'in'
+    source.mkdir()
+    names = [f'doc{i}.docx' for i in range(8)]
+    names.insert(3, 'crash.docx')
+    for name in names:
+        (source / name).write_bytes(b'')
+
+    report = batch_convert.convert_batch(str(source), tmp_path / 'out', workers=3, verbose=False)
+
+    assert [Path(path).name for path, _ in report['failed']] == ['crash.docx']
+    assert sorted(Path(path).name for path in report['converted']) == sorted(set(names) - {'crash.docx'})
+    assert (tmp_path / 'out' / 'doc7.md').read_text(encoding='utf-8') == 'doc7.docx'
+    # The crashed worker leaves neither an output nor a temporary file
+    outputs = {path.name for path in (tmp_path / 'out').iterdir()}
+    assert outputs == {Path(name).with_suffix('.md').name for name in names if name != 'crash.docx'}
+
+
+def test_outputs_are_written_once_without_a_second_temporary_file(tmp_path, monkeypatch):
+    written = []
+
+    def record(input_path, output_path, **kwargs):
+        written.append(Path(output_path))
+        Path(output_path).write_text('converted', encoding='utf-8')
+
+    monkeypatch.setattr(batch_convert, 'process_file', record)
+    output = tmp_path / 'out' / 'doc.md'
+    assert batch_convert.convert_one(tmp_path / 'doc.docx', output) is None
+    assert written == [output]
+    assert [path.name for path in output.parent.iterdir()] == ['doc.md']
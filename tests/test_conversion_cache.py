@@ -0,0 +1,71 @@
+from importlib import metadata
+
+from docx2md import docx_to_html_markdown
+from docx2md.conversion_cache import ConversionCache, converter_version
+
+BODY = ('<w:p><w:pPr><w:pStyle w:val="Heading1"/></w:pPr><w:r><w:t>Prices</w:t></w:r></w:p>'
+        '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Item</w:t></w:r></w:p></w:tc>'
+        '<w:tc><w:p><w:r><w:t>Price</w:t></w:r></w:p></w:tc></w:tr>'
+        '<w:tr><w:tc><w:p><w:r><w:t>Tea</w:t></w:r></w:p></w:tc>'
+        '<w:tc><w:p><w:r><w:t>1.5</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+        '<w:p><w:r><w:t>Fish &amp; chips</w:t></w:r></w:p>')
+
+
+def count_conversions(monkeypatch):
+    """Return the list every DOCX converted to HTML (rather than served from the cache) is appended to"""
+    converted = []
+    convert_docx_to_html = docx_to_html_markdown.convert_docx_to_html
+
+    def counting(source, *args):
+        converted.append(source)
+        return convert_docx_to_html(source, *args)
+
+    monkeypatch.setattr(docx_to_html_markdown, 'convert_docx_to_html', counting)
+    return converted
+
+
+def test_cache_hit_is_identical_to_a_fresh_conversion(make_docx, tmp_path, monkeypatch):
+    converted = count_conversions(monkeypatch)
+    path = make_docx(BODY)
+    cache = ConversionCache(tmp_path / 'cache')
+
+    docx_to_html_markdown.process_file(path, tmp_path / 'fresh.md', verbose=False)
+    docx_to_html_markdown.process_file(path, tmp_path / 'stored.md', verbose=False, cache=cache)
+    docx_to_html_markdown.process_file(path, tmp_path / 'hit.md', verbose=False, cache=cache)
+
+    assert len(converted) == 2
+    fresh = (tmp_path / 'fresh.md').read_bytes()
+    assert (tmp_path / 'stored.md').read_bytes() == fresh
+    assert (tmp_path / 'hit.md').read_bytes() == fresh
+
+
+def test_options_that_change_the_markdown_miss(make_docx, tmp_path, monkeypatch):
+    converted = count_conversions(monkeypatch)
+    path = make_docx(BODY)
+    cache = ConversionCache(tmp_path / 'cache')
+
+    for options in ({}, {'pad_tables': False}, {'image_policy': 'inline'}, {}, {'pad_tables': False}):
+        docx_to_html_markdown.process_file(path, tmp_path / 'out.md', verbose=False, cache=cache, **options)
+    assert len(converted) == 3
+
+    data = path.read_bytes()
+    keys = {docx_to_html_markdown.conversion_cache_key(data),
+            docx_to_html_markdown.conversion_cache_key(data, pad_tables=False),
+            docx_to_html_markdown.conversion_cache_key(data, image_policy='inline')}
+    assert len(keys) == 3
+
+
+def test_converter_version_covers_code_and_distributions(tmp_path):
+    first = tmp_path / 'first.py'
+    second = tmp_path / 'second.py'
+    first.write_text('A = 1\n')
+    second.write_text('B = 2\n')
+
+    version = converter_version((first, second), ('tabulate', 'no-such-distribution'))
+    assert version.startswith(f"tabulate={metadata.version('tabulate')};no-such-distribution=missing;code=")
+    assert converter_version((first, second), ('tabulate', 'no-such-distribution')) == version
+    assert converter_version((first, second), ('tabulate',)) != version
+    assert converter_version(first, ()) != converter_version((first, second), ())
+
+    second.write_text('B = 3\n')
+    assert converter_version((first, second), ('tabulate', 'no-such-distribution')) != version
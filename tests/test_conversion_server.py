@@ -0,0 +1,108 @@
+import http.client
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from docx2md import conversion_server
+from docx2md.conversion_server import ConversionService, ConversionTimeout, WorkerCrashed, make_server
+
+
+def fake_convert(backend, data):
+    """Stands in for backends.convert in the workers: b'crash' kills the worker, digits sleep"""
+    if data == b'crash':
+        os._exit(1)
+    time.sleep(float(data))
+    return 'converted'
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(conversion_server.backends, 'convert', fake_convert)
+    service = ConversionService(workers=1, queue_size=2, timeout=30)
+    yield service
+    service.shutdown()
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+
+def test_crashed_worker_restarts_the_pool(service):
+    with pytest.raises(WorkerCrashed):
+        service.convert('html', b'crash')
+    assert service.convert('html', b'0') == 'converted'
+    stats = service.snapshot()
+    assert stats['crashed'] == 1 and stats['restarts'] == 1 and stats['completed'] == 1
+
+
+def test_hung_worker_is_recycled(service):
+    with pytest.raises(ConversionTimeout):
+        service.convert('html', b'60', timeout=0.5)
+    # The only worker is still stuck in the old pool; the new one serves requests
+    assert service.convert('html', b'0', timeout=20) == 'converted'
+    wait_for(lambda: service.snapshot()['pending'] == 0)
+    assert service.snapshot()['restarts'] == 1
+
+
+def test_recycling_never_runs_more_than_workers_processes(monkeypatch):
+    monkeypatch.setattr(conversion_server.backends, 'convert', fake_convert)
+    service = ConversionService(workers=2, queue_size=8, timeout=30)
+    others = {process.pid for process in multiprocessing.active_children()}
+    results = []
+
+    def request(data, timeout=20):
+        try:
+            results.append(service.convert('html', data, timeout=timeout))
+        except ConversionTimeout:
+            results.append('timed out')
+
+    try:
+        # Start both workers, then keep one busy while the other hangs
+        warm = [threading.Thread(target=request, args=(b'0.2',)) for _ in range(2)]
+        for thread in warm:
+            thread.start()
+        for thread in warm:
+            thread.join()
+        threads = [threading.Thread(target=request, args=(b'2',))]
+        threads[0].start()
+        time.sleep(0.2)
+        with pytest.raises(ConversionTimeout):
+            service.convert('html', b'60', timeout=0.5)
+        threads += [threading.Thread(target=request, args=(b'0.3',)) for _ in range(3)]
+        for thread in threads[1:]:
+            thread.start()
+
+        peak = 0
+        while any(thread.is_alive() for thread in threads):
+            live = [process for process in multiprocessing.active_children() if process.pid not in others]
+            peak = max(peak, len(live))
+            time.sleep(0.02)
+        assert peak <= 2
+        assert results == ['converted'] * 6
+        assert service.snapshot()['restarts'] == 1
+    finally:
+        service.shutdown()
+
+
+@pytest.mark.parametrize('length', ['abc', '-1'])
+def test_invalid_content_length_is_rejected(service, length):
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+        connection.putrequest('POST', '/convert')
+        connection.putheader('Content-Length', length)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
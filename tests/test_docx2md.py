@@ -0,0 +1,24 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules the parser must not import: each subcommand loads its converter when it runs
+CONVERTER_MODULES = ('docx2md.batch_convert', 'docx2md.docx_to_html_markdown', 'docx2md.conversion_cache',
+                     'docx2md.instrumentation', 'docx', 'mammoth', 'docx2python')
+
+
+@pytest.mark.parametrize('argv', [['--help'], ['batch', '--help'], ['docx', '--help']])
+def test_parser_imports_no_converter(argv):
+    code = ('import sys\n'
+            'from docx2md import cli\n'
+            'try:\n'
+            f'    cli.build_parser().parse_args({argv!r})\n'
+            'except SystemExit:\n'
+            '    pass\n'
+            f'print(sorted(set({CONVERTER_MODULES!r}) & set(sys.modules)))\n')
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == '[]'
@@ -0,0 +1,16 @@
+import pytest
+
+from docx2md.docx_to_html_markdown import convert_html_to_markdown, split_tables_from_html
+
+
+@pytest.mark.parametrize('separator', ['\u2028', '\x0c', '\x85', '\x1c', '\r'])
+def test_table_spans_ignore_non_newline_line_breaks(separator):
+    table = '<table><tr><td>cell</td></tr></table>'
+    html = f'<p>a{separator}b</p>\n<p>x</p>\n{table}<p>after</p>'
+
+    markdown = convert_html_to_markdown(html)
+    assert 'x' in markdown.split('cell')[0]
+    assert 'after' in markdown
+    assert '</t' not in markdown
+    prose, tables = split_tables_from_html(html)
+    assert table not in prose and '<p>x</p>' in prose and '<p>after</p>' in prose
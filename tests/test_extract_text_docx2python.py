@@ -0,0 +1,51 @@
+from docx2md import document_model
+from docx2md import extract_text_docx2python
+from docx2md import render_outputs
+
+# numId 1: bullets; numId 2: decimal, then lowerRoman from iii; numId 3: unnumbered
+NUMBERING = (
+    '<w:abstractNum w:abstractNumId="0"><w:lvl w:ilvl="0"><w:numFmt w:val="bullet"/></w:lvl></w:abstractNum>'
+    '<w:abstractNum w:abstractNumId="1">'
+    '<w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="decimal"/></w:lvl>'
+    '<w:lvl w:ilvl="1"><w:start w:val="3"/><w:numFmt w:val="lowerRoman"/></w:lvl>'
+    '</w:abstractNum>'
+    '<w:abstractNum w:abstractNumId="2"><w:lvl w:ilvl="0"><w:numFmt w:val="none"/></w:lvl></w:abstractNum>'
+    '<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>'
+    '<w:num w:numId="2"><w:abstractNumId w:val="1"/></w:num>'
+    '<w:num w:numId="3"><w:abstractNumId w:val="2"/></w:num>'
+)
+
+
+def item(text, num_id, ilvl=0):
+    return (f'<w:p><w:pPr><w:numPr><w:ilvl w:val="{ilvl}"/><w:numId w:val="{num_id}"/></w:numPr></w:pPr>'
+            f'<w:r><w:t>{text}</w:t></w:r></w:p>')
+
+
+def test_list_labels_follow_numbering(make_docx):
+    body = ''.join([
+        '<w:p><w:r><w:t>Intro</w:t></w:r></w:p>',
+        item('Apples', 1), item('Pears', 1),
+        item('First', 2), item('Sub a', 2, 1), item('Sub b', 2, 1),
+        # Items in table cells are counted too and keep their labels in the table
+        f'<w:tbl><w:tr><w:tc>{item("In a table", 2)}{item("Nested", 2, 1)}</w:tc></w:tr></w:tbl>',
+        item('Third', 2), item('Sub again', 2, 1),
+        item('Plain', 3), item('No list', 0),
+    ])
+    path = make_docx(body, numbering=NUMBERING)
+
+    markdown = extract_text_docx2python.convert_docx_to_markdown(str(path))
+    prose, table = markdown.split('\n---\n\n')
+    assert prose.strip().split('\n\n') == [
+        'Intro', '-- Apples', '-- Pears', '1) First', 'iii) Sub a', 'iv) Sub b',
+        '3) Third', 'iii) Sub again', 'Plain', 'No list',
+    ]
+    assert table == '| 2) In a table\niii) Nested |\n|---|\n\n'
+
+    # The renderer of the document model gives the same text
+    document = document_model.build_document(str(path))
+    assert ''.join(render_outputs.iter_text_markdown(document)) == markdown
+
+
+def test_without_numbering_part_lists_are_bullets(make_docx):
+    path = make_docx(item('Item', 5), numbering=None)
+    assert extract_text_docx2python.convert_docx_to_markdown(str(path)) == '-- Item\n\n'
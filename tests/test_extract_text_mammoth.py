@@ -0,0 +1,14 @@
+from docx2md.extract_text_mammoth import convert_docx_to_markdown, extract_text_mammoth
+
+
+def test_returns_the_markdown_unless_a_preview_is_asked_for(make_docx, tmp_path):
+    body = ''.join(f'<w:p><w:r><w:t>Paragraph {i}</w:t></w:r></w:p>' for i in range(30))
+    path = make_docx(body)
+    output = tmp_path / 'out.md'
+
+    markdown = extract_text_mammoth(str(path), str(output))
+    assert markdown == output.read_text(encoding='utf-8') == convert_docx_to_markdown(str(path))
+    assert 'Paragraph 29' in markdown
+
+    preview = extract_text_mammoth(str(path), str(output), preview_only=True)
+    assert preview == '\n'.join(markdown.split('\n')[:10])
@@ -0,0 +1,56 @@
+import shutil
+
+from docx2md import docs_to_markdown
+from docx2md import incremental_convert
+
+
+def paragraph(text, style=None):
+    properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+    return f'<w:p>{properties}<w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+def table(*rows):
+    cells = ''.join('<w:tr>' + ''.join(f'<w:tc>{paragraph(cell)}</w:tc>' for cell in row) + '</w:tr>'
+                    for row in rows)
+    return f'<w:tbl>{cells}</w:tbl>'
+
+
+def document(middle):
+    return (paragraph('Report', 'Heading1') + paragraph('First paragraph.') + paragraph(middle)
+            + table(['Name', 'Total'], ['Ann', '3']) + paragraph('Last paragraph.'))
+
+
+def record_rendering(monkeypatch):
+    """Return the list every block rendered with python-docx is appended to, as XML"""
+    rendered = []
+    render_blocks = incremental_convert.render_blocks
+
+    def recording(fragments, *args):
+        fragments = [bytes(fragment) for fragment in fragments]
+        rendered.extend(fragments)
+        return render_blocks(fragments, *args)
+
+    monkeypatch.setattr(incremental_convert, 'render_blocks', recording)
+    return rendered
+
+
+def test_only_edited_blocks_are_rendered_again(make_docx, tmp_path, monkeypatch):
+    rendered = record_rendering(monkeypatch)
+    source = tmp_path / 'report.docx'
+    output = tmp_path / 'report.md'
+    shutil.copy(make_docx(document('Middle paragraph.')), source)
+
+    assert incremental_convert.convert_incremental(source, output) == {'blocks': 5, 'rendered': 5, 'reused': 0}
+    assert output.read_text(encoding='utf-8') == docs_to_markdown.convert_docx_to_markdown(str(source))
+
+    # An unchanged document is written from the index alone
+    rendered.clear()
+    assert incremental_convert.convert_incremental(source, output) == {'blocks': 5, 'rendered': 0, 'reused': 5}
+    assert rendered == []
+    assert output.read_text(encoding='utf-8') == docs_to_markdown.convert_docx_to_markdown(str(source))
+
+    shutil.copy(make_docx(document('Edited paragraph.')), source)
+    assert incremental_convert.convert_incremental(source, output) == {'blocks': 5, 'rendered': 1, 'reused': 4}
+    assert rendered == [paragraph('Edited paragraph.').encode('utf-8')]
+    assert output.read_text(encoding='utf-8') == docs_to_markdown.convert_docx_to_markdown(str(source))
+    assert 'Edited paragraph.' in output.read_text(encoding='utf-8')
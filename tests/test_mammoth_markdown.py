@@ -0,0 +1,52 @@
+import types
+
+import mammoth
+from mammoth import writers
+
+from docx2md import docx_to_html_markdown
+from docx2md import mammoth_markdown
+from docx2md.docx_to_html_markdown import make_html2text, split_tables_from_html
+
+RAW_HTML = ('<strong>x &amp; y</strong> &lt;tag&gt;<br /><img src="a.png" alt="A">'
+            '<table><tr><td>cell &quot;1&quot;</td><td>2</td></tr></table>after')
+
+
+def test_append_replays_raw_html_like_the_html_backend():
+    writer = writers.writer(mammoth_markdown.writer_for('drop'))
+    writer.start('p')
+    writer.text('before ')
+    writer.append(RAW_HTML)
+    writer.end('p')
+
+    prose, tables = split_tables_from_html('<p>before ' + RAW_HTML + '</p>')
+    assert writer.as_string() == (make_html2text('drop').handle(prose), tables)
+
+
+def test_falls_back_to_html_without_a_writer_registry(make_docx, monkeypatch):
+    path = make_docx('<w:p><w:r><w:t>Intro &amp; more</w:t></w:r></w:p>'
+                     '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>cell</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+                     '<w:p><w:r><w:t>End</w:t></w:r></w:p>')
+    expected = docx_to_html_markdown.convert_docx_to_markdown(str(path))
+    assert mammoth_markdown.convert_docx_to_markdown(str(path)) == expected
+
+    # A mammoth whose writers module has no registry; its own conversion keeps the real one
+    monkeypatch.setattr(mammoth, 'writers', types.SimpleNamespace(writer=writers.writer))
+    assert mammoth_markdown.writer_for('drop') is None
+    assert mammoth_markdown.convert_docx_to_markdown(str(path)) == expected
+
+
+def test_falls_back_to_html_without_the_html2text_hooks(make_docx, monkeypatch):
+    converter = make_html2text('drop')
+    assert mammoth_markdown.drives_html2text(converter)
+    # An html2text whose handle_tag no longer takes the start flag, or without optwrap
+    monkeypatch.setattr(converter, 'handle_tag', lambda tag, attrs: None)
+    assert not mammoth_markdown.drives_html2text(converter)
+    monkeypatch.undo()
+    monkeypatch.setattr(converter, 'optwrap', None)
+    assert not mammoth_markdown.drives_html2text(converter)
+
+    path = make_docx('<w:p><w:r><w:t>Fish &amp; chips &lt;3</w:t></w:r></w:p>')
+    expected = docx_to_html_markdown.convert_docx_to_markdown(str(path))
+    monkeypatch.setitem(mammoth_markdown.HTML2TEXT_HOOKS, 'handle_removed_hook', 1)
+    assert mammoth_markdown.writer_for('drop') is None
+    assert mammoth_markdown.convert_docx_to_markdown(str(path)) == expected
@@ -0,0 +1,78 @@
+import os
+import stat
+
+import pytest
+
+from docx2md.markdown_writer import MarkdownWriter, write_markdown
+
+
+def failing_pieces():
+    yield '# Title\n\n'
+    raise RuntimeError('conversion failed')
+
+
+def test_failed_conversion_keeps_the_previous_output(tmp_path):
+    output = tmp_path / 'out.md'
+    output.write_text('previous', encoding='utf-8')
+
+    with pytest.raises(RuntimeError):
+        write_markdown(failing_pieces(), output)
+
+    assert output.read_text(encoding='utf-8') == 'previous'
+    assert [path.name for path in tmp_path.iterdir()] == ['out.md']
+
+
+def test_output_appears_when_the_writer_closes(tmp_path):
+    output = tmp_path / 'out.md'
+    writer = MarkdownWriter(output)
+    writer.write('text\n')
+    assert not output.exists()
+    writer.close()
+    assert output.read_text(encoding='utf-8') == 'text\n'
+    assert [path.name for path in tmp_path.iterdir()] == ['out.md']
+
+
+def test_failed_table_extraction_keeps_the_previous_output(tmp_path):
+    from docx2md.table_model import CompactTable, StringPool, write_tables
+
+    def tables():
+        table = CompactTable(StringPool())
+        table.add_row(['a', 'b'])
+        table.freeze()
+        yield table
+        raise RuntimeError('extraction failed')
+
+    output = tmp_path / 'tables.json'
+    output.write_text('[]', encoding='utf-8')
+    with pytest.raises(RuntimeError):
+        write_tables(tables(), output)
+    assert output.read_text(encoding='utf-8') == '[]'
+    assert [path.name for path in tmp_path.iterdir()] == ['tables.json']
+
+
+def test_writers_of_the_same_output_do_not_share_a_temporary_file(tmp_path):
+    output = tmp_path / 'out.md'
+    first = MarkdownWriter(output)
+    second = MarkdownWriter(output)
+    first.write('first, half written')
+    second.write('second\n')
+    second.close()
+    assert output.read_text(encoding='utf-8') == 'second\n'
+    first.write(', now complete\n')
+    first.close()
+    assert output.read_text(encoding='utf-8') == 'first, half written, now complete\n'
+    assert [path.name for path in tmp_path.iterdir()] == ['out.md']
+
+
+def test_output_keeps_the_usual_file_mode(tmp_path):
+    new = tmp_path / 'new.md'
+    write_markdown(['text\n'], new)
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(new.stat().st_mode) == 0o666 & ~umask
+
+    existing = tmp_path / 'existing.md'
+    existing.write_text('old', encoding='utf-8')
+    existing.chmod(0o640)
+    write_markdown(['text\n'], existing)
+    assert stat.S_IMODE(existing.stat().st_mode) == 0o640
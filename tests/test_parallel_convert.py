@@ -0,0 +1,29 @@
+from docx2md import docs_to_markdown
+from docx2md import parallel_convert
+
+
+def paragraph(text, style=None):
+    ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+    return f'<w:p>{ppr}<w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+def table(text):
+    return f'<w:tbl><w:tr><w:tc><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+
+
+def test_chunks_skip_bookmarks_and_content_controls(make_docx, monkeypatch):
+    body = []
+    for i in range(40):
+        body.append(f'<w:bookmarkStart w:id="{i}" w:name="b{i}"/>')
+        body.append(paragraph(f'Section {i}', 'Heading1' if i % 5 == 0 else None))
+        body.append(f'<w:bookmarkEnd w:id="{i}"/>')
+        if i % 7 == 0:
+            body.append(f'<w:sdt><w:sdtContent>{paragraph(f"Control {i}")}</w:sdtContent></w:sdt>')
+        if i % 9 == 0:
+            body.append(table(f'Cell {i}'))
+    path = make_docx(''.join(body))
+    monkeypatch.setattr(parallel_convert, 'PARALLEL_MIN_BLOCKS', 0)
+
+    expected = docs_to_markdown.convert_docx_to_markdown(str(path))
+    assert 'Section 39' in expected
+    assert ''.join(parallel_convert.iter_markdown_pieces(str(path), workers=2, chunks=6)) == expected
@@ -0,0 +1,32 @@
+import pytest
+from tabulate import tabulate
+
+from docx2md.pipe_table import render_pipe_table
+
+TABLES = {
+    'text': [['Name', 'City'], ['Ann', 'Paris'], ['Bob ', ' Rome']],
+    'numeric': [['Item', 'Count'], ['a', '3'], ['b', '-12'], ['c', '+7'], ['d', '0']],
+    'float': [['x', 'y'], ['1.5', '2'], ['10.25', '3e4'], ['-0.125', '1.0'], ['inf', 'nan']],
+    'thousands': [['Year', 'Revenue'], ['2021', '1,234'], ['2022', '12,345.67'], ['2023', '1,000,000']],
+    'bool': [['Flag', 'Value'], ['True', 'False'], ['False', '1'], ['True', 'x']],
+    'empty cells': [['A', 'B', 'C'], ['', '1', ''], ['x', '', ''], ['', '2.5', '']],
+    'header only': [['A', 'B']],
+    'no rows': [],
+    'wide characters': [['Город', '名前'], ['Алматы', '東京'], ['Астана', '北京市'], ['ok', '😀']],
+    'ragged rows': [['A', 'B'], ['1', '2', '3'], ['4'], ['x', 'y', 'z', 'w']],
+    'short header': [['A'], ['1', '2', '3'], ['4', '5', '6']],
+}
+
+
+@pytest.mark.parametrize('rows', list(TABLES.values()), ids=list(TABLES))
+def test_matches_tabulate_pipe_format(rows):
+    assert render_pipe_table(rows) == tabulate(rows, headers="firstrow", tablefmt="pipe")
+
+
+def test_unpadded_table_keeps_the_cells_and_alignment():
+    rows = [['Name', 'Total', 'Rate'], [' Ann ', '1,234', '0.50'], ['Bob', '5', '2']]
+    assert render_pipe_table(rows, pad=False) == (
+        '| Name | Total | Rate |\n'
+        '|:---|---:|---:|\n'
+        '| Ann | 1,234 | 0.5 |\n'
+        '| Bob | 5 | 2 |')
@@ -0,0 +1,15 @@
+import json
+import os
+
+from docx2md import render_outputs
+
+
+def test_default_table_data_does_not_take_the_extract_tables_name(make_docx, tmp_path):
+    path = make_docx('<w:p><w:r><w:t>Intro</w:t></w:r></w:p>'
+                     '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Cell</w:t></w:r></w:p></w:tc></w:tr></w:tbl>')
+    outputs = {name: str(tmp_path / output) for name, output in render_outputs.DEFAULT_OUTPUTS.items()}
+    render_outputs.convert(str(path), outputs)
+
+    assert sorted(os.listdir(tmp_path)) == sorted([path.name, 'document_tables.json', 'output.md',
+                                                   'output_docx2python.md'])
+    assert len(json.loads((tmp_path / 'document_tables.json').read_text())) == 1
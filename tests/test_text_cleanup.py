@@ -0,0 +1,7 @@
+from docx2md import docs_to_markdown
+
+
+def test_tabs_are_removed_after_urls_are_joined():
+    # The URL rule eats the whitespace after a URL before tabs are removed
+    assert docs_to_markdown.clean_text('See http://x.org\tand more') == 'See http://x.organd more'
+    assert docs_to_markdown.clean_text('a\tb\n\n\n\tc') == 'ab\n\nc'